@@ -0,0 +1,230 @@
+"""
+_legacy_collision.py
+
+Collision structures superseded by collision.SolidGrid, kept so the benchmarks
+can compare against them: the uniform grid indexing the level colliders by cell
+(TileGrid) and the builder merging the solid tiles into large collider
+rectangles (merge_solid_cells).
+"""
+
+import pygame
+
+# The benchmarks importing this module add the src directory to sys.path
+from level_compiler import SOLID
+
+
+class TileGrid:
+    """
+    Uniform grid that indexes the level colliders by the cells they occupy.
+
+    The grid is built once from the level layout, so a collision query only has to
+    look at the handful of cells covered by the queried rectangle instead of every
+    tile of the map.
+
+    Attributes
+    ----------
+    tile_size : int
+        The size of each cell in pixels.
+
+    rows : int
+        Number of rows of the grid.
+
+    cols : int
+        Number of columns of the grid.
+
+    cells : list
+        Row-major list of rows, each holding the item stored in a cell or None.
+
+    Methods
+    -------
+    add(row, col, sprite)
+        Stores a sprite in the given cell.
+
+    add_rect(rect)
+        Stores a collider rectangle in every cell it covers.
+
+    cell_range(rect)
+        Returns the row and column ranges covered by a rectangle.
+
+    query(rect)
+        Returns the items stored in the cells covered by a rectangle.
+    """
+
+    def __init__(self, rows, cols, tile_size):
+        """
+        Initializes an empty grid.
+
+        Parameters
+        ----------
+        rows : int
+            Number of rows of the grid.
+
+        cols : int
+            Number of columns of the grid.
+
+        tile_size : int
+            The size of each cell in pixels.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.tile_size = tile_size
+        self.rows = rows
+        self.cols = cols
+        self.cells = [[None] * cols for _ in range(rows)]
+
+    def add(self, row, col, sprite):
+        """
+        Stores a sprite in the given cell.
+
+        Parameters
+        ----------
+        row : int
+            Row of the cell.
+
+        col : int
+            Column of the cell.
+
+        sprite : pygame.sprite.Sprite
+            The sprite occupying the cell.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.cells[row][col] = sprite
+
+    def add_rect(self, rect):
+        """
+        Stores a collider rectangle in every cell it covers.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The collider, in world coordinates.
+
+        Returns
+        -------
+        None.
+        """
+
+        rows, cols = self.cell_range(rect)
+
+        for row in rows:
+            self.cells[row][cols.start:cols.stop] = [rect] * len(cols)
+
+    def cell_range(self, rect):
+        """
+        Returns the row and column ranges covered by a rectangle, clamped to the grid.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The rectangle in grid (world) coordinates.
+
+        Returns
+        -------
+        tuple
+            A (rows, cols) pair of ranges.
+        """
+
+        size = self.tile_size
+        first_col = max(rect.left // size, 0)
+        last_col = min((rect.right - 1) // size, self.cols - 1)
+        first_row = max(rect.top // size, 0)
+        last_row = min((rect.bottom - 1) // size, self.rows - 1)
+
+        return range(first_row, last_row + 1), range(first_col, last_col + 1)
+
+    def query(self, rect):
+        """
+        Returns the items stored in the cells covered by a rectangle.
+
+        The items are returned in row-major order of the first cell they are found
+        in, and an item covering several cells is returned once.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The rectangle to look up, in world coordinates.
+
+        Returns
+        -------
+        list
+            The items found in the covered cells.
+        """
+
+        rows, cols = self.cell_range(rect)
+        found = []
+
+        for row in rows:
+            cells = self.cells[row]
+            for col in cols:
+                item = cells[col]
+                if item is not None and item not in found:
+                    found.append(item)
+
+        return found
+
+
+def merge_solid_cells(level_data, tile_size):
+    """
+    Greedily merges the solid cells of a level into axis-aligned rectangles.
+
+    Cells are visited in row-major order. Each unmerged solid cell starts a
+    rectangle that first grows to the right along its row and then downwards for
+    as long as the whole span of the next row is solid and unmerged. Every solid
+    cell ends up in exactly one rectangle, so the rectangles cover the same area as
+    the tiles without overlapping.
+
+    Parameters
+    ----------
+    level_data : LevelData
+        Compiled map of the level.
+
+    tile_size : int
+        The size of each cell in pixels.
+
+    Returns
+    -------
+    list
+        The colliders as pygame.Rect, in world coordinates, in row-major order of
+        their top-left cell.
+    """
+
+    rows, cols = level_data.rows, level_data.cols
+    remaining = bytearray(level_data.grid)  # Merged cells are cleared
+    solid = bytes([SOLID])
+    colliders = []
+
+    index = remaining.find(solid)
+    while index != -1:
+        row, first_col = divmod(index, cols)
+
+        # Grow along the row
+        row_end = (row + 1) * cols
+        end = index + 1
+        while end < row_end and remaining[end] == SOLID:
+            end += 1
+        width = end - index
+        span = solid * width
+
+        # Grow downwards while the span of the next row is solid
+        height = 1
+        while row + height < rows:
+            start = index + height * cols
+            if remaining[start:start + width] != span:
+                break
+            height += 1
+
+        for offset in range(height):
+            start = index + offset * cols
+            remaining[start:start + width] = bytes(width)
+
+        colliders.append(pygame.Rect(first_col * tile_size, row * tile_size, width * tile_size, height * tile_size))
+        index = remaining.find(solid, end)
+
+    return colliders
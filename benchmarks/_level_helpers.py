@@ -0,0 +1,54 @@
+"""
+_level_helpers.py
+
+Views of the compiled level maps used by the benchmarks: the positions of the
+solid cells and the map as layout strings.
+"""
+
+# The benchmarks importing this module add the src directory to sys.path
+from level_compiler import LAYOUT_CHARS, SOLID
+
+
+def solid_cells(level_data):
+    """
+    Yields the (row, col) position of every solid cell, in row-major order.
+
+    Parameters
+    ----------
+    level_data : LevelData
+        Compiled map of the level.
+
+    Returns
+    -------
+    generator
+        The positions of the solid cells.
+    """
+
+    solid = bytes([SOLID])
+    index = level_data.grid.find(solid)
+
+    while index != -1:
+        yield divmod(index, level_data.cols)
+        index = level_data.grid.find(solid, index + 1)
+
+
+def layout_rows(level_data):
+    """
+    Returns the map as a list of layout strings.
+
+    Parameters
+    ----------
+    level_data : LevelData
+        Compiled map of the level.
+
+    Returns
+    -------
+    list
+        A list of strings representing the terrain map.
+    """
+
+    table = bytes.maketrans(bytes(range(len(LAYOUT_CHARS))), LAYOUT_CHARS.encode())
+    text = level_data.grid.translate(table).decode()
+    cols = level_data.cols
+
+    return [text[row * cols:(row + 1) * cols] for row in range(level_data.rows)]
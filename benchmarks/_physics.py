@@ -0,0 +1,219 @@
+"""
+_physics.py
+
+Batched physics of many moving bodies, measured by physics_bench.py. The bodies
+are stored as a struct of arrays (one NumPy array per attribute) and every tick
+moves all of them in one vectorized pass against the solidity grid of a level.
+The game does not use it: the player is its only moving entity and is stepped by
+Level itself.
+"""
+
+import numpy as np
+
+
+class Bodies:
+    """
+    Struct of arrays of the moving bodies of a level.
+
+    Each attribute array has room for `capacity` bodies; only the first `count`
+    entries are bodies. A body is an axis-aligned box moved by its velocity each
+    tick, accelerated downwards by its gravity, and stopped by the solid cells it
+    runs into, like the player.
+
+    Attributes
+    ----------
+    grid : SolidGrid
+        Solidity grid the bodies collide with.
+
+    count : int
+        Number of bodies.
+
+    x, y : numpy.ndarray
+        Top-left corners of the bodies, in world coordinates.
+
+    vx, vy : numpy.ndarray
+        Velocities of the bodies in pixels per tick (positive y is down).
+
+    width, height : numpy.ndarray
+        Sizes of the bodies in pixels.
+
+    gravity : numpy.ndarray
+        Downward acceleration of each body in pixels per tick squared.
+
+    on_ground, on_ceiling, on_left, on_right : numpy.ndarray
+        Whether each body ran into a solid cell below, above, on its left or on
+        its right in the last tick.
+
+    Methods
+    -------
+    add(x, y, width, height, vx=0, vy=0, gravity=0.8)
+        Adds a body.
+
+    remove(index)
+        Removes a body.
+
+    clear()
+        Removes every body.
+
+    step()
+        Moves every body by one tick.
+    """
+
+    _FLOAT_ARRAYS = ('x', 'y', 'vx', 'vy', 'width', 'height', 'gravity')
+    _FLAG_ARRAYS = ('on_ground', 'on_ceiling', 'on_left', 'on_right')
+
+    def __init__(self, grid, capacity=64):
+        """
+        Initializes an empty set of bodies.
+
+        Parameters
+        ----------
+        grid : SolidGrid
+            Solidity grid the bodies collide with.
+
+        capacity : int
+            Number of bodies the arrays have room for before growing.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.grid = grid
+        self.count = 0
+        for name in self._FLOAT_ARRAYS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        for name in self._FLAG_ARRAYS:
+            setattr(self, name, np.zeros(capacity, dtype=bool))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """
+        Doubles the capacity of the arrays.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        for name in self._FLOAT_ARRAYS + self._FLAG_ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros(max(len(array) * 2, 1), dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, x, y, width, height, vx=0, vy=0, gravity=0.8):
+        """
+        Adds a body.
+
+        Parameters
+        ----------
+        x, y : float
+            Top-left corner of the body, in world coordinates.
+
+        width, height : float
+            Size of the body in pixels.
+
+        vx, vy : float
+            Initial velocity in pixels per tick.
+
+        gravity : float
+            Downward acceleration in pixels per tick squared (0 for projectiles).
+
+        Returns
+        -------
+        int
+            The index of the body.
+        """
+
+        if self.count == len(self.x):
+            self._grow()
+
+        index = self.count
+        self.count += 1
+
+        self.x[index], self.y[index] = x, y
+        self.vx[index], self.vy[index] = vx, vy
+        self.width[index], self.height[index] = width, height
+        self.gravity[index] = gravity
+        for name in self._FLAG_ARRAYS:
+            getattr(self, name)[index] = False
+
+        return index
+
+    def remove(self, index):
+        """
+        Removes a body. The last body takes its index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the body.
+
+        Returns
+        -------
+        None.
+        """
+
+        if not 0 <= index < self.count:
+            raise IndexError(f"No body at index {index}")
+
+        self.count -= 1
+        last = self.count
+        for name in self._FLOAT_ARRAYS + self._FLAG_ARRAYS:
+            array = getattr(self, name)
+            array[index] = array[last]
+
+    def clear(self):
+        """
+        Removes every body.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.count = 0
+
+    def step(self):
+        """
+        Moves every body by one tick: gravity, then the horizontal and the vertical
+        movement, each one stopped by the first solid cell it crosses.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        count = self.count
+        if count == 0:
+            return
+
+        x, y = self.x[:count], self.y[:count]
+        vx, vy = self.vx[:count], self.vy[:count]
+        width, height = self.width[:count], self.height[:count]
+
+        vy += self.gravity[:count]
+
+        x[:], hit = self.grid.sweep_x_batch(x, y, width, height, vx)
+        np.logical_and(hit, vx < 0, out=self.on_left[:count])
+        np.logical_and(hit, vx > 0, out=self.on_right[:count])
+
+        y[:], hit = self.grid.sweep_y_batch(x, y, width, height, vy)
+        np.logical_and(hit, vy > 0, out=self.on_ground[:count])
+        np.logical_and(hit, vy < 0, out=self.on_ceiling[:count])
+        vy[hit] = 0
@@ -0,0 +1,94 @@
+"""
+collision_bench.py
+
+Compares the cost of a collision query against every tile of the level with the
+cost of the same query answered by the TileGrid index, for maps of growing width.
+
+Run it from the repository root:
+
+    python benchmarks/collision_bench.py
+"""
+
+import os
+import sys
+import timeit
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+import pygame
+
+from _legacy_collision import TileGrid
+from _level_helpers import layout_rows
+from settings import TILE_SIZE, level_list
+
+
+def build(layout):
+    """
+    Builds the tile sprites and the grid index of a layout.
+
+    Parameters
+    ----------
+    layout : list
+        Layout representing the level.
+
+    Returns
+    -------
+    tuple
+        The tile group and the grid index.
+    """
+
+    tiles = pygame.sprite.Group()
+    grid = TileGrid(len(layout), max(len(row) for row in layout), TILE_SIZE)
+
+    for row_index, row in enumerate(layout):
+        for col_index, cell in enumerate(row):
+            if cell == 'X':
+                sprite = pygame.sprite.Sprite()
+                sprite.rect = pygame.Rect(col_index * TILE_SIZE, row_index * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                tiles.add(sprite)
+                grid.add(row_index, col_index, sprite)
+
+    return tiles, grid
+
+
+def main():
+    """
+    Prints the per-frame cost of both collision strategies.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    player_rect = pygame.Rect(400, 300, 64, 64)
+    frames = 200
+
+    print(f"{'width':>8} {'tiles':>8} {'scan (us/frame)':>16} {'grid (us/frame)':>16}")
+    for repeat in (1, 2, 4, 8):
+        layout = [row * repeat for row in layout_rows(level_list[0])]
+        tiles, grid = build(layout)
+
+        def scan():
+            # horizontal and vertical passes, as Level does every frame
+            for _ in range(2):
+                for sprite in tiles.sprites():
+                    sprite.rect.colliderect(player_rect)
+
+        def indexed():
+            for _ in range(2):
+                for sprite in grid.query(player_rect):
+                    sprite.rect.colliderect(player_rect)
+
+        scan_time = timeit.timeit(scan, number=frames) / frames * 1e6
+        grid_time = timeit.timeit(indexed, number=frames) / frames * 1e6
+        print(f"{len(layout[0]):>8} {len(tiles):>8} {scan_time:>16.1f} {grid_time:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
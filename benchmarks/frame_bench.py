@@ -0,0 +1,332 @@
+"""
+frame_bench.py
+
+Times the stages of the play screen frame (Level.update, Level.draw and
+Level.present) on every level of settings.level_list, with the player driven by
+scripted inputs:
+
+- idle: no button is held.
+- run_right: holds RIGHT and JUMP on every tick (it does not look at the map) for
+  the ticks an unobstructed run would take to cross it.
+- jump_spam: jumps in place as often as possible.
+
+The results (mean and p50/p95/p99 in milliseconds for each stage) are printed as
+JSON, so they can be stored and compared across commits. Run it from the
+repository root (the SDL dummy drivers are used by default):
+
+    python benchmarks/frame_bench.py --output frame_times.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout for the JSON
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+import pygame
+
+from classes import Level
+from inputs import JUMP, RIGHT, ScriptedInput
+from menu import screen
+from settings import TILE_SIZE, bg_list, level_list
+
+
+SCENARIOS = {
+    'idle': lambda tick: 0,
+    'run_right': lambda tick: RIGHT | JUMP,
+    'jump_spam': lambda tick: JUMP if tick % 2 == 0 else 0,
+}
+
+STAGES = ('background', 'updates', 'collision_h', 'collision_v', 'collectibles',
+          'npcs', 'hud', 'flip', 'frame')
+
+
+class StageTimer:
+    """
+    Collects the time spent in each stage of a frame.
+
+    Attributes
+    ----------
+    current : collections.defaultdict
+        Seconds spent in each stage during the current frame.
+
+    samples : collections.defaultdict
+        Milliseconds spent in each stage, one value per finished frame.
+
+    Methods
+    -------
+    wrap(obj, name, stage)
+        Times every call of a method of an object as part of a stage.
+
+    end_frame(frame_time)
+        Stores the times of the current frame.
+    """
+
+    def __init__(self):
+        """
+        Initializes the timer without samples.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.current = defaultdict(float)
+        self.samples = defaultdict(list)
+
+    def wrap(self, obj, name, stage):
+        """
+        Times every call of a method of an object as part of a stage.
+
+        Parameters
+        ----------
+        obj : object
+            The object whose method is timed.
+
+        name : str
+            The name of the method.
+
+        stage : str
+            The stage the time is added to.
+
+        Returns
+        -------
+        None.
+        """
+
+        method = getattr(obj, name)
+        current = self.current
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[stage] += time.perf_counter() - start
+
+        setattr(obj, name, timed)
+
+    def end_frame(self, frame_time):
+        """
+        Stores the times of the current frame.
+
+        Parameters
+        ----------
+        frame_time : float
+            Seconds spent in the whole frame.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.current['frame'] = frame_time
+        for stage in STAGES:
+            self.samples[stage].append(self.current[stage] * 1e3)
+        self.current.clear()
+
+
+def load_level(index, script):
+    """
+    Creates a level positioned at the start of a given map.
+
+    Parameters
+    ----------
+    index : int
+        Index of the level in settings.level_list.
+
+    script : callable
+        Function of the tick number returning the buttons held.
+
+    Returns
+    -------
+    Level
+        The level.
+    """
+
+    level = Level(level_list, bg_list, screen, ScriptedInput(script))
+
+    if index != level.current_level:
+        level.start_level(index)
+
+    return level
+
+
+def instrument(level, timer):
+    """
+    Wraps the stages of a level with the timer.
+
+    Parameters
+    ----------
+    level : Level
+        The level to instrument.
+
+    timer : StageTimer
+        The timer collecting the stage times.
+
+    Returns
+    -------
+    None.
+    """
+
+    timer.wrap(level.background, 'draw', 'background')
+    timer.wrap(level.background, 'draw_area', 'background')
+    timer.wrap(level, 'scroll_x', 'updates')
+    timer.wrap(level, 'cull', 'updates')
+    timer.wrap(level.player, 'update', 'updates')
+    timer.wrap(level, 'horizontal_movement_collision', 'collision_h')
+    timer.wrap(level, 'vertical_movement_collision', 'collision_v')
+    timer.wrap(level, 'check_collectible_collisions', 'collectibles')
+    timer.wrap(level, 'check_npc_collision', 'npcs')
+    timer.wrap(level.ui, 'show_health', 'hud')
+    timer.wrap(level.ui, 'show_books', 'hud')
+    timer.wrap(level, 'show_score', 'hud')
+    timer.wrap(level, 'present', 'flip')
+
+
+def summarize(samples):
+    """
+    Computes the mean and percentiles of a list of times.
+
+    Parameters
+    ----------
+    samples : list
+        Times in milliseconds.
+
+    Returns
+    -------
+    dict
+        Mean, p50, p95, p99 and max, in milliseconds.
+    """
+
+    percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+
+    return {
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p50_ms': round(percentiles[49], 4),
+        'p95_ms': round(percentiles[94], 4),
+        'p99_ms': round(percentiles[98], 4),
+        'max_ms': round(max(samples), 4),
+    }
+
+
+def run_scenario(index, name, frames, warmup):
+    """
+    Runs a scenario on a level and times its frames.
+
+    The scenario stops early if the level is completed, since the following frames
+    would belong to another map.
+
+    Parameters
+    ----------
+    index : int
+        Index of the level in settings.level_list.
+
+    name : str
+        Name of the scenario in SCENARIOS.
+
+    frames : int or None
+        Number of timed frames, or None for the ticks the player takes to cross the
+        map.
+
+    warmup : int
+        Number of frames run before timing starts.
+
+    Returns
+    -------
+    dict
+        The level, scenario, number of timed frames and stage summaries.
+    """
+
+    level = load_level(index, SCENARIOS[name])
+    if frames is None:
+        frames = level_list[index].cols * TILE_SIZE // level.player.sprite.speed
+
+    timer = StageTimer()
+    instrument(level, timer)
+
+    for frame in range(warmup + frames):
+        start = time.perf_counter()
+        level.update()
+        if level.current_level != index or level.game_over:
+            break
+        level.draw()
+        level.present()
+        frame_time = time.perf_counter() - start
+
+        if frame < warmup:
+            timer.current.clear()
+        else:
+            timer.end_frame(frame_time)
+
+    return {
+        'level': index,
+        'scenario': name,
+        'frames': len(timer.samples['frame']),
+        'player_x': level.player.sprite.rect.x,
+        'stages': {stage: summarize(timer.samples[stage]) for stage in STAGES},
+    }
+
+
+def main():
+    """
+    Runs every scenario on every level and emits the results as JSON.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    parser = argparse.ArgumentParser(description="Time the stages of the play screen frame.")
+    parser.add_argument('--frames', type=int, default=600,
+                        help="timed frames of the idle and jump_spam scenarios (default: 600)")
+    parser.add_argument('--warmup', type=int, default=30,
+                        help="frames run before timing starts (default: 30)")
+    parser.add_argument('--output', help="file to write the JSON to (default: standard output)")
+    args = parser.parse_args()
+
+    pygame.init()
+
+    results = []
+    for index in range(len(level_list)):
+        for name in SCENARIOS:
+            frames = None if name == 'run_right' else args.frames
+            results.append(run_scenario(index, name, frames, args.warmup))
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'video_driver': pygame.display.get_driver(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+physics_bench.py
+
+Times a physics tick of a growing number of bodies running and jumping through
+the first level, and checks the result against a 60 Hz tick budget.
+
+Run it from the repository root:
+
+    python benchmarks/physics_bench.py --ticks 120
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+from collision import SolidGrid
+from _physics import Bodies
+from settings import TICK_RATE, TILE_SIZE, level_list
+
+
+def populate(grid, count, seed=0):
+    """
+    Creates bodies scattered over the level with random velocities.
+
+    Parameters
+    ----------
+    grid : SolidGrid
+        Solidity grid of the level.
+
+    count : int
+        Number of bodies.
+
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    Bodies
+        The bodies, placed in empty cells.
+    """
+
+    rng = np.random.default_rng(seed)
+    bodies = Bodies(grid, count)
+
+    # Start every body in an empty cell, so none starts inside a wall
+    free_rows, free_cols = np.nonzero(grid.solid == 0)
+    cells = rng.integers(0, len(free_rows), count)
+    for row, col in zip(free_rows[cells], free_cols[cells]):
+        bodies.add(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE,
+                   vx=rng.choice([-8, 0, 8]), vy=rng.uniform(-16, 0))
+
+    return bodies
+
+
+def main():
+    """
+    Prints the average and worst tick times for each number of bodies.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=120, help="ticks simulated per body count")
+    args = parser.parse_args()
+
+    grid = SolidGrid.from_level(level_list[0], TILE_SIZE)
+    budget = 1e3 / TICK_RATE
+
+    print(f"{'bodies':>8} {'mean (ms)':>10} {'max (ms)':>9} {'grounded':>9} {'in budget':>10}")
+    for count in (10, 100, 1000, 5000, 10000):
+        bodies = populate(grid, count)
+        times = []
+
+        for tick in range(args.ticks):
+            # Bodies on the ground jump again, so they keep crossing cells
+            jumping = bodies.on_ground[:bodies.count]
+            bodies.vy[:bodies.count][jumping] = -16
+
+            start = time.perf_counter()
+            bodies.step()
+            times.append((time.perf_counter() - start) * 1e3)
+
+        grounded = int(bodies.on_ground[:bodies.count].sum())
+        fits = "yes" if max(times) < budget else "no"
+        print(f"{count:>8} {sum(times) / len(times):>10.3f} {max(times):>9.3f} {grounded:>9} {fits:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+present_bench.py
+
+Compares the cost of presenting the play screen with a full flip and with the
+dirty-rectangle renderer, on frames where the camera stands still and on frames
+where it scrolls.
+
+Run it from the repository root (the SDL dummy drivers are used by default):
+
+    python benchmarks/present_bench.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+import pygame
+
+from classes import Level
+from menu import screen
+from settings import bg_list, level_list
+
+
+def measure(dirty, scrolling, frames=300):
+    """
+    Runs the first level and times the frames.
+
+    Parameters
+    ----------
+    dirty : bool
+        Whether the dirty-rectangle renderer is enabled.
+
+    scrolling : bool
+        Whether the camera scrolls every frame.
+
+    frames : int
+        Number of frames to run.
+
+    Returns
+    -------
+    tuple
+        Average milliseconds per frame spent in Level.run and in presenting.
+    """
+
+    level = Level(level_list, bg_list, screen)
+    level.renderer.enabled = dirty
+    run_time = present_time = 0.0
+
+    for _ in range(frames):
+        if scrolling:
+            level.camera.scroll(8)
+
+        start = time.perf_counter()
+        level.run()
+        middle = time.perf_counter()
+        level.present()
+        end = time.perf_counter()
+
+        run_time += middle - start
+        present_time += end - middle
+
+    return run_time / frames * 1e3, present_time / frames * 1e3
+
+
+def main():
+    """
+    Prints the frame and present times of both modes.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    pygame.init()
+    print(f"video driver: {pygame.display.get_driver()}")
+    print(f"{'scenario':>10} {'mode':>6} {'run (ms)':>10} {'present (ms)':>13}")
+
+    for scrolling in (False, True):
+        for dirty in (False, True):
+            run_time, present_time = measure(dirty, scrolling)
+            scenario = "scrolling" if scrolling else "still"
+            mode = "dirty" if dirty else "flip"
+            print(f"{scenario:>10} {mode:>6} {run_time:>10.3f} {present_time:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
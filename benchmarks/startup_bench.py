@@ -0,0 +1,135 @@
+"""
+startup_bench.py
+
+Measures the startup time of the game (creating the window, starting the audio and
+building the first level) and the peak resident memory of the process, with and
+without audio. Every run starts a fresh interpreter, so the caches of one run never
+help the next one.
+
+Run it from the repository root (the SDL dummy drivers are used by default):
+
+    python benchmarks/startup_bench.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+START = time.perf_counter()
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+
+def measure_startup():
+    """
+    Starts the game in this process and prints its startup figures as JSON.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    from academic_adventure import Game
+    from audio import audio
+
+    imported = time.perf_counter()
+    game = Game()
+    game.new()
+    started = time.perf_counter()
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    print(json.dumps({
+        'import_ms': (imported - START) * 1e3,
+        'startup_ms': (started - START) * 1e3,
+        'peak_rss_mb': peak_rss / 2 ** 20,
+        'audio': audio.initialized,
+        'sound_bank_kb': audio.memory_size() / 1024,
+    }))
+
+
+def run(audio_enabled, runs):
+    """
+    Starts the game in fresh processes and collects their figures.
+
+    Parameters
+    ----------
+    audio_enabled : bool
+        Whether the game starts with audio.
+
+    runs : int
+        Number of processes to start.
+
+    Returns
+    -------
+    dict
+        The median of each figure.
+    """
+
+    env = dict(os.environ)
+    if audio_enabled:
+        env.pop("ACADEMIC_ADVENTURE_NO_AUDIO", None)
+    else:
+        env["ACADEMIC_ADVENTURE_NO_AUDIO"] = "1"
+
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                                env=env, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {key: statistics.median(result[key] for result in results) for key in results[0]}
+
+
+def main():
+    """
+    Prints the startup time and peak memory with and without audio.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help="processes started per configuration")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_startup()
+        return
+
+    results = {'audio': run(True, args.runs), 'no_audio': run(False, args.runs)}
+
+    print(f"{'config':>9} {'import (ms)':>12} {'startup (ms)':>13} {'peak RSS (MB)':>14} {'sound bank (KB)':>16}")
+    for name, result in results.items():
+        print(f"{name:>9} {result['import_ms']:>12.1f} {result['startup_ms']:>13.1f} "
+              f"{result['peak_rss_mb']:>14.1f} {result['sound_bank_kb']:>16.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+sweep_bench.py
+
+Times the swept collision queries of SolidGrid on the first level: one body at a
+time with sweep_x/sweep_y, and many bodies at once with the batched API, for a
+growing number of bodies falling and running through the map.
+
+Run it from the repository root:
+
+    python benchmarks/sweep_bench.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# Add the src directory to sys.path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
+
+import pygame
+
+from collision import SolidGrid
+from settings import SCREEN_HEIGHT, TILE_SIZE, level_list
+
+
+def main():
+    """
+    Prints the cost of a tick of swept queries for each strategy.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    grid = SolidGrid.from_level(level_list[0], TILE_SIZE)
+    rng = np.random.default_rng(0)
+    repeats = 20
+
+    print(f"{'bodies':>8} {'single (us/tick)':>17} {'batch (us/tick)':>16}")
+    for count in (1, 10, 100, 1000, 10000):
+        x = rng.uniform(0, grid.cols * TILE_SIZE, count).round()
+        y = rng.uniform(0, SCREEN_HEIGHT, count).round()
+        dx = rng.choice([-8.0, 0.0, 8.0], count)
+        dy = rng.uniform(-16, 40, count).round()
+        rects = [pygame.Rect(int(x[i]), int(y[i]), 64, 64) for i in range(count)]
+
+        def single():
+            for rect, move_x, move_y in zip(rects, dx, dy):
+                grid.sweep_x(rect, int(move_x))
+                grid.sweep_y(rect, int(move_y))
+
+        def batch():
+            grid.sweep_x_batch(x, y, 64, 64, dx)
+            grid.sweep_y_batch(x, y, 64, 64, dy)
+
+        single_time = timeit.timeit(single, number=repeats) / repeats * 1e6
+        batch_time = timeit.timeit(batch, number=repeats) / repeats * 1e6
+        print(f"{count:>8} {single_time:>17.1f} {batch_time:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,20 @@ library to create a game window, handle events, and render the game state to the
 """
 
 # importing libraries
+import os
+import time
+
 import pygame
 
+from audio import audio
 from classes import *
 from menu import *
 from settings import *
+from inputs import KeyboardInput
+from profiler import ProfilerOverlay, profiler
+from recording import RecordingInput, write_recording
+from timestep import FixedTimestep
+from transitions import Fade, Wipe
 
 class Game:
     """
@@ -18,15 +27,24 @@ class Game:
 
     Attributes
     ----------
-    bg_music : pygame.mixer.Sound
-        The background music for the game.
-
     screen : pygame.Surface
         The main game window.
 
     clock : pygame.time.Clock
         A clock to control the game's frame rate.
 
+    timestep : FixedTimestep
+        The clock deciding how many simulation ticks run in each frame.
+
+    overlay : ProfilerOverlay
+        The performance overlay, toggled with F3 (F4 exports the profile).
+
+    recorder : RecordingInput or None
+        Records the input of the playthrough when RECORD_PATH is set.
+
+    transition : Transition or None
+        The transition played over the play screen.
+
     x : int
         An example attribute for demonstration purposes.
 
@@ -41,6 +59,15 @@ class Game:
     new()
         Initializes a new game, creating a new level and menu.
 
+    save_recording()
+        Writes the input recorded in the current playthrough.
+
+    resume()
+        Prepares the play screen after a menu was shown.
+
+    draw_frame(alpha, fps)
+        Draws and presents a frame of the play screen.
+
     run()
         Runs the main game loop, handling events and updating the game state.
     """
@@ -56,18 +83,25 @@ class Game:
         -------
         None.
         """
-        # Initialize pygame and create window
-        pygame.init()
-        pygame.mixer.init()
+        # Initialize pygame and create window (the mixer is initialised by the audio on first use)
+        pygame.display.init()
+        pygame.font.init()
 
         #audio
-        self.bg_music = pygame.mixer.Sound('src/audio/bg_music.wav')
-        self.bg_music.set_volume(0.3)
-        self.bg_music.play(loops = -1)
+        audio.play_music(MUSIC_PATHS, MUSIC_VOLUME)
 
         # Create the screen and clock
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if VSYNC:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
+
+        # Fixed simulation rate, decoupled from the rendering rate
+        self.timestep = FixedTimestep(TICK_RATE, MAX_TICKS_PER_FRAME)
+        self.overlay = ProfilerOverlay(profiler)
+        self.recorder = None
+        self.transition = None
         
         # self.x = 0
 
@@ -87,8 +121,85 @@ class Game:
         None.
         """
         # Create a new level and menu
-        self.level = Level(level_list, bg_list, self.screen)
+        controller = KeyboardInput()
+        self.recorder = None
+        if RECORD_PATH:
+            self.recorder = controller = RecordingInput(controller, TICK_RATE)
+
+        self.level = Level(level_list, bg_list, self.screen, controller)
         self.menu = Menu(self.level)
+
+    def save_recording(self):
+        """
+        Writes the input recorded in the current playthrough, with its final state.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.recorder is None or not self.recorder.recording.buttons:
+            return
+
+        self.recorder.recording.result = self.level.state()
+        try:
+            write_recording(self.recorder.recording, RECORD_PATH)
+        except OSError as e:
+            print(f"Error writing recording: {RECORD_PATH} - {e}")
+
+    def resume(self):
+        """
+        Prepares the play screen after a menu was shown, fading it in.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.level.renderer.invalidate()
+        self.timestep.reset()
+        self.transition = Fade(TRANSITION_TIME)
+
+    def draw_frame(self, alpha, fps):
+        """
+        Draws and presents a frame of the play screen, with the transition and the
+        performance overlay on top.
+
+        Parameters
+        ----------
+        alpha : float
+            Interpolation factor between the last two simulation ticks.
+
+        fps : int
+            Frame cap (0 = uncapped).
+
+        Returns
+        -------
+        None.
+        """
+
+        self.level.draw(alpha)
+
+        if self.transition is not None:
+            self.level.renderer.add(self.transition.draw(self.screen))
+            if self.transition.reveal and self.transition.is_finished():
+                self.transition = None
+
+        panel = self.overlay.draw(self.screen)
+        if panel is not None:
+            self.level.renderer.add(panel)
+
+        self.level.present()
+        self.clock.tick(fps)
+        profiler.end_frame()
     
 
     def run(self):
@@ -112,23 +223,61 @@ class Game:
                     if event.type == pygame.QUIT:
                         self.running = False
 
+                    # An open question takes the input until it is answered
+                    if self.level.quiz is not None and self.menu.current_screen == "play":
+                        self.level.quiz.handle_event(event)
+                        continue
+
                     # Pause the game
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:  # 'ESC' key to pause the game
                             self.menu.current_screen = "pause"
                             self.menu.pause()
+                            self.resume()
+
+                        # Debug keys: performance overlay and profile export
+                        if event.key == pygame.K_F3:
+                            self.overlay.toggle()
+                            self.level.renderer.invalidate()
+                        if event.key == pygame.K_F4 and profiler.frames:
+                            path = time.strftime("profile-%Y%m%d-%H%M%S.json")
+                            profiler.export(path)
+                            print(f"Profile written to {path}")
 
                 # Update the game state and render the screen
                 if self.menu.current_screen == "main_menu":
-                    self.menu.main_menu(r"src\graphics\backgrounds\menu_bg.png")
+                    self.menu.main_menu(os.path.join("src", "graphics", "backgrounds", "menu_bg.png"))
+                    self.resume()
                 elif self.level.game_over:
-                    self.menu.game_over()
+                    # Fade the last frame of the level out before the game over screen
+                    if self.transition is None or self.transition.reveal:
+                        self.transition = Fade(TRANSITION_TIME, reveal=False)
+                    finished = self.transition.is_finished()
+                    self.draw_frame(1.0, MENU_FPS)
+
+                    if finished:
+                        # Every playthrough is recorded from the start of the game
+                        self.save_recording()
+                        if self.recorder is not None:
+                            self.recorder.reset()
+                        self.menu.game_over()
+                        self.resume()
                 elif self.menu.current_screen == "play":
-                    self.level.run()
-                    pygame.display.flip()
-                    self.clock.tick(60)
+                    # Run the simulation at a fixed rate and render as often as possible
+                    level_index = self.level.current_level
+                    for _ in range(self.timestep.advance()):
+                        self.level.update()
+                        if self.level.game_over:
+                            break
+
+                    # Sweep the next level in
+                    if self.level.current_level != level_index:
+                        self.transition = Wipe(TRANSITION_TIME)
+
+                    self.draw_frame(self.timestep.alpha(), MENU_FPS if self.level.quiz is not None else RENDER_FPS)
                 elif self.menu.current_screen == "credits":
                     self.menu.credits()
+                    self.resume()
         
         # Handle errors
         except pygame.error as e:
@@ -136,6 +285,11 @@ class Game:
         except Exception as e:
             print(f"An unexpected error occurred during game execution: {e}")
         finally:
+            self.save_recording()
+            if hasattr(self, 'level'):
+                self.level.loader.shutdown()
+            if PROFILE and profiler.frames:
+                profiler.export("profile.json")
             pygame.quit()
 
 
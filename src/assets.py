@@ -0,0 +1,311 @@
+"""
+assets.py
+
+This module contains the shared asset cache. Images and fonts are decoded from
+disk once, and text is rasterised once per font, content and colour; they are then
+handed out from memory, keeping the most recently used assets within a memory
+budget. Sounds are kept by the audio bank (see audio.py).
+"""
+
+import os
+import struct
+from collections import Counter, OrderedDict
+
+import pygame
+
+from settings import ASSET_CACHE_BUDGET
+
+
+class AssetManager:
+    """
+    Least-recently-used cache of the game assets.
+
+    The assets are keyed by kind, path, size and convert mode. The cached surfaces
+    are shared, so callers must copy a surface before drawing on it.
+
+    Attributes
+    ----------
+    budget : int
+        Maximum number of bytes kept in the cache.
+
+    memory_used : int
+        Estimated number of bytes currently kept in the cache.
+
+    load_counts : collections.Counter
+        Number of times each file was decoded from disk.
+
+    hits : int
+        Number of requests answered from the cache.
+
+    misses : int
+        Number of requests that had to load or build the asset.
+
+    evictions : int
+        Number of assets dropped to respect the budget.
+
+    Methods
+    -------
+    image(path, convert, size)
+        Returns an image, optionally converted and scaled.
+
+    image_size(path)
+        Returns the size of a PNG image without decoding it.
+
+    font(path, size)
+        Returns a font of the given size.
+
+    text(font, text, antialias, color)
+        Returns a rendered text surface.
+
+    stats()
+        Returns the cache statistics.
+
+    clear()
+        Drops every cached asset.
+    """
+
+    def __init__(self, budget):
+        """
+        Initializes an empty cache.
+
+        Parameters
+        ----------
+        budget : int
+            Maximum number of bytes kept in the cache.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.budget = budget
+        self.memory_used = 0
+        self.load_counts = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def _get(self, key, build):
+        """
+        Returns a cached asset, building and storing it on a miss.
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key of the asset.
+
+        build : callable
+            Function returning the asset and its size in bytes.
+
+        Returns
+        -------
+        object
+            The asset.
+        """
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        asset, size = build()
+        self._entries[key] = (asset, size)
+        self.memory_used += size
+
+        # Drop the least recently used assets, but never the one just built
+        while self.memory_used > self.budget and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.memory_used -= evicted_size
+            self.evictions += 1
+
+        return asset
+
+    def image(self, path, convert='alpha', size=None):
+        """
+        Returns an image, optionally converted and scaled.
+
+        Parameters
+        ----------
+        path : str
+            The path of the image file.
+
+        convert : str or None
+            'alpha' to convert with per-pixel alpha, 'opaque' to convert without it,
+            None to keep the file pixel format.
+
+        size : tuple or None
+            The (width, height) to scale the image to, or None to keep its size.
+
+        Returns
+        -------
+        pygame.Surface
+            The image.
+
+        Raises
+        ------
+        pygame.error
+            If the image cannot be loaded.
+        """
+
+        path = os.path.normpath(path)
+
+        def build():
+            if size is not None:
+                surface = pygame.transform.scale(self.image(path, convert), size)
+            else:
+                surface = pygame.image.load(path)
+                self.load_counts[path] += 1
+                if convert == 'alpha':
+                    surface = surface.convert_alpha()
+                elif convert == 'opaque':
+                    surface = surface.convert()
+            return surface, surface.get_pitch() * surface.get_height()
+
+        return self._get(('image', path, size, convert), build)
+
+    def image_size(self, path):
+        """
+        Returns the size of a PNG image without decoding it.
+
+        The size is read from the header of the file, so it can be used where the
+        pixels are never drawn (e.g. in headless mode).
+
+        Parameters
+        ----------
+        path : str
+            The path of the PNG file.
+
+        Returns
+        -------
+        tuple
+            The (width, height) of the image.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a PNG image.
+        """
+
+        path = os.path.normpath(path)
+
+        def build():
+            with open(path, 'rb') as file:
+                header = file.read(24)
+            if header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+                raise ValueError(f"{path} is not a PNG image")
+            return struct.unpack('>II', header[16:24]), 0
+
+        return self._get(('size', path, None, None), build)
+
+    def font(self, path, size):
+        """
+        Returns a font of the given size.
+
+        Parameters
+        ----------
+        path : str or None
+            The path of the font file, or None for the pygame default font.
+
+        size : int
+            The font size.
+
+        Returns
+        -------
+        pygame.font.Font
+            The font.
+        """
+
+        if path is not None:
+            path = os.path.normpath(path)
+
+        def build():
+            font = pygame.font.Font(path, size)
+            self.load_counts[path] += 1
+            return font, os.path.getsize(path) if path is not None else 0
+
+        return self._get(('font', path, size, None), build)
+
+    def text(self, font, text, antialias, color):
+        """
+        Returns a rendered text surface.
+
+        The font objects handed out by font() identify both the font file and the
+        size, so the same text only has to be rasterised again when its content,
+        colour or antialiasing changes.
+
+        Parameters
+        ----------
+        font : pygame.font.Font
+            The font used to render the text.
+
+        text : str
+            The text to render.
+
+        antialias : bool
+            Whether the text is antialiased.
+
+        color : str or tuple
+            The colour of the text.
+
+        Returns
+        -------
+        pygame.Surface
+            The rendered text.
+        """
+
+        def build():
+            surface = font.render(text, antialias, color)
+            return surface, surface.get_pitch() * surface.get_height()
+
+        return self._get(('text', font, text, (antialias, str(color))), build)
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        dict
+            Entries, memory, budget, hits, misses, hit rate, evictions and the number
+            of decodes of each file.
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            'entries': len(self._entries),
+            'memory_used': self.memory_used,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'loads': dict(self.load_counts),
+        }
+
+    def clear(self):
+        """
+        Drops every cached asset.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self._entries.clear()
+        self.memory_used = 0
+
+
+# Cache shared by the whole game
+assets = AssetManager(ASSET_CACHE_BUDGET)
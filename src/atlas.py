@@ -0,0 +1,248 @@
+"""
+atlas.py
+
+This module packs the animation frames of a sprite into a texture atlas and loads
+them back. The packer runs offline and writes one atlas image plus a JSON manifest
+with the rect of every frame, in a defined order (frames sorted by the number in
+their file names). Frames of a left-facing animation that are mirror images of the
+matching right-facing frame are not stored: the loader flips them once at load
+time. Identical frames are stored once.
+
+Pack the character frames after changing them:
+
+    python src/atlas.py src/graphics/character
+"""
+
+import json
+import os
+import re
+import sys
+
+import pygame
+
+from assets import assets
+
+
+ATLAS_IMAGE = 'atlas.png'
+ATLAS_MANIFEST = 'atlas.json'
+ATLAS_WIDTH = 512  # Frames are packed in rows up to this width
+
+# Animations loaded by the game, left-facing ones after the right-facing they mirror
+ANIMATIONS = ('idle_right', 'idle_left', 'running_right', 'running_left')
+
+# Animations already loaded, shared by every sprite using them
+_loaded = {}
+
+
+def frame_order(file_name):
+    """
+    Returns the sort key of a frame file (e.g. '2.png' or 'sprite_2.png').
+
+    Parameters
+    ----------
+    file_name : str
+        The name of the frame file.
+
+    Returns
+    -------
+    tuple
+        The number in the name (or -1) and the name itself.
+    """
+
+    match = re.search(r'\d+', file_name)
+
+    return (int(match.group()) if match else -1, file_name)
+
+
+def mirrored_animation(name):
+    """
+    Returns the animation a left-facing animation may mirror.
+
+    Parameters
+    ----------
+    name : str
+        The name of the animation.
+
+    Returns
+    -------
+    str or None
+        The name of the right-facing animation, or None.
+    """
+
+    if name.endswith('_left'):
+        return name[:-len('_left')] + '_right'
+
+    return None
+
+
+def pack(directory, animations=ANIMATIONS):
+    """
+    Packs the frames of the animation folders of a directory.
+
+    Parameters
+    ----------
+    directory : str
+        The directory with one folder of PNG frames per animation.
+
+    animations : sequence
+        The names of the animation folders.
+
+    Returns
+    -------
+    tuple
+        The atlas surface and the manifest (a dict with the frames of each
+        animation, either {'rect': [x, y, w, h]} or {'mirror': animation,
+        'frame': index}).
+    """
+
+    frames = {}
+    for name in animations:
+        path = os.path.join(directory, name)
+        files = sorted((file for file in os.listdir(path) if file.endswith('.png')), key=frame_order)
+        frames[name] = [pygame.image.load(os.path.join(path, file)) for file in files]
+
+    placed = {}  # pixels -> rect, so identical frames are stored once
+    images = []
+    manifest = {'image': ATLAS_IMAGE, 'animations': {}}
+    x = y = row_height = 0
+
+    for name in animations:
+        entries = []
+        mirror = mirrored_animation(name)
+
+        for index, frame in enumerate(frames[name]):
+            # Left frames that are mirror images of the right ones are flipped at load time
+            if mirror in frames and index < len(frames[mirror]):
+                flipped = pygame.transform.flip(frames[mirror][index], True, False)
+                if pygame.image.tobytes(flipped, 'RGBA') == pygame.image.tobytes(frame, 'RGBA'):
+                    entries.append({'mirror': mirror, 'frame': index})
+                    continue
+
+            pixels = (frame.get_size(), pygame.image.tobytes(frame, 'RGBA'))
+            if pixels not in placed:
+                width, height = frame.get_size()
+                if x + width > ATLAS_WIDTH and x > 0:
+                    x, y, row_height = 0, y + row_height, 0
+                placed[pixels] = [x, y, width, height]
+                images.append((frame, (x, y)))
+                x += width
+                row_height = max(row_height, height)
+
+            entries.append({'rect': placed[pixels]})
+
+        manifest['animations'][name] = entries
+
+    atlas_width = max((position[0] + frame.get_width() for frame, position in images), default=1)
+    atlas = pygame.Surface((atlas_width, max(y + row_height, 1)), pygame.SRCALPHA)
+    for frame, position in images:
+        atlas.blit(frame, position)
+
+    return atlas, manifest
+
+
+def write_atlas(directory, animations=ANIMATIONS):
+    """
+    Packs the frames of a directory and writes the atlas image and manifest to it.
+
+    Parameters
+    ----------
+    directory : str
+        The directory with one folder of PNG frames per animation.
+
+    animations : sequence
+        The names of the animation folders.
+
+    Returns
+    -------
+    dict
+        The manifest.
+    """
+
+    atlas, manifest = pack(directory, animations)
+    pygame.image.save(atlas, os.path.join(directory, ATLAS_IMAGE))
+    with open(os.path.join(directory, ATLAS_MANIFEST), 'w') as file:
+        json.dump(manifest, file, indent=2)
+
+    return manifest
+
+
+def _frames(atlas, manifest):
+    """
+    Cuts the frames of each animation out of the atlas.
+
+    Parameters
+    ----------
+    atlas : pygame.Surface
+        The atlas image.
+
+    manifest : dict
+        The manifest of the atlas.
+
+    Returns
+    -------
+    dict
+        The list of frames of each animation.
+    """
+
+    animations = {}
+
+    for name, entries in manifest['animations'].items():
+        animations[name] = []
+        for entry in entries:
+            if 'rect' in entry:
+                # Subsurfaces share the pixels of the atlas
+                animations[name].append(atlas.subsurface(pygame.Rect(entry['rect'])))
+            else:
+                source = animations[entry['mirror']][entry['frame']]
+                animations[name].append(pygame.transform.flip(source, True, False))
+
+    return animations
+
+
+def load_animations(directory):
+    """
+    Returns the animation frames of a directory, loading them once.
+
+    The atlas written by the packer is used when present; otherwise the frames are
+    packed in memory from the animation folders.
+
+    Parameters
+    ----------
+    directory : str
+        The directory with the atlas (or the animation folders).
+
+    Returns
+    -------
+    dict
+        The list of frames of each animation, shared by every caller.
+    """
+
+    directory = os.path.normpath(directory)
+    if directory in _loaded:
+        return _loaded[directory]
+
+    manifest_path = os.path.join(directory, ATLAS_MANIFEST)
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        atlas = assets.image(os.path.join(directory, manifest['image']))
+    except (OSError, ValueError, KeyError, pygame.error) as e:
+        print(f"Packing the frames of {directory} in memory: {e}")
+        atlas, manifest = pack(directory)
+        atlas = atlas.convert_alpha()
+
+    _loaded[directory] = _frames(atlas, manifest)
+
+    return _loaded[directory]
+
+
+# Main
+if __name__ == "__main__":
+
+    # Pack the directories given in the command line
+    for directory in sys.argv[1:]:
+        manifest = write_atlas(directory)
+        entries = [entry for entries in manifest['animations'].values() for entry in entries]
+        stored = {tuple(entry['rect']) for entry in entries if 'rect' in entry}
+        flipped = sum('mirror' in entry for entry in entries)
+        print(f"{directory}: {len(entries)} frames, {len(stored)} stored, {flipped} flipped at load time")
@@ -0,0 +1,218 @@
+"""
+audio.py
+
+This module contains the audio subsystem. The mixer is only initialised the first
+time a sound or the music is played, so runs without audio (e.g. headless) never
+open an audio device. The background music is streamed from disk by
+pygame.mixer.music instead of being decoded into memory, and the sound effects are
+decoded once into a bank, each one playing on its own reserved channel.
+"""
+
+import os
+
+import pygame
+
+from settings import AUDIO_ENABLED, SOUND_EFFECTS
+
+
+class Audio:
+    """
+    Lazily initialised music player and sound-effect bank.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether sound is played at all.
+
+    effects : dict
+        Path and volume of each sound effect, keyed by name.
+
+    bank : dict
+        The decoded sound effects, keyed by name.
+
+    channels : dict
+        The channel reserved for each sound effect, keyed by name.
+
+    initialized : bool
+        Whether the mixer and the bank are ready.
+
+    Methods
+    -------
+    init()
+        Initialises the mixer and loads the sound-effect bank.
+
+    play(name)
+        Plays a sound effect.
+
+    play_music(paths, volume)
+        Streams the background music in a loop.
+
+    stop_music()
+        Stops the background music.
+
+    memory_size()
+        Returns the bytes used by the decoded sound effects.
+    """
+
+    def __init__(self, enabled, effects):
+        """
+        Initializes the audio subsystem without touching the mixer.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether sound is played at all.
+
+        effects : dict
+            (path, volume) of each sound effect, keyed by name.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.enabled = enabled
+        self.effects = effects
+        self.bank = {}
+        self.channels = {}
+        self.initialized = False
+
+    def init(self):
+        """
+        Initialises the mixer and loads the sound-effect bank, once.
+
+        If the mixer cannot be initialised the audio is disabled and the game runs
+        silently.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        bool
+            True if sound can be played, False otherwise.
+        """
+
+        if not self.enabled or self.initialized:
+            return self.initialized
+
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Audio disabled, the mixer could not be initialised: {e}")
+            self.enabled = False
+            return False
+
+        # Each effect gets its own channel, so effects never cut each other off
+        pygame.mixer.set_reserved(len(self.effects))
+
+        for index, (name, (path, volume)) in enumerate(self.effects.items()):
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading sound: {path} - {e}")
+                continue
+            sound.set_volume(volume)
+            self.bank[name] = sound
+            self.channels[name] = pygame.mixer.Channel(index)
+
+        self.initialized = True
+
+        return True
+
+    def play(self, name):
+        """
+        Plays a sound effect on its reserved channel, restarting it if it is playing.
+
+        Parameters
+        ----------
+        name : str
+            The name of the sound effect.
+
+        Returns
+        -------
+        None.
+        """
+
+        if not self.init() or name not in self.bank:
+            return
+
+        self.channels[name].play(self.bank[name])
+
+    def play_music(self, paths, volume):
+        """
+        Streams the background music in a loop.
+
+        Parameters
+        ----------
+        paths : list
+            Candidate music files, in order of preference (e.g. a compressed OGG
+            before a WAV); the first one that exists is played.
+
+        volume : float
+            The music volume, between 0 and 1.
+
+        Returns
+        -------
+        None.
+        """
+
+        if not self.init():
+            return
+
+        path = next((path for path in paths if os.path.exists(path)), None)
+        if path is None:
+            print(f"No background music found: {', '.join(paths)}")
+            return
+
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as e:
+            print(f"Error loading music: {path} - {e}")
+            return
+
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops=-1)
+
+    def stop_music(self):
+        """
+        Stops the background music.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.initialized:
+            pygame.mixer.music.stop()
+
+    def memory_size(self):
+        """
+        Returns the bytes used by the decoded sound effects.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            The size of the decoded samples.
+        """
+
+        if not self.initialized:
+            return 0
+
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        sample_size = channels * abs(sample_format) // 8
+
+        return sum(int(sound.get_length() * frequency) * sample_size for sound in self.bank.values())
+
+
+# Audio shared by the whole game
+audio = Audio(AUDIO_ENABLED, SOUND_EFFECTS)
@@ -0,0 +1,517 @@
+"""
+camera.py
+
+This module contains the camera (viewport) used to scroll the level. Entities keep
+their world-space positions; the camera offset is only applied when they are drawn,
+and only the entities near the viewport are drawn and updated at all.
+"""
+
+import pygame
+
+
+class Camera:
+    """
+    Represents the viewport over the level.
+
+    Attributes
+    ----------
+    offset_x : int
+        Horizontal scroll of the viewport, in world pixels.
+
+    width : int
+        Width of the viewport in pixels.
+
+    height : int
+        Height of the viewport in pixels.
+
+    Methods
+    -------
+    reset()
+        Moves the viewport back to the start of the level.
+
+    scroll(dx)
+        Moves the viewport horizontally.
+
+    view_rect(margin)
+        Returns the visible area of the level in world space.
+
+    draw(group, surface, offset_x)
+        Draws the sprites of a group at their screen position.
+    """
+
+    def __init__(self, width, height):
+        """
+        Initializes the camera at the start of the level.
+
+        Parameters
+        ----------
+        width : int
+            Width of the viewport in pixels.
+
+        height : int
+            Height of the viewport in pixels.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.width = width
+        self.height = height
+        self.offset_x = 0
+
+    def reset(self):
+        """
+        Moves the viewport back to the start of the level.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.offset_x = 0
+
+    def scroll(self, dx):
+        """
+        Moves the viewport horizontally.
+
+        Parameters
+        ----------
+        dx : int
+            The amount to be scrolled along the x-axis.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.offset_x += dx
+
+    def view_rect(self, margin=0):
+        """
+        Returns the visible area of the level in world space.
+
+        Parameters
+        ----------
+        margin : int
+            Extra pixels added around each side of the viewport.
+
+        Returns
+        -------
+        pygame.Rect
+            The visible area, in world coordinates.
+        """
+
+        return pygame.Rect(self.offset_x - margin, -margin, self.width + 2 * margin, self.height + 2 * margin)
+
+    def draw(self, group, surface, offset_x=None):
+        """
+        Draws the sprites of a group at their screen position.
+
+        Parameters
+        ----------
+        group : pygame.sprite.AbstractGroup or iterable
+            The sprites to be drawn.
+
+        surface : pygame.Surface
+            The surface where the sprites will be drawn.
+
+        offset_x : int or None
+            Scroll to draw with (e.g. interpolated between two ticks), or None to use
+            the camera offset.
+
+        Returns
+        -------
+        list
+            The screen areas that were drawn.
+        """
+
+        offset = (-(self.offset_x if offset_x is None else offset_x), 0)
+        return surface.blits([(sprite.image, sprite.rect.move(offset)) for sprite in group])
+
+
+class SpatialBuckets:
+    """
+    Splits the sprites of a group into fixed-width vertical strips of the level.
+
+    The strips let the level find the sprites near the viewport without testing
+    every sprite of the group, so the work done per frame depends on what is on the
+    screen and not on the length of the level.
+
+    Attributes
+    ----------
+    bucket_width : int
+        Width of each strip in pixels.
+
+    buckets : dict
+        Maps the index of a strip to the list of sprites overlapping it.
+
+    order : dict
+        Maps each sprite to the order in which it was added.
+
+    Methods
+    -------
+    add(sprite)
+        Adds a sprite to the strips it overlaps.
+
+    query(rect)
+        Returns the live sprites colliding with a rectangle.
+    """
+
+    def __init__(self, sprites=(), bucket_width=256):
+        """
+        Initializes the buckets.
+
+        Parameters
+        ----------
+        sprites : iterable
+            The sprites to be indexed.
+
+        bucket_width : int
+            Width of each strip in pixels.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.bucket_width = bucket_width
+        self.buckets = {}
+        self.order = {}
+
+        for sprite in sprites:
+            self.add(sprite)
+
+    def add(self, sprite):
+        """
+        Adds a sprite to the strips it overlaps.
+
+        Parameters
+        ----------
+        sprite : pygame.sprite.Sprite
+            The sprite to be indexed. Its rect must not move afterwards.
+
+        Returns
+        -------
+        None.
+        """
+
+        first = sprite.rect.left // self.bucket_width
+        last = (sprite.rect.right - 1) // self.bucket_width
+        self.order[sprite] = len(self.order)
+
+        for index in range(first, max(first, last) + 1):
+            self.buckets.setdefault(index, []).append(sprite)
+
+    def query(self, rect):
+        """
+        Returns the live sprites colliding with a rectangle.
+
+        Sprites removed from their groups (e.g. collected books) are skipped, and
+        the sprites keep the order in which they were added.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The area to look up, in world coordinates.
+
+        Returns
+        -------
+        list
+            The sprites colliding with the area.
+        """
+
+        first = rect.left // self.bucket_width
+        last = (rect.right - 1) // self.bucket_width
+        found = []
+        seen = set()
+
+        for index in range(first, last + 1):
+            for sprite in self.buckets.get(index, ()):
+                if sprite not in seen and sprite.alive() and sprite.rect.colliderect(rect):
+                    seen.add(sprite)
+                    found.append(sprite)
+
+        if first != last:
+            found.sort(key=self.order.__getitem__)
+
+        return found
+
+
+class ChunkedBackground:
+    """
+    Level background split into screen-sized chunks in the display pixel format.
+
+    Blitting the whole level image every frame makes pygame clip (and, for a
+    non-converted image, convert) a surface many screens wide. The chunks are
+    converted once at load time and each frame blits only the ones on the screen.
+
+    Attributes
+    ----------
+    chunk_width : int
+        Width of each chunk in pixels.
+
+    chunks : list
+        The chunks of the background, from left to right.
+
+    width : int
+        Width of the whole background in pixels.
+
+    height : int
+        Height of the whole background in pixels.
+
+    Methods
+    -------
+    draw(surface, offset_x)
+        Draws the chunks overlapping the viewport.
+
+    draw_area(surface, offset_x, area)
+        Draws the background only inside an area of the screen.
+
+    memory_size()
+        Returns the number of bytes used by the chunk pixels.
+    """
+
+    def __init__(self, image, chunk_width):
+        """
+        Splits an image into chunks.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+            The full background of the level.
+
+        chunk_width : int
+            Width of each chunk in pixels.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.chunk_width = chunk_width
+        self.width, self.height = image.get_size()
+        self.chunks = []
+
+        for x in range(0, self.width, chunk_width):
+            area = pygame.Rect(x, 0, min(chunk_width, self.width - x), self.height)
+            self.chunks.append(image.subsurface(area).convert())
+
+    def draw(self, surface, offset_x):
+        """
+        Draws the chunks overlapping the viewport.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface where the background will be drawn.
+
+        offset_x : int
+            Horizontal scroll of the viewport, in world pixels.
+
+        Returns
+        -------
+        int
+            The number of chunks blitted.
+        """
+
+        first = int(offset_x // self.chunk_width)
+        last = int((offset_x + surface.get_width() - 1) // self.chunk_width)
+        blits = []
+
+        for index in range(max(first, 0), min(last, len(self.chunks) - 1) + 1):
+            blits.append((self.chunks[index], (index * self.chunk_width - offset_x, 0)))
+
+        surface.blits(blits, False)
+
+        return len(blits)
+
+    def draw_area(self, surface, offset_x, area):
+        """
+        Draws the background only inside an area of the screen.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface where the background will be drawn.
+
+        offset_x : int
+            Horizontal scroll of the viewport, in world pixels.
+
+        area : pygame.Rect
+            The area of the screen to be restored.
+
+        Returns
+        -------
+        int
+            The number of chunks blitted.
+        """
+
+        first = int((area.left + offset_x) // self.chunk_width)
+        last = int((area.right - 1 + offset_x) // self.chunk_width)
+        indices = range(max(first, 0), min(last, len(self.chunks) - 1) + 1)
+
+        for index in indices:
+            chunk = self.chunks[index]
+            chunk_x = index * self.chunk_width - offset_x
+            source = area.move(-chunk_x, 0).clip(chunk.get_rect())
+            surface.blit(chunk, (chunk_x + source.x, source.y), source)
+
+        return len(indices)
+
+    def memory_size(self):
+        """
+        Returns the number of bytes used by the chunk pixels.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            The size of the chunks in bytes.
+        """
+
+        return sum(chunk.get_pitch() * chunk.get_height() for chunk in self.chunks)
+
+
+class DirtyRenderer:
+    """
+    Presents only the areas of the screen that changed since the previous frame.
+
+    On frames where the camera did not scroll, the level restores the background
+    under the areas drawn in the previous frame, draws the sprites and HUD again and
+    pushes only those areas to the display. Frames where the camera scrolled (or
+    after something else drew over the screen) fall back to a full redraw and flip.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether dirty rectangles are used at all.
+
+    full_redraw : bool
+        Whether the current frame redraws and presents the whole screen.
+
+    previous_rects : list
+        Screen areas drawn in the previous frame.
+
+    rects : list
+        Screen areas drawn in the current frame.
+
+    Methods
+    -------
+    invalidate()
+        Forces the next frame to be fully redrawn.
+
+    begin(offset_x)
+        Starts a frame and decides whether it is fully redrawn.
+
+    add(rects)
+        Records screen areas drawn in the current frame.
+
+    present()
+        Pushes the current frame to the display.
+    """
+
+    def __init__(self, enabled):
+        """
+        Initializes the renderer.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether dirty rectangles are used at all.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.enabled = enabled
+        self.full_redraw = True
+        self.previous_rects = []
+        self.rects = []
+        self._last_offset = None
+        self._invalid = True
+
+    def invalidate(self):
+        """
+        Forces the next frame to be fully redrawn.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self._invalid = True
+
+    def begin(self, offset_x):
+        """
+        Starts a frame and decides whether it is fully redrawn.
+
+        Parameters
+        ----------
+        offset_x : int
+            Horizontal scroll of the camera in this frame.
+
+        Returns
+        -------
+        bool
+            True if the whole screen has to be redrawn.
+        """
+
+        self.full_redraw = not self.enabled or self._invalid or offset_x != self._last_offset
+        self._last_offset = offset_x
+        self._invalid = False
+        self.rects = []
+
+        return self.full_redraw
+
+    def add(self, rects):
+        """
+        Records screen areas drawn in the current frame.
+
+        Parameters
+        ----------
+        rects : list or pygame.Rect
+            The areas drawn.
+
+        Returns
+        -------
+        None.
+        """
+
+        if isinstance(rects, pygame.Rect):
+            self.rects.append(rects)
+        else:
+            self.rects.extend(rects)
+
+    def present(self):
+        """
+        Pushes the current frame to the display.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous_rects + self.rects)
+
+        self.previous_rects = self.rects
+        self.rects = []
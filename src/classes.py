@@ -1,39 +1,14 @@
 import pygame
-from os import walk
 from settings import *
 from menu import *
-import time
-import sys
-
-
-# Auxiliary function
-def import_folder(path):
-    """
-    Import images of a folder
-
-    Parameters
-    ----------
-    path : str
-        The path of the folder containing the images
-    
-    Returns
-    -------
-    list
-        A list of surfaces (images)
-    """
-
-    surface_list = []
-
-    for _, __, img_files in walk(path):
-        for image in img_files:
-            full_path = path + '/' + image
-            try:
-                image_surf = pygame.image.load(full_path).convert_alpha()
-                surface_list.append(image_surf)
-            except pygame.error as e:
-                print(f"Error loading image: {full_path} - {e}")
-
-    return surface_list
+from assets import assets
+from audio import audio
+from atlas import load_animations
+from camera import Camera, DirtyRenderer, SpatialBuckets
+from inputs import JUMP, LEFT, RIGHT, KeyboardInput
+from profiler import profiler
+from level_compiler import COLLECTIBLE, FINISH, NPC as NPC_CELL, PLAYER
+from level_loader import LevelLoader
 
 
 # Classes
@@ -86,9 +61,6 @@ class Tile(Entity):
     -------
     __init__(self, pos, size)
         Initializes the block.
-    
-    update(self, x_shift)
-        Updates the position of the block along the x-axis.
     """
 
     def __init__(self, pos, size):
@@ -113,22 +85,6 @@ class Tile(Entity):
         self.image.fill('grey')
         self.rect = self.image.get_rect(topleft=pos)
 
-    def update(self, x_shift):
-        """
-        Updates the position of the block along the x-axis.
-
-        Parameters
-        ----------
-        x_shift : int
-            The amount to be shifted along the x-axis.
-
-        Returns
-        -------
-        None.
-        """
-
-        self.rect.x += x_shift
-
 
 class Finish(Tile):
     """
@@ -146,9 +102,6 @@ class Finish(Tile):
     -------
     __init__(self, pos, size)
         Initializes the finish block.
-    
-    update(self, x_shift)
-        Updates the position of the finish block along the x-axis.
     """
         
     def __init__(self, pos, size):
@@ -170,21 +123,6 @@ class Finish(Tile):
 
         super().__init__(pos, size)
         self.image.fill('green')
-    
-    def update(self, x_shift):
-        """
-        Updates the position of the finish block along the x-axis.
-
-        Parameters
-        ----------
-        x_shift : int
-            The amount to be shifted along the x-axis.
-
-        Returns
-        -------
-        None.
-        """
-        self.rect.x += x_shift
 
 
 class Player(Entity):
@@ -227,13 +165,16 @@ class Player(Entity):
     on_right : bool
         True if the player is touching a surface on the right.
 
+    controller : KeyboardInput or ScriptedInput
+        Source of the buttons held each tick.
+
     Methods
     -------
-    __init__(pos)
+    __init__(pos, controller)
         Initializes the player instance.
 
     import_character_assets()
-        Imports character animations.
+        Loads the character animations from the shared atlas.
 
     update()
         Updates the player's state.
@@ -254,22 +195,28 @@ class Player(Entity):
         Animates the player based on the current status.
     """
 
-    def __init__(self, pos):
+    def __init__(self, pos, controller=None):
         super().__init__(pos)
-        pygame.mixer.init()
+        self.controller = controller if controller is not None else KeyboardInput()
 
-
-        self.import_character_assets()
         self.frame_index = 0
         self.animation_speed = 0.10
-        self.image = self.animations['idle_right'][self.frame_index]
-        self.rect = self.image.get_rect(topleft=self.rect.topleft)
+
+        if HEADLESS:
+            # Only the size of the sprite matters to the simulation
+            self.animations = {'idle_right':[],'idle_left':[], 'running_right':[], 'running_left':[]}
+            self.image = None
+            self.rect = pygame.Rect(self.rect.topleft, assets.image_size('src/graphics/character/idle_right/0.png'))
+        else:
+            self.import_character_assets()
+            self.image = self.animations['idle_right'][self.frame_index]
+            self.rect = self.image.get_rect(topleft=self.rect.topleft)
 
         # Player movement
         self.direction = pygame.math.Vector2(0, 0)
-        self.speed = 8
-        self._gravity = 0.8
-        self.jump_speed = -16
+        self.speed = PLAYER_SPEED
+        self._gravity = PLAYER_GRAVITY
+        self.jump_speed = PLAYER_JUMP_SPEED
 
         # Player status
         self.status = 'idle_right'
@@ -278,10 +225,6 @@ class Player(Entity):
         self.on_left = False
         self.on_right = False
 
-        #audio
-        self.__jump_sound = pygame.mixer.Sound('src/audio/jump_sound.wav')
-        self.__jump_sound.set_volume(0.8)
-
     @property
     def x(self):
         """
@@ -328,7 +271,9 @@ class Player(Entity):
 
     def import_character_assets(self):
         """
-        Imports character animations.
+        Loads the character animations from the shared atlas.
+
+        The frames are loaded once and shared by every Player (see atlas.py).
 
         Parameters
         ----------
@@ -338,14 +283,8 @@ class Player(Entity):
         -------
         None.
         """
-                
-        character_path = 'src/graphics/character/'
-        
-        self.animations = {'idle_right':[],'idle_left':[], 'running_right':[], 'running_left':[]}
 
-        for animation in self.animations.keys():
-            full_path = character_path +  animation
-            self.animations[animation] = import_folder(full_path)
+        self.animations = load_animations('src/graphics/character')
 
     def update(self):
         """
@@ -377,16 +316,16 @@ class Player(Entity):
         None.
         """
 
-        keys = pygame.key.get_pressed()
+        buttons = self.controller.read()
 
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if buttons & RIGHT:
             self.direction.x = 1
-        elif keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        elif buttons & LEFT:
             self.direction.x = -1
         else:
             self.direction.x = 0
 
-        if self.on_ground and (keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]):
+        if self.on_ground and buttons & JUMP:
             self.jump()
             
     def handle_status(self):
@@ -442,7 +381,7 @@ class Player(Entity):
         """
 
         self.direction.y = self.jump_speed
-        self.__jump_sound.play()
+        audio.play('jump')
 
     def animate(self):
         """
@@ -492,13 +431,13 @@ class NPC(Entity):
     was_answered : bool
         True if the NPC's question was answered.
 
+    choice : int or None
+        Index of the answer given to the question.
+
     Methods
     -------
-    update(x_shift)
-        Updates the position of the NPC along the x-axis.
-
-    question(list_of_questions, question_index)
-        Displays a question and handles player input for answering it.
+    answer(list_of_questions, question_index, choice)
+        Answers the question and checks if the answer is correct.
     """
 
     def __init__(self, pos, list_of_questions, question_index):
@@ -528,28 +467,86 @@ class NPC(Entity):
         self.list_of_questions = list_of_questions
         self.question_index = question_index
         self.was_answered = False
+        self.choice = None
 
-    def update(self, x_shift):
+    def answer(self, list_of_questions, question_index, choice):
         """
-        Updates the position of the NPC along the x-axis.
+        Answers the question and checks if the answer is correct.
 
         Parameters
         ----------
-        x_shift : int
-            The amount to be shifted along the x-axis.
+        list_of_questions : list
+            List of dictionaries containing questions and answers.
+
+        question_index : int
+            Index indicating the current question from the list.
+
+        choice : int
+            Index of the chosen answer.
 
         Returns
         -------
-        None.
+        int
+            1 if the answer is correct, 0 otherwise.
         """
-        self.rect.x += x_shift
 
-    def question(self, list_of_questions, question_index):
+        self.was_answered = True
+        self.choice = choice
+        correct_answer_index = list_of_questions[question_index]['answers'][-1]
+
+        return int(choice == correct_answer_index)
+
+
+class QuizDialog:
+    """
+    Question box shown while the player answers the question of an NPC.
+
+    The dialog is a state of the play screen: the main loop keeps running, draws it
+    over the level and passes it the events, and the level simulation waits until
+    the dialog is finished. After an answer the feedback stays on screen for
+    QUIZ_FEEDBACK_TIME milliseconds.
+
+    Attributes
+    ----------
+    npc : NPC
+        The NPC asking the question.
+
+    list_of_questions : list
+        List of dictionaries containing questions and answers.
+
+    question_index : int
+        Index indicating the current question from the list.
+
+    answer_buttons : list
+        The buttons of the answers.
+
+    result : int or None
+        1 if the answer is correct, 0 if it is not, None before an answer.
+
+    feedback_end : int or None
+        Time (pygame ticks) when the feedback is closed.
+
+    Methods
+    -------
+    handle_event(event)
+        Handles a single event while the dialog is open.
+
+    is_finished()
+        Checks if the question was answered and the feedback was shown.
+
+    draw(surface)
+        Draws the question box or the feedback.
+    """
+
+    def __init__(self, npc, list_of_questions, question_index):
         """
-        Displays a question and handles player input for answering it.
+        Initializes the dialog.
 
         Parameters
         ----------
+        npc : NPC
+            The NPC asking the question.
+
         list_of_questions : list
             List of dictionaries containing questions and answers.
 
@@ -558,79 +555,113 @@ class NPC(Entity):
 
         Returns
         -------
-        int
-            1 if the answer is correct, 0 otherwise.
+        None.
         """
-        
+
+        self.npc = npc
+        self.list_of_questions = list_of_questions
+        self.question_index = question_index
+        self.result = None
+        self.feedback_end = None
+
         # Extract the question text and the answers
         question = list_of_questions[question_index]
-
-        question_text, answers = question['text'], question['answers']
-        correct_answer_index = answers[-1]  # Get the index of the correct answer
+        self.question_text, answers = question['text'], question['answers']
+        self.answers_len = len(max(answers[0:3]))
 
         # Create buttons for the answers (excluding the last element which is the correct answer index)
-        answer_buttons = [Button(image=None, pos=(640, 360 + i * 100), text_input=answer, font=get_font(38), base_color="Black", hovering_color="Blue") for i, answer in enumerate(answers[:-1])]
-
-        while True:
-            mouse_pos = pygame.mouse.get_pos()
-
-            thickness = 5
-
-            question_len = len(question_text)
-            pygame.draw.rect(screen, "black", pygame.Rect(640 - 18 * question_len - thickness, 150 - thickness, 36 * question_len + 2 * thickness, 100 + 2 * thickness))
-            pygame.draw.rect(screen, "white", pygame.Rect(640 - 18 * question_len, 150, 36 * question_len, 100))
-
-            answers_len = answers[0:3]
-            answers_len = len(max(answers_len))
-            pygame.draw.rect(screen, "black", pygame.Rect(640 - 40 * answers_len - thickness, 310 - thickness, 80* answers_len + 2 * thickness, 300 + 2 * thickness))
-            pygame.draw.rect(screen, "white", pygame.Rect(640 - 40 * answers_len, 310, 80 * answers_len, 300))
-
-
-            # Split the question into lines
-            lines = question_text.split('\n')
-
-            # Display each line separately
-            for i, line in enumerate(lines):
-                line_surface = get_font(30).render(line, True, "Black")
-                line_rect = line_surface.get_rect(center=(640, 200 + i * 30))  # Adjust the y-coordinate for each line
-                screen.blit(line_surface, line_rect)
-
-            # Update and draw the answer buttons
-            for button in answer_buttons:
-                button.change_color(mouse_pos)
-                button.update(screen)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    for i, button in enumerate(answer_buttons):
-                        if button.check_for_input(mouse_pos):
-                            self.was_answered = True
-                            
-                            # Check if the selected answer is correct
-                            if i == correct_answer_index:
-                                # Display a message indicating that the answer is correct
-                                screen.fill("black")                                
-                                answer_event = get_font(30).render("CORRECT ANSWER", True, "Green")
-                                answer_rect= answer_event.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
-                                screen.blit(answer_event, answer_rect)
-                                pygame.display.flip()
-                                time.sleep(2.5)           
-                                return 1
-                            else:
-                                # Display a message indicating that the answer is incorrect
-                                screen.fill("black")                                
-                                answer_event = get_font(30).render("INCORRECT ANSWER", True, "Red")
-                                answer_rect= answer_event.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
-                                screen.blit(answer_event, answer_rect)
-                                pygame.display.flip()
-                                time.sleep(2.5)
-                                return 0
-                            
-                            
-            pygame.display.update()        
+        self.answer_buttons = [Button(image=None, pos=(640, 360 + i * 100), text_input=answer, font=get_font(38), base_color="Black", hovering_color="Blue") for i, answer in enumerate(answers[:-1])]
+
+    def handle_event(self, event):
+        """
+        Handles a single event while the dialog is open.
+
+        Parameters
+        ----------
+        event : pygame.event.Event
+            The event to be handled.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.result is None and event.type == pygame.MOUSEBUTTONDOWN:
+            for i, button in enumerate(self.answer_buttons):
+                if button.check_for_input(event.pos):
+                    # Check if the selected answer is correct
+                    self.result = self.npc.answer(self.list_of_questions, self.question_index, i)
+                    self.feedback_end = pygame.time.get_ticks() + QUIZ_FEEDBACK_TIME
+                    break
+
+    def is_finished(self):
+        """
+        Checks if the question was answered and the feedback was shown.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        bool
+            True if the dialog can be closed, False otherwise.
+        """
+
+        return self.result is not None and pygame.time.get_ticks() >= self.feedback_end
+
+    def draw(self, surface):
+        """
+        Draws the question box or, after an answer, the feedback.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface where the dialog will be drawn.
+
+        Returns
+        -------
+        pygame.Rect
+            The area of the screen that was drawn.
+        """
+
+        if self.result is not None:
+            # Display a message indicating whether the answer is correct
+            surface.fill("black")
+            if self.result:
+                answer_event = assets.text(get_font(30), "CORRECT ANSWER", True, "Green")
+            else:
+                answer_event = assets.text(get_font(30), "INCORRECT ANSWER", True, "Red")
+            answer_rect = answer_event.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
+            surface.blit(answer_event, answer_rect)
+
+            return surface.get_rect()
+
+        thickness = 5
+
+        question_len = len(self.question_text)
+        question_box = pygame.Rect(640 - 18 * question_len - thickness, 150 - thickness, 36 * question_len + 2 * thickness, 100 + 2 * thickness)
+        pygame.draw.rect(surface, "black", question_box)
+        pygame.draw.rect(surface, "white", question_box.inflate(-2 * thickness, -2 * thickness))
+
+        answers_len = self.answers_len
+        answers_box = pygame.Rect(640 - 40 * answers_len - thickness, 310 - thickness, 80 * answers_len + 2 * thickness, 300 + 2 * thickness)
+        pygame.draw.rect(surface, "black", answers_box)
+        pygame.draw.rect(surface, "white", answers_box.inflate(-2 * thickness, -2 * thickness))
+
+        # Display each line of the question separately
+        for i, line in enumerate(self.question_text.split('\n')):
+            line_surface = assets.text(get_font(30), line, True, "Black")
+            line_rect = line_surface.get_rect(center=(640, 200 + i * 30))  # Adjust the y-coordinate for each line
+            surface.blit(line_surface, line_rect)
+
+        # Update and draw the answer buttons
+        mouse_pos = pygame.mouse.get_pos()
+        for button in self.answer_buttons:
+            button.change_color(mouse_pos)
+            button.update(surface)
+
+        return question_box.union(answers_box)
         
 
 class Collectible(Entity):
@@ -655,9 +686,6 @@ class Collectible(Entity):
 
     __change_health(amount)
         Changes the player's health by the specified amount.
-
-    update(x_shift)
-        Updates the position of the collectible along the x-axis.
     """
 
     def __init__(self, pos, value):
@@ -679,11 +707,12 @@ class Collectible(Entity):
         """
         
         super().__init__(pos)
-        image = pygame.image.load("src/graphics/collectibles/book.png").convert_alpha()
-        rect_image = image.get_rect()
-        self.image = pygame.Surface((rect_image.width, rect_image.height), pygame.SRCALPHA)
-        self.image.blit(image, (0, 0))
-        self.rect = self.image.get_rect(topleft=pos)
+        if HEADLESS:
+            self.image = None
+            self.rect = pygame.Rect(pos, assets.image_size("src/graphics/collectibles/book.png"))
+        else:
+            self.image = assets.image("src/graphics/collectibles/book.png")  # shared by every collectible
+            self.rect = self.image.get_rect(topleft=pos)
         self.value = value
 
     def __change_books(self, amount):
@@ -720,23 +749,6 @@ class Collectible(Entity):
         """
         self.cur_health += amount
 
-    def update(self, x_shift):
-        """
-        Updates the position of the collectible along the x-axis.
-
-        Parameters
-        ----------
-        x_shift : int
-            The amount to be shifted along the x-axis.
-
-        Returns
-        -------
-        None.
-
-        """
-
-        self.rect.x += x_shift
-
 
 class UI:
     """
@@ -798,15 +810,15 @@ class UI:
         self.display_surface = surface 
 
         # health 
-        self.book_bar = pygame.image.load(book_bar_image_path).convert_alpha()
+        self.book_bar = assets.image(book_bar_image_path)
         self.book_bar_topleft = (35, 45)
         self.bar_max_width = 4
         self.bar_height = 4
 
         # books
-        self.book = pygame.image.load('src/graphics/collectibles/book.png').convert_alpha()
+        self.book = assets.image('src/graphics/collectibles/book.png')
         self.book_rect = self.book.get_rect(topleft=(50, 61))
-        self.font = pygame.font.Font(None, 36)
+        self.font = assets.font(None, 36)
 
     def show_health(self, current, full):
         """
@@ -822,15 +834,18 @@ class UI:
 
         Returns
         -------
-        None.
+        pygame.Rect
+            The area of the screen that was drawn.
         """
 
-        self.display_surface.blit(self.book_bar, (20, 10))
+        book_bar_rect = self.display_surface.blit(self.book_bar, (20, 10))
         current_book_ratio = current / full
         current_bar_width = self.bar_max_width * current_book_ratio
         health_bar_rect = pygame.Rect(self.book_bar_topleft, (current_bar_width, self.bar_height))
         pygame.draw.rect(self.display_surface, '#dc4949', health_bar_rect)
 
+        return book_bar_rect.union(health_bar_rect)
+
     def show_books(self, amount):
         """
         Displays the collected books and their amount on the UI.
@@ -842,13 +857,16 @@ class UI:
 
         Returns
         -------
-        None.
+        pygame.Rect
+            The area of the screen that was drawn.
         """
         self.display_surface.blit(self.book, self.book_rect)
-        book_amount_surf = self.font.render(str(amount), False, '#33323d')
+        book_amount_surf = assets.text(self.font, str(amount), False, '#33323d')
         book_amount_rect = book_amount_surf.get_rect(midleft=(self.book_rect.right + 4, self.book_rect.centery))
         self.display_surface.blit(book_amount_surf, book_amount_rect)
 
+        return self.book_rect.union(book_amount_rect)
+
 
 class Level:
     """
@@ -859,23 +877,32 @@ class Level:
     display_surface : pygame.Surface
         The display surface for rendering the level.
 
-    levels : list
-        List containing level layouts.
+    levels : LevelRegistry
+        Registry loading the compiled level maps on demand.
+
+    loader : LevelLoader
+        Prepares the next level in the background while the current one is played.
 
     current_level : int
         Index of the current level.
 
-    world_shift : int
-        Horizontal shift of the world.
+    controller : KeyboardInput or ScriptedInput
+        Source of the player's buttons and quiz answers.
+
+    camera : Camera
+        Viewport holding the horizontal scroll of the level.
+
+    previous_player_pos, previous_offset_x : tuple, int
+        Player position and camera scroll before the last tick, used to interpolate frames.
+
+    renderer : DirtyRenderer
+        Tracks the areas of the screen drawn each frame and presents the frame.
 
     current_x : int
         Current x-coordinate.
 
-    background_image : pygame.Surface
-        The background image of the level.
-
-    bg_x : int
-        Background x-coordinate.
+    background : ChunkedBackground
+        The background image of the level, split in screen-sized chunks.
 
     game_over : bool
         Flag indicating whether the game is over.
@@ -889,16 +916,44 @@ class Level:
     ui : UI
         The user interface for the level.
 
+    solid_grid : SolidGrid
+        Solidity grid of the level, resolving the movements of the player.
+
+    npc_buckets, collectible_buckets, finish_buckets : SpatialBuckets
+        Strips of the level used to find the entities near the screen.
+
+    visible_npcs, visible_collectibles, visible_finish : list
+        Entities close enough to the screen to be drawn and updated this frame.
+
+    quiz : QuizDialog or None
+        The question being answered; the simulation waits while it is open.
+
+    loading : int or None
+        Index of the level being prepared; the simulation waits and a progress
+        screen is drawn until it is ready.
+
     Methods
     -------
-    initialize_level(layout)
-        Initializes the level based on the given layout.
+    enter_level(index)
+        Starts a level, or waits for it to be prepared without blocking the game.
+
+    start_level(index)
+        Starts a level at once, blocking until it is prepared if needed.
+
+    draw_loading()
+        Draws the progress screen of the level being prepared.
+
+    initialize_level(prepared)
+        Initializes the level based on the given prepared level.
 
     next_level()
         Moves to the next level.
 
     scroll_x()
-        Handles horizontal scrolling based on player position.
+        Scrolls the camera based on player position.
+
+    cull()
+        Selects the entities close enough to the screen to be drawn and updated.
 
     horizontal_movement_collision()
         Handles collisions during horizontal movement.
@@ -909,6 +964,9 @@ class Level:
     check_npc_collision()
         Checks for collisions between the player and NPCs.
 
+    close_quiz()
+        Closes the quiz dialog and adds its result to the score.
+
     check_collectible_collisions()
         Checks for collisions between the player and collectibles.
 
@@ -918,83 +976,188 @@ class Level:
     is_completed()
         Checks if the level is completed.
 
+    state()
+        Returns the progress of the player.
+
+    snapshot()
+        Records the player and camera positions the next frames interpolate from.
+
+    update()
+        Advances the level simulation by one fixed tick.
+
+    draw(alpha)
+        Draws the level, interpolating between the last two ticks.
+
     run()
-        Runs the main logic for the level.
+        Runs the main logic for the level: one simulation tick followed by a frame.
+
+    present()
+        Pushes the frame drawn by draw() to the display.
     """
 
-    def __init__(self, level_list, bg_list,surface):
+    def __init__(self, level_list, bg_list,surface, controller=None):
         """
         Initializes the Level instance.
 
+        In headless mode (HEADLESS setting) nothing is loaded that is only needed to
+        draw the level, so only update() may be called.
+
         Parameters
         ----------
-        level_list : list
-            List containing level layouts.
+        level_list : LevelRegistry
+            Registry loading the compiled level maps on demand.
 
-        surface : pygame.Surface
+        bg_list : list
+            Paths of the background images of the levels.
+
+        surface : pygame.Surface or None
             The display surface for rendering the level.
 
+        controller : KeyboardInput or ScriptedInput or None
+            Source of the player's buttons and quiz answers (the keyboard by default).
+
         Returns
         -------
         None.
         """
 
         self.display_surface = surface
-        self.initialize_level(level_list[0])
-        self.background_image = pygame.image.load(bg_list[0])
         self.levels = level_list
         self.current_level = 0
-        self.world_shift = 0
+        self.controller = controller if controller is not None else KeyboardInput()
+        self.quiz = None
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.renderer = DirtyRenderer(DIRTY_RECTS)
+        # Headless runs skip the backgrounds and prepare the levels on the spot
+        self.loader = LevelLoader(level_list, None if HEADLESS else bg_list, TILE_SIZE, SCREEN_WIDTH,
+                                  0 if HEADLESS else LOADER_WORKERS)
+        self.loading = None
+        # The first level is prepared before the game starts
+        self.start_level(self.current_level)
         self.current_x = 0
-        self.bg_x = 0
         self.game_over = False
         self.score = 0
 
         #collectibles
         self.collectibles_collected = 0 
-        self.book_bar = pygame.image.load('src/graphics/collectibles/book_bar.png').convert_alpha()
-        self.ui = UI(self.display_surface, 'src/graphics/collectibles/book_bar.png')  # Add the UI to the level
+        if not HEADLESS:
+            self.book_bar = assets.image('src/graphics/collectibles/book_bar.png')
+            self.ui = UI(self.display_surface, 'src/graphics/collectibles/book_bar.png')  # Add the UI to the level
+
+    def enter_level(self, index):
+        """
+        Starts a level if it is prepared; otherwise the simulation waits, with a
+        progress screen, until it is (see update() and draw()).
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.loader.preload(index)
+        if HEADLESS or self.loader.is_ready(index):
+            self.start_level(index)
+        else:
+            self.loading = index
+            self.renderer.invalidate()
 
-    def initialize_level(self, layout):
+    def start_level(self, index):
         """
-        Initializes the level based on the given layout.
+        Starts a level at once, blocking until it is prepared if needed, and starts
+        preparing the level played after it.
 
         Parameters
         ----------
-        layout : list
-            Layout representing the level.
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        None.
+        """
+
+        # Everything loaded in the background is switched in at once, between two ticks
+        prepared = self.loader.take(index)
+        self.loading = None
+        self.current_level = index
+        self.camera.reset()
+        self.renderer.invalidate()
+        self.background = prepared.background
+        self.initialize_level(prepared)
+
+        # The first level is prepared again after the last one, for a restart
+        self.loader.preload(index + 1 if index + 1 < len(self.levels) else 0)
+
+    def draw_loading(self):
+        """
+        Draws the progress screen of the level being prepared.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.renderer.invalidate()
+        self.renderer.begin(self.camera.offset_x)
+
+        bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 20)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
+        filled = bar.inflate(-8, -8)
+        filled.width = round(filled.width * self.loader.progress(self.loading))
+
+        self.display_surface.fill('black')
+        text = assets.text(get_font(30), "LOADING", True, 'White')
+        self.display_surface.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+        pygame.draw.rect(self.display_surface, 'White', bar, 2)
+        pygame.draw.rect(self.display_surface, 'White', filled)
+        self.renderer.add(self.display_surface.get_rect())
+
+    def initialize_level(self, prepared):
+        """
+        Initializes the level based on the given prepared level.
+
+        Parameters
+        ----------
+        prepared : PreparedLevel
+            The compiled map, solidity grid and entity positions of the level.
 
         Returns
         -------
         None.
         """
 
-        self.tiles = pygame.sprite.Group()
         self.player = pygame.sprite.GroupSingle()
         self.npcs = pygame.sprite.Group()
         self.finish = pygame.sprite.GroupSingle()
         self.collectible = pygame.sprite.Group()
-        
-        for row_index, row in enumerate(layout):
-            for col_index, cell in enumerate(row):
-                x = col_index * TILE_SIZE
-                y = row_index * TILE_SIZE
-
-                if cell == 'X':
-                    tile = Tile((x, y), TILE_SIZE)
-                    self.tiles.add(tile)
-                if cell == 'P':
-                    player_sprite = Player((x, y))
-                    self.player.add(player_sprite)
-                if cell == 'N':
-                    npc_sprite = NPC((x, y), list_of_questions, 0)
-                    self.npcs.add(npc_sprite)
-                if cell == 'F':
-                    finish_sprite = Finish((x, y), TILE_SIZE)
-                    self.finish.add(finish_sprite)
-                if cell == 'C':
-                    collectible_sprite = Collectible((x,y), value = 1)
-                    self.collectible.add(collectible_sprite)
+        self.solid_grid = prepared.solid_grid
+
+        for x, y in prepared.entities.get(PLAYER, []):
+            self.player.add(Player((x, y), self.controller))
+        for x, y in prepared.entities.get(NPC_CELL, []):
+            self.npcs.add(NPC((x, y), list_of_questions, len(self.npcs)))
+        for x, y in prepared.entities.get(FINISH, []):
+            self.finish.add(Finish((x, y), TILE_SIZE))
+        for x, y in prepared.entities.get(COLLECTIBLE, []):
+            self.collectible.add(Collectible((x, y), value = 1))
+
+        # Split the entities in strips so only the ones near the screen are processed
+        self.npc_buckets = SpatialBuckets(self.npcs)
+        self.collectible_buckets = SpatialBuckets(self.collectible)
+        self.finish_buckets = SpatialBuckets(self.finish)
+        self.visible_npcs = []
+        self.visible_collectibles = []
+        self.visible_finish = []
+        self.snapshot()
 
     def next_level(self):
         """
@@ -1015,11 +1178,7 @@ class Level:
             return
         
         # Move to the next level
-        self.current_level += 1
-        self.player.empty()
-        self.bg_x = 0
-        self.background_image = pygame.image.load(bg_list[self.current_level])
-        self.initialize_level(self.levels[self.current_level])
+        self.enter_level(self.current_level + 1)
 
     def restart(self):
         """
@@ -1037,15 +1196,12 @@ class Level:
         self.game_over = False
         self.score = 0
         self.collectibles_collected = 0 
-        self.bg_x = 0
-        self.current_level = 0
-        self.player.empty()
-        self.background_image = pygame.image.load(bg_list[self.current_level])
-        self.initialize_level(self.levels[self.current_level])
+        self.quiz = None
+        self.enter_level(0)
 
     def scroll_x(self):
         """
-        Handles horizontal scrolling based on player position.
+        Scrolls the camera based on player position.
 
         Parameters
         ----------
@@ -1057,18 +1213,36 @@ class Level:
         """
 
         player = self.player.sprite
-        player_x = player.rect.centerx
+        player_x = player.rect.centerx - self.camera.offset_x  # position on the screen
         direction_x = player.direction.x
 
+        # The camera follows the player while it walks towards the edges of the screen
         if player_x < SCREEN_WIDTH / 3 and direction_x < 0:
-            self.world_shift = 8
-            player.speed = 0
+            self.camera.scroll(-player.speed)
         elif player_x > SCREEN_WIDTH - (SCREEN_WIDTH / 3) and direction_x > 0:
-            self.world_shift = -8
-            player.speed = 0
-        else:
-            self.world_shift = 0
-            player.speed = 8
+            self.camera.scroll(player.speed)
+
+    def cull(self):
+        """
+        Selects the entities close enough to the screen to be drawn and updated.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        view = self.camera.view_rect(CULL_MARGIN)
+
+        self.visible_npcs = self.npc_buckets.query(view)
+        self.visible_collectibles = self.collectible_buckets.query(view)
+        self.visible_finish = self.finish_buckets.query(view)
+
+        for sprite in self.visible_npcs + self.visible_collectibles + self.visible_finish:
+            sprite.update()
 
     def horizontal_movement_collision(self):
         """
@@ -1084,19 +1258,19 @@ class Level:
         """
 
         player = self.player.sprite
+        previous = player.rect.copy()
         player.rect.x += player.direction.x * player.speed
 
-        for sprite in self.tiles.sprites():
-            if sprite.rect.colliderect(player.rect):
-                if player.direction.x < 0:
-                    player.rect.left = sprite.rect.right
-                    player.on_left = True
-                    self.current_x = player.rect.left
+        # The player stops at the first solid column it crosses, however fast it moves
+        player.rect.x, hit = self.solid_grid.sweep_x(previous, player.rect.x - previous.x)
+        if hit:
+            if player.direction.x < 0:
+                player.on_left = True
+                self.current_x = player.rect.left
 
-                elif player.direction.x > 0:
-                    player.rect.right = sprite.rect.left
-                    player.on_right = True
-                    self.current_x = player.rect.right
+            elif player.direction.x > 0:
+                player.on_right = True
+                self.current_x = player.rect.right
 
         if player.on_left and (player.rect.left < self.current_x or player.direction.x >= 0):
             player.on_left = False
@@ -1117,18 +1291,17 @@ class Level:
         """
 
         player = self.player.sprite
+        previous = player.rect.copy()
         player.apply_gravity()
 
-        for sprite in self.tiles.sprites():
-            if sprite.rect.colliderect(player.rect):
-                if player.direction.y > 0:
-                    player.rect.bottom = sprite.rect.top
-                    player.direction.y = 0
-                    player.on_ground = True
-                elif player.direction.y < 0:
-                    player.rect.top = sprite.rect.bottom
-                    player.direction.y = 0
-                    player.on_ceiling = True
+        player.rect.y, hit = self.solid_grid.sweep_y(previous, player.rect.y - previous.y)
+        if hit:
+            if player.direction.y > 0:
+                player.direction.y = 0
+                player.on_ground = True
+            elif player.direction.y < 0:
+                player.direction.y = 0
+                player.on_ceiling = True
 
         if player.on_ground and player.direction.y < 0 or player.direction.y > 1:
             player.on_ground = False
@@ -1148,11 +1321,35 @@ class Level:
         None.
         """
 
-        # Check for collisions between the player and each NPC
-        for index, npc in enumerate(self.npcs.sprites()):
-            if not npc.was_answered and pygame.sprite.collide_rect(self.player.sprite, npc):
-                # If a collision is detected, display a text box
-                self.score += npc.question(list_of_questions[self.current_level], index)
+        # Check for collisions between the player and each NPC near the screen
+        for npc in self.visible_npcs:
+            if self.quiz is None and not npc.was_answered and pygame.sprite.collide_rect(self.player.sprite, npc):
+                questions = list_of_questions[self.current_level]
+                choice = self.controller.answer(questions[npc.question_index])
+
+                if choice is not None:
+                    self.score += npc.answer(questions, npc.question_index, choice)
+                else:
+                    # If a collision is detected, display a text box
+                    self.quiz = QuizDialog(npc, questions, npc.question_index)
+
+    def close_quiz(self):
+        """
+        Closes the quiz dialog and adds its result to the score.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.score += self.quiz.result
+        self.controller.answered(self.quiz.npc.choice)
+        self.quiz = None
+        self.renderer.invalidate()  # the dialog was drawn over the level
 
     def check_collectible_collisions(self):
         """
@@ -1168,10 +1365,12 @@ class Level:
 
         """
 
-        collided_collectible = pygame.sprite.spritecollide(self.player.sprite, self.collectible, True)
-       		
-        for collectible in collided_collectible:
-            self.change_collectible(collectible.value)
+        player_rect = self.player.sprite.rect
+
+        for collectible in self.visible_collectibles:
+            if collectible.rect.colliderect(player_rect):
+                collectible.kill()
+                self.change_collectible(collectible.value)
 
     def change_collectible(self, value):
         """
@@ -1200,12 +1399,15 @@ class Level:
 
         Returns
         -------
-        None.
+        pygame.Rect
+            The area of the screen that was drawn.
         """
-        score_surface = get_font(30).render(f"Grade: {self.score}/10", True, "Black")
+        score_surface = assets.text(get_font(30), f"Grade: {self.score}/10", True, "Black")
         score_rect = score_surface.get_rect(center=(1080, 50))
         screen.blit(score_surface, score_rect)
 
+        return score_rect
+
     def is_completed(self):
         """
         Checks if the level is completed.
@@ -1221,11 +1423,35 @@ class Level:
         """
 
         # Level is completed when the player collides with the finish line
-        return pygame.sprite.collide_rect(self.player.sprite, self.finish.sprite)
+        return any(pygame.sprite.collide_rect(self.player.sprite, finish) for finish in self.visible_finish)
 
-    def run(self):
+    def state(self):
+        """
+        Returns the progress of the player.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        dict
+            The level index, player position, score, collected books and whether the
+            game is over.
+        """
+
+        return {
+            'level': self.current_level,
+            'x': self.player.sprite.rect.x,
+            'y': self.player.sprite.rect.y,
+            'score': self.score,
+            'collectibles': self.collectibles_collected,
+            'game_over': self.game_over,
+        }
+
+    def snapshot(self):
         """
-        Runs the main logic for the level.
+        Records the player and camera positions the next frames interpolate from.
 
         Parameters
         ----------
@@ -1236,39 +1462,144 @@ class Level:
         None.
         """
 
-        self.bg_x += self.world_shift
+        self.previous_player_pos = self.player.sprite.rect.topleft
+        self.previous_offset_x = self.camera.offset_x
 
-        screen.blit(self.background_image, (self.bg_x, 0))
+    def update(self):
+        """
+        Advances the level simulation by one fixed tick.
 
-        self.tiles.update(self.world_shift)
-        # self.tiles.draw(self.display_surface)
+        Parameters
+        ----------
+        None.
 
-        self.finish.update(self.world_shift)
-        # self.finish.draw(self.display_surface)
-        
-        self.scroll_x()
+        Returns
+        -------
+        None.
+        """
 
-        self.player.update()
-        self.horizontal_movement_collision()
-        self.vertical_movement_collision()
-        self.player.draw(self.display_surface)
+        # The simulation waits while the next level is prepared
+        if self.loading is not None:
+            if not self.loader.is_ready(self.loading):
+                return
+            self.start_level(self.loading)
 
-        self.npcs.update(self.world_shift)
-        # self.npcs.draw(self.display_surface)
-        self.check_npc_collision()
+        # The simulation waits while a question is being answered
+        if self.quiz is not None:
+            if not self.quiz.is_finished():
+                self.snapshot()
+                return
+            self.close_quiz()
 
-        self.collectible.update(self.world_shift)
-        self.collectible.draw(self.display_surface)
-        self.check_collectible_collisions()
-        
-        self.ui.show_health(self.collectibles_collected, 16.95)  # Display the health bar
-        self.ui.show_books(self.collectibles_collected)
+        self.snapshot()
+
+        with profiler.timer('level.cull'):
+            self.scroll_x()
+            self.cull()
+
+        with profiler.timer('level.player'):
+            self.player.update()
 
-        self.show_score()
+        with profiler.timer('level.collision'):
+            self.horizontal_movement_collision()
+            self.vertical_movement_collision()
+
+        with profiler.timer('level.npcs'):
+            self.check_npc_collision()
+
+        with profiler.timer('level.collectibles'):
+            self.check_collectible_collisions()
+
+        profiler.count('ticks')
 
         if self.is_completed():
             self.next_level()
 
+    def draw(self, alpha=1.0):
+        """
+        Draws the level, interpolating the player and camera between the last two ticks.
+
+        Parameters
+        ----------
+        alpha : float
+            How far the frame is between the previous tick (0) and the last one (1).
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.loading is not None:
+            self.draw_loading()
+            return
+
+        offset_x = round(self.previous_offset_x + (self.camera.offset_x - self.previous_offset_x) * alpha)
+
+        # Without scrolling only the areas drawn in the previous frame need the background again
+        with profiler.timer('level.background'):
+            if self.renderer.begin(offset_x):
+                profiler.count('blits', self.background.draw(screen, offset_x))
+            else:
+                for area in self.renderer.previous_rects:
+                    profiler.count('blits', self.background.draw_area(screen, offset_x, area))
+
+        with profiler.timer('level.sprites'):
+            player = self.player.sprite
+            previous_x, previous_y = self.previous_player_pos
+            player_x = round(previous_x + (player.rect.x - previous_x) * alpha)
+            player_y = round(previous_y + (player.rect.y - previous_y) * alpha)
+            self.renderer.add(self.display_surface.blit(player.image, (player_x - offset_x, player_y)))
+
+            collectible_rects = self.camera.draw(self.visible_collectibles, self.display_surface, offset_x)
+            self.renderer.add(collectible_rects)
+            profiler.count('blits', 1 + len(collectible_rects))
+
+        with profiler.timer('level.hud'):
+            self.renderer.add(self.ui.show_health(self.collectibles_collected, 16.95))  # Display the health bar
+            self.renderer.add(self.ui.show_books(self.collectibles_collected))
+            self.renderer.add(self.show_score())
+            profiler.count('blits', 4)
+
+        if self.quiz is not None:
+            self.renderer.add(self.quiz.draw(self.display_surface))
+
+        # Sprite counts of the level
+        profiler.gauge('npcs', len(self.npcs))
+        profiler.gauge('collectible', len(self.collectible))
+        profiler.gauge('finish', len(self.finish))
+
+    def run(self):
+        """
+        Runs the main logic for the level: one simulation tick followed by a frame.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.update()
+        self.draw()
+
+    def present(self):
+        """
+        Pushes the frame drawn by draw() to the display.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        with profiler.timer('level.present'):
+            self.renderer.present()
+
 
 # Main
 if __name__ == "__main__":
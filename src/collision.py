@@ -0,0 +1,313 @@
+"""
+collision.py
+
+This module contains the solidity grid resolving the swept movements of the
+player and the level bodies against the solid tiles of the level.
+"""
+
+import numpy as np
+
+from level_compiler import SOLID
+
+
+class SolidGrid:
+    """
+    NumPy grid of the solid cells of a level, resolving swept movements.
+
+    A body moving along one axis is stopped by the first solid cell its leading
+    edge crosses, however far it moves in a tick, so fast bodies never tunnel
+    through thin tiles. A single body is resolved by slicing the cells swept by its
+    leading edge; many bodies are resolved at once by looking up, for every cell
+    crossed, prefix sums of the solid cells along the rows and the columns.
+
+    Cells outside the grid are empty. Bodies touching a solid cell without
+    overlapping it are not stopped.
+
+    Attributes
+    ----------
+    tile_size : int
+        The size of each cell in pixels.
+
+    rows : int
+        Number of rows of the grid.
+
+    cols : int
+        Number of columns of the grid.
+
+    solid : numpy.ndarray
+        (rows, cols) uint8 array, 1 for the solid cells.
+
+    Methods
+    -------
+    from_level(level_data, tile_size)
+        Builds the grid of a compiled level map.
+
+    sweep_x(rect, dx)
+        Moves a rectangle horizontally until it hits a solid cell.
+
+    sweep_y(rect, dy)
+        Moves a rectangle vertically until it hits a solid cell.
+
+    sweep_x_batch(x, y, width, height, dx)
+        Moves many boxes horizontally until they hit a solid cell.
+
+    sweep_y_batch(x, y, width, height, dy)
+        Moves many boxes vertically until they hit a solid cell.
+    """
+
+    def __init__(self, solid, tile_size):
+        """
+        Initializes the grid.
+
+        Parameters
+        ----------
+        solid : numpy.ndarray
+            (rows, cols) array, non-zero for the solid cells.
+
+        tile_size : int
+            The size of each cell in pixels.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.tile_size = tile_size
+        self.solid = np.ascontiguousarray(solid, dtype=np.uint8)
+        self.rows, self.cols = self.solid.shape
+
+        # Solid cells above each row of every column, and left of each column of every
+        # row, so the solid cells of any span of a column or row are two lookups
+        self._column_counts = np.zeros((self.rows + 1, self.cols), dtype=np.int32)
+        np.cumsum(self.solid, axis=0, dtype=np.int32, out=self._column_counts[1:])
+        self._row_counts = np.zeros((self.cols + 1, self.rows), dtype=np.int32)
+        np.cumsum(self.solid.T, axis=0, dtype=np.int32, out=self._row_counts[1:])
+
+    @classmethod
+    def from_level(cls, level_data, tile_size):
+        """
+        Builds the grid of a compiled level map.
+
+        Parameters
+        ----------
+        level_data : LevelData
+            Compiled map of the level.
+
+        tile_size : int
+            The size of each cell in pixels.
+
+        Returns
+        -------
+        SolidGrid
+            The solidity grid of the level.
+        """
+
+        cells = np.frombuffer(level_data.grid, dtype=np.uint8).reshape(level_data.rows, level_data.cols)
+
+        return cls(cells == SOLID, tile_size)
+
+    def _span(self, start, end, count):
+        """
+        Returns the cells covered by a span of pixels, clamped to the grid.
+
+        Parameters
+        ----------
+        start : int
+            First pixel of the span.
+
+        end : int
+            Pixel after the last one of the span.
+
+        count : int
+            Number of cells along the axis.
+
+        Returns
+        -------
+        slice
+            The covered cells (possibly empty).
+        """
+
+        size = self.tile_size
+
+        return slice(max(start // size, 0), min(max((end - 1) // size + 1, 0), count))
+
+    def sweep_x(self, rect, dx):
+        """
+        Moves a rectangle horizontally until it hits a solid cell.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The rectangle before moving, in world coordinates.
+
+        dx : int
+            The horizontal movement in pixels.
+
+        Returns
+        -------
+        tuple
+            The new x-coordinate of the rectangle and whether it hit a solid cell.
+        """
+
+        if dx == 0:
+            return rect.x, False
+
+        rows = self._span(rect.top, rect.bottom, self.rows)
+        if dx > 0:
+            cols = self._span(rect.right, rect.right + dx, self.cols)
+        else:
+            cols = self._span(rect.left + dx, rect.left, self.cols)
+
+        swept = self.solid[rows, cols]
+        if not swept.any():
+            return rect.x + dx, False
+        hits = np.flatnonzero(swept.any(axis=0))
+
+        # The first solid column crossed by the leading edge stops the rectangle
+        if dx > 0:
+            return (cols.start + int(hits[0])) * self.tile_size - rect.width, True
+        return (cols.start + int(hits[-1]) + 1) * self.tile_size, True
+
+    def sweep_y(self, rect, dy):
+        """
+        Moves a rectangle vertically until it hits a solid cell.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            The rectangle before moving, in world coordinates.
+
+        dy : int
+            The vertical movement in pixels (positive is down).
+
+        Returns
+        -------
+        tuple
+            The new y-coordinate of the rectangle and whether it hit a solid cell.
+        """
+
+        if dy == 0:
+            return rect.y, False
+
+        cols = self._span(rect.left, rect.right, self.cols)
+        if dy > 0:
+            rows = self._span(rect.bottom, rect.bottom + dy, self.rows)
+        else:
+            rows = self._span(rect.top + dy, rect.top, self.rows)
+
+        swept = self.solid[rows, cols]
+        if not swept.any():
+            return rect.y + dy, False
+        hits = np.flatnonzero(swept.any(axis=1))
+
+        # The first solid row crossed by the leading edge stops the rectangle
+        if dy > 0:
+            return (rows.start + int(hits[0])) * self.tile_size - rect.height, True
+        return (rows.start + int(hits[-1]) + 1) * self.tile_size, True
+
+    def _sweep_batch(self, counts, position, size, span_position, span_size, delta):
+        """
+        Moves many boxes along one axis until they hit a solid cell.
+
+        Parameters
+        ----------
+        counts : numpy.ndarray
+            Prefix sums of the solid cells across the axis of movement, indexed by
+            (cell across the axis, cell along the axis).
+
+        position, size : numpy.ndarray
+            Coordinate and extent of the boxes along the axis of movement.
+
+        span_position, span_size : numpy.ndarray
+            Coordinate and extent of the boxes across the axis of movement.
+
+        delta : numpy.ndarray
+            Movement of the boxes along the axis.
+
+        Returns
+        -------
+        tuple
+            The new coordinates along the axis and whether each box hit a solid cell.
+        """
+
+        tile_size = self.tile_size
+        spans, cells = counts.shape[0] - 1, counts.shape[1]
+        position, size, span_position, span_size, delta = np.broadcast_arrays(
+            *(np.asarray(value, dtype=np.float64) for value in (position, size, span_position, span_size, delta)))
+
+        # Cells crossed by the leading edge, nearest first
+        forward = delta > 0
+        lead = np.where(forward, position + size, position)
+        target = lead + delta
+        first = np.where(forward, np.floor(lead / tile_size), np.ceil(lead / tile_size) - 1).astype(np.int64)
+        last = np.where(forward, np.ceil(target / tile_size) - 1, np.floor(target / tile_size)).astype(np.int64)
+        step = np.where(forward, 1, -1)
+        steps = np.where(delta != 0, np.maximum((last - first) * step + 1, 0), 0)
+
+        span_start = np.clip(np.floor(span_position / tile_size), 0, spans).astype(np.int64)
+        span_end = np.clip(np.ceil((span_position + span_size) / tile_size), 0, spans).astype(np.int64)
+
+        new_position = position + delta
+        hit = np.zeros(position.shape, dtype=bool)
+
+        for offset in range(int(steps.max(initial=0))):
+            cell = first + step * offset
+            active = (offset < steps) & ~hit & (cell >= 0) & (cell < cells)
+            if not active.any():
+                continue
+
+            index = np.clip(cell, 0, cells - 1)
+            blocked = active & (counts[span_end, index] > counts[span_start, index])
+            stop = np.where(forward, cell * tile_size - size, (cell + 1) * tile_size)
+            new_position = np.where(blocked, stop, new_position)
+            hit |= blocked
+
+        return new_position, hit
+
+    def sweep_x_batch(self, x, y, width, height, dx):
+        """
+        Moves many boxes horizontally until they hit a solid cell.
+
+        Parameters
+        ----------
+        x, y : numpy.ndarray
+            Top-left corners of the boxes, in world coordinates.
+
+        width, height : numpy.ndarray or float
+            Sizes of the boxes.
+
+        dx : numpy.ndarray
+            Horizontal movement of each box in pixels.
+
+        Returns
+        -------
+        tuple
+            The new x-coordinates (float64 array) and whether each box hit a solid
+            cell (bool array).
+        """
+
+        return self._sweep_batch(self._column_counts, x, width, y, height, dx)
+
+    def sweep_y_batch(self, x, y, width, height, dy):
+        """
+        Moves many boxes vertically until they hit a solid cell.
+
+        Parameters
+        ----------
+        x, y : numpy.ndarray
+            Top-left corners of the boxes, in world coordinates.
+
+        width, height : numpy.ndarray or float
+            Sizes of the boxes.
+
+        dy : numpy.ndarray
+            Vertical movement of each box in pixels (positive is down).
+
+        Returns
+        -------
+        tuple
+            The new y-coordinates (float64 array) and whether each box hit a solid
+            cell (bool array).
+        """
+
+        return self._sweep_batch(self._row_counts, y, height, x, width, dy)
@@ -0,0 +1,183 @@
+"""
+inputs.py
+
+This module contains the input sources of the player. The keyboard is read through
+pygame, while scripted inputs replay a fixed sequence of moves and quiz answers so
+the game can run without a window (e.g. in tests and batch tools).
+"""
+
+import pygame
+
+
+# Buttons of the player, combined as a bit mask per tick
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+
+
+class KeyboardInput:
+    """
+    Input source reading the keyboard.
+
+    Methods
+    -------
+    read()
+        Returns the buttons held this tick.
+
+    answer(question)
+        Returns the answer to a quiz question, or None to ask the player.
+
+    answered(choice)
+        Receives the answer given by the player on the quiz screen.
+    """
+
+    def read(self):
+        """
+        Returns the buttons held this tick.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            Bit mask of LEFT, RIGHT and JUMP.
+        """
+
+        keys = pygame.key.get_pressed()
+        buttons = 0
+
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            buttons |= LEFT
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            buttons |= RIGHT
+        if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]:
+            buttons |= JUMP
+
+        return buttons
+
+    def answer(self, question):
+        """
+        Returns the answer to a quiz question, or None to ask the player.
+
+        Parameters
+        ----------
+        question : dict
+            The question, with its text and answers.
+
+        Returns
+        -------
+        None.
+            The player answers through the quiz screen.
+        """
+
+        return None
+
+    def answered(self, choice):
+        """
+        Receives the answer given by the player on the quiz screen.
+
+        Parameters
+        ----------
+        choice : int
+            Index of the chosen answer.
+
+        Returns
+        -------
+        None.
+        """
+
+        pass
+
+
+class ScriptedInput:
+    """
+    Input source replaying a fixed sequence of buttons and quiz answers.
+
+    Attributes
+    ----------
+    script : sequence or callable
+        Buttons of each tick, or a function returning the buttons of a tick.
+
+    answers : list
+        Indices of the answers given to the quiz questions, in order.
+
+    tick : int
+        Number of ticks read so far.
+
+    Methods
+    -------
+    read()
+        Returns the buttons held this tick.
+
+    answer(question)
+        Returns the next scripted answer to a quiz question.
+    """
+
+    def __init__(self, script, answers=()):
+        """
+        Initializes the scripted input.
+
+        Parameters
+        ----------
+        script : sequence or callable
+            Buttons of each tick (no button is held after the end of the sequence),
+            or a function of the tick number returning its buttons.
+
+        answers : sequence
+            Indices of the answers given to the quiz questions, in order. Once they
+            run out the first answer is given.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.script = script
+        self.answers = list(answers)
+        self.tick = 0
+        self._answered = 0
+
+    def read(self):
+        """
+        Returns the buttons held this tick.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            Bit mask of LEFT, RIGHT and JUMP.
+        """
+
+        tick = self.tick
+        self.tick += 1
+
+        if callable(self.script):
+            return self.script(tick)
+        if tick < len(self.script):
+            return self.script[tick]
+        return 0
+
+    def answer(self, question):
+        """
+        Returns the next scripted answer to a quiz question.
+
+        Parameters
+        ----------
+        question : dict
+            The question, with its text and answers.
+
+        Returns
+        -------
+        int
+            Index of the chosen answer.
+        """
+
+        index = self._answered
+        self._answered += 1
+
+        return self.answers[index] if index < len(self.answers) else 0
@@ -0,0 +1,308 @@
+"""
+level_compiler.py
+
+This module compiles the Tiled CSV maps into a compact binary format and loads
+them back. The compiled file is cached next to the CSV and reused while the CSV
+is unchanged, so the game never has to parse the CSV maps at startup.
+
+Compiled file layout (little endian):
+
+    header    magic, version, rows, cols, entity count, CSV mtime, CSV size, CSV SHA-1
+    grid      rows * cols cell codes, one byte each, row-major
+    entities  one (code, row, col) record per non-solid, non-empty cell, row-major
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from csv import reader
+
+
+# Cell codes of the compiled grid
+EMPTY = 0
+SOLID = 1
+FINISH = 2
+COLLECTIBLE = 3
+NPC = 4
+PLAYER = 5
+
+# Tiled CSV values and the cell codes they are compiled to
+CSV_CODES = {'-1': EMPTY, '0': SOLID, '15': FINISH, '12': COLLECTIBLE, '3': NPC, 'P': PLAYER}
+
+# Layout characters used by the level, indexed by cell code
+LAYOUT_CHARS = ' XFCNP'
+
+MAGIC = b'AALV'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHIQQ20s')
+ENTITY = struct.Struct('<BHH')
+COMPILED_SUFFIX = '.lvl'
+
+
+class LevelData:
+    """
+    Compiled representation of a level map.
+
+    Attributes
+    ----------
+    rows : int
+        Number of rows of the map.
+
+    cols : int
+        Number of columns of the map.
+
+    grid : bytes
+        Row-major cell codes of the map, one byte per cell.
+
+    entities : list
+        (code, row, col) tuples of the finish, collectible, NPC and player cells,
+        in row-major order.
+    """
+
+    def __init__(self, rows, cols, grid, entities):
+        """
+        Initializes the level data.
+
+        Parameters
+        ----------
+        rows : int
+            Number of rows of the map.
+
+        cols : int
+            Number of columns of the map.
+
+        grid : bytes
+            Row-major cell codes of the map.
+
+        entities : list
+            (code, row, col) tuples of the entity cells.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.rows = rows
+        self.cols = cols
+        self.grid = grid
+        self.entities = entities
+
+    @classmethod
+    def _from_cells(cls, cells, cols):
+        """
+        Builds the level data from rows of cell codes.
+
+        Parameters
+        ----------
+        cells : list
+            Rows of cell codes.
+
+        cols : int
+            Number of columns of the map.
+
+        Returns
+        -------
+        LevelData
+            The compiled level.
+        """
+
+        grid = bytearray()
+        entities = []
+
+        for row_index, row in enumerate(cells):
+            row = row[:cols] + [EMPTY] * (cols - len(row))
+            grid.extend(row)
+            for col_index, code in enumerate(row):
+                if code > SOLID:
+                    entities.append((code, row_index, col_index))
+
+        return cls(len(cells), cols, bytes(grid), entities)
+
+
+def compile_csv(csv_path):
+    """
+    Parses a Tiled CSV map into level data.
+
+    Parameters
+    ----------
+    csv_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    LevelData
+        The compiled level.
+    """
+
+    with open(csv_path, newline='') as csv_file:
+        cells = [[CSV_CODES.get(cell, EMPTY) for cell in row] for row in reader(csv_file) if row]
+
+    return LevelData._from_cells(cells, max(len(row) for row in cells))
+
+
+def compiled_path(csv_path):
+    """
+    Returns the path of the compiled file cached for a CSV map.
+
+    Parameters
+    ----------
+    csv_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    str
+        The path to the compiled file.
+    """
+
+    return os.path.splitext(csv_path)[0] + COMPILED_SUFFIX
+
+
+def _file_digest(path):
+    """
+    Returns the SHA-1 digest of a file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+
+    Returns
+    -------
+    bytes
+        The digest of the file contents.
+    """
+
+    with open(path, 'rb') as source:
+        return hashlib.sha1(source.read()).digest()
+
+
+def write_compiled(level, path, source_stat, digest):
+    """
+    Writes level data to a compiled file.
+
+    Parameters
+    ----------
+    level : LevelData
+        The compiled level.
+
+    path : str
+        The path of the compiled file.
+
+    source_stat : os.stat_result
+        The stat of the CSV the level was compiled from.
+
+    digest : bytes
+        The SHA-1 digest of the CSV the level was compiled from.
+
+    Returns
+    -------
+    None.
+    """
+
+    header = HEADER.pack(MAGIC, VERSION, level.rows, level.cols, len(level.entities),
+                         source_stat.st_mtime_ns, source_stat.st_size, digest)
+    entities = b''.join(ENTITY.pack(*entity) for entity in level.entities)
+
+    # Write to a temporary file first so a crash never leaves a truncated cache behind
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as compiled:
+        compiled.write(header + level.grid + entities)
+    os.replace(temporary_path, path)
+
+
+def read_compiled(path):
+    """
+    Reads a compiled file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the compiled file.
+
+    Returns
+    -------
+    tuple
+        The level data and the (mtime, size, digest) of the CSV it was compiled from.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a compiled level of the current version.
+    """
+
+    with open(path, 'rb') as compiled:
+        data = compiled.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"Truncated compiled level: {path}")
+
+    magic, version, rows, cols, count, mtime, size, digest = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a compiled level of version {VERSION}: {path}")
+
+    grid_end = HEADER.size + rows * cols
+    if len(data) != grid_end + count * ENTITY.size:
+        raise ValueError(f"Truncated compiled level: {path}")
+
+    grid = data[HEADER.size:grid_end]
+    entities = list(ENTITY.iter_unpack(data[grid_end:]))
+
+    return LevelData(rows, cols, grid, entities), (mtime, size, digest)
+
+
+def load_level(csv_path):
+    """
+    Loads a level map, using the compiled cache when it matches the CSV.
+
+    The cache is accepted when the CSV modification time and size are the ones
+    recorded in it, or else when the CSV contents hash to the recorded digest (e.g.
+    after a fresh checkout). Otherwise the CSV is compiled and the cache rewritten.
+
+    Parameters
+    ----------
+    csv_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    LevelData
+        The compiled level.
+    """
+
+    path = compiled_path(csv_path)
+    source_stat = os.stat(csv_path)
+    digest = None
+
+    try:
+        level, (mtime, size, cached_digest) = read_compiled(path)
+        if (mtime, size) == (source_stat.st_mtime_ns, source_stat.st_size):
+            return level
+        digest = _file_digest(csv_path)
+        if digest == cached_digest:
+            return level
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Ignoring compiled level cache: {e}")
+
+    level = compile_csv(csv_path)
+
+    try:
+        write_compiled(level, path, source_stat, digest or _file_digest(csv_path))
+    except OSError as e:
+        print(f"Error writing compiled level: {path} - {e}")
+
+    return level
+
+
+# Main
+if __name__ == "__main__":
+
+    # Compile the maps given in the command line (e.g. before shipping a build)
+    for csv_path in sys.argv[1:]:
+        source_stat = os.stat(csv_path)
+        level = compile_csv(csv_path)
+        write_compiled(level, compiled_path(csv_path), source_stat, _file_digest(csv_path))
+        print(f"{csv_path}: {level.rows}x{level.cols}, {len(level.entities)} entities -> {compiled_path(csv_path)}")
@@ -0,0 +1,303 @@
+"""
+level_loader.py
+
+This module prepares the levels in the background. A pool of threads reads and
+decodes the background image of a level, splits it in display-ready chunks, builds
+its solidity grid and sorts its entities, while the current level is played. The
+main thread takes the prepared level in one step when the level starts, and only
+builds the sprites.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from camera import ChunkedBackground
+from collision import SolidGrid
+
+
+class PreparedLevel:
+    """
+    Everything a level needs that can be loaded away from the main thread.
+
+    Attributes
+    ----------
+    index : int
+        Index of the level.
+
+    solid_grid : SolidGrid
+        Solidity grid of the level.
+
+    entities : dict
+        Top-left positions (x, y) of the entities in pixels, keyed by level code,
+        in map order.
+
+    background : ChunkedBackground or None
+        The background of the level (None when it is not drawn).
+    """
+
+    def __init__(self, index, solid_grid, entities, background):
+        """
+        Initializes the prepared level.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        solid_grid : SolidGrid
+            Solidity grid of the level.
+
+        entities : dict
+            Top-left positions (x, y) of the entities in pixels, keyed by level code.
+
+        background : ChunkedBackground or None
+            The background of the level.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.index = index
+        self.solid_grid = solid_grid
+        self.entities = entities
+        self.background = background
+
+
+class LevelLoader:
+    """
+    Prepares levels on a pool of threads.
+
+    Each level is prepared in two tasks running in parallel: the map (solidity grid
+    and entity positions) and the background (file read, decoding and
+    conversion of the chunks). A prepared level is handed over once, to the first
+    take() asking for it.
+
+    Attributes
+    ----------
+    levels : LevelRegistry
+        Registry of the compiled level maps.
+
+    backgrounds : list or None
+        Paths of the background images of the levels (None to skip the backgrounds).
+
+    tile_size : int
+        Size of the map cells in pixels.
+
+    chunk_width : int
+        Width of the background chunks in pixels.
+
+    workers : int
+        Number of loading threads (0 prepares the levels in take(), on the caller's thread).
+
+    Methods
+    -------
+    preload(index)
+        Starts preparing a level in the background.
+
+    progress(index)
+        Returns the fraction of the tasks of a level that are finished.
+
+    is_ready(index)
+        Checks if a level is prepared.
+
+    take(index)
+        Returns a prepared level, waiting for it if needed.
+
+    shutdown()
+        Stops the loading threads.
+    """
+
+    def __init__(self, levels, backgrounds, tile_size, chunk_width, workers=2):
+        """
+        Initializes the loader without preparing any level.
+
+        Parameters
+        ----------
+        levels : LevelRegistry
+            Registry of the compiled level maps.
+
+        backgrounds : list or None
+            Paths of the background images of the levels (None to skip the backgrounds).
+
+        tile_size : int
+            Size of the map cells in pixels.
+
+        chunk_width : int
+            Width of the background chunks in pixels.
+
+        workers : int
+            Number of loading threads (0 prepares the levels in take(), on the caller's thread).
+
+        Returns
+        -------
+        None.
+        """
+
+        self.levels = levels
+        self.backgrounds = backgrounds
+        self.tile_size = tile_size
+        self.chunk_width = chunk_width
+        self.workers = workers
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _prepare_map(self, index):
+        """
+        Loads the compiled map of a level and builds its grid and entity positions.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        tuple
+            The solidity grid and the entity positions.
+        """
+
+        level_data = self.levels[index]
+        solid_grid = SolidGrid.from_level(level_data, self.tile_size)
+
+        entities = {}
+        for code, row_index, col_index in level_data.entities:
+            entities.setdefault(code, []).append((col_index * self.tile_size, row_index * self.tile_size))
+
+        return solid_grid, entities
+
+    def _prepare_background(self, index):
+        """
+        Reads and decodes the background image of a level and splits it in chunks.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        ChunkedBackground or None
+            The background, or None when the backgrounds are skipped.
+        """
+
+        if self.backgrounds is None:
+            return None
+
+        image = pygame.image.load(self.backgrounds[index])
+
+        return ChunkedBackground(image, self.chunk_width)
+
+    def preload(self, index):
+        """
+        Starts preparing a level in the background.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.workers == 0:
+            return
+
+        with self._lock:
+            if index in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='level-loader')
+            self._pending[index] = (self._executor.submit(self._prepare_map, index),
+                                    self._executor.submit(self._prepare_background, index))
+
+    def progress(self, index):
+        """
+        Returns the fraction of the tasks of a level that are finished.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        float
+            0.0 if the level is not being prepared, up to 1.0 when it is ready.
+        """
+
+        with self._lock:
+            tasks = self._pending.get(index, ())
+
+        return sum(task.done() for task in tasks) / 2
+
+    def is_ready(self, index):
+        """
+        Checks if a level is prepared.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        bool
+            True if take() would not wait, False otherwise.
+        """
+
+        return self.workers == 0 or self.progress(index) == 1.0
+
+    def take(self, index):
+        """
+        Returns a prepared level, waiting for it if needed, and forgets it.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        PreparedLevel
+            The prepared level.
+
+        Raises
+        ------
+        Exception
+            Any error raised while the level was prepared.
+        """
+
+        if self.workers == 0:
+            return PreparedLevel(index, *self._prepare_map(index), self._prepare_background(index))
+
+        self.preload(index)
+        with self._lock:
+            map_task, background_task = self._pending.pop(index)
+
+        return PreparedLevel(index, *map_task.result(), background_task.result())
+
+    def shutdown(self):
+        """
+        Stops the loading threads, dropping the levels not taken.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
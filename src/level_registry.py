@@ -0,0 +1,82 @@
+"""
+level_registry.py
+
+This module contains the registry of the game levels. A level map is only loaded
+when the game asks for it (the level loader asks for the next level in the
+background while the current one is played, see level_loader.py).
+"""
+
+import threading
+
+from level_compiler import load_level
+
+
+class LevelRegistry:
+    """
+    Sequence of level maps loaded on demand.
+
+    Indexing the registry returns the compiled map of a level, loading it if needed.
+    Only the last requested level is kept in memory.
+
+    Attributes
+    ----------
+    sources : list
+        Paths of the CSV maps of the levels, in play order.
+
+    loader : callable
+        Function that loads a level map from its path.
+    """
+
+    def __init__(self, sources, loader=load_level):
+        """
+        Initializes the registry without loading any level.
+
+        Parameters
+        ----------
+        sources : list
+            Paths of the CSV maps of the levels, in play order.
+
+        loader : callable
+            Function that loads a level map from its path.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.sources = list(sources)
+        self.loader = loader
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __getitem__(self, index):
+        """
+        Returns the compiled map of a level, loading it if needed.
+
+        Parameters
+        ----------
+        index : int
+            Index of the level.
+
+        Returns
+        -------
+        LevelData
+            The compiled map of the level.
+        """
+
+        index = range(len(self.sources))[index]
+
+        with self._lock:
+            level = self._loaded.get(index)
+
+        if level is None:
+            level = self.loader(self.sources[index])
+
+        # Only the requested level stays in memory (the registry is read from the loading threads)
+        with self._lock:
+            self._loaded = {index: level}
+
+        return level
@@ -1,12 +1,23 @@
 import pygame
 import sys
+import os
+from abc import ABC, abstractmethod
 
 from settings import *
+from assets import assets
+from profiler import profiler
+from transitions import Fade
 
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+# Headless runs draw nothing, so they do not need a window
+if HEADLESS:
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+else:
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 clock = pygame.time.Clock()
 
+FONT_PATH = os.path.join("src", "graphics", "button", "font.ttf")
+
 
 def get_font(size):
     """
@@ -23,7 +34,7 @@ def get_font(size):
         A Pygame font object.
     """
 
-    return pygame.font.Font(r"src\graphics\button\font.ttf", size)
+    return assets.font(FONT_PATH, size)
 
 
 class Button:
@@ -54,7 +65,13 @@ class Button:
         The text displayed on the button.
 
     text : pygame.Surface
-        The rendered text surface.
+        The rendered text surface currently shown.
+
+    base_text : pygame.Surface
+        The text rendered in the base color.
+
+    hovering_text : pygame.Surface
+        The text rendered in the hovering color.
 
     rect : pygame.Rect
         The rectangular area of the button.
@@ -108,7 +125,11 @@ class Button:
         self.font = font
         self.base_color, self.hovering_color = base_color, hovering_color
         self.text_input = text_input
-        self.text = self.font.render(self.text_input, True, self.base_color)
+
+        # Both states are rendered once, hovering only swaps the surfaces
+        self.base_text = assets.text(self.font, self.text_input, True, self.base_color)
+        self.hovering_text = assets.text(self.font, self.text_input, True, self.hovering_color)
+        self.text = self.base_text
         if self.image is None:
             self.image = self.text
         self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
@@ -159,305 +180,663 @@ class Button:
 
         Returns
         -------
-        None.
+        bool
+            True if the text shown by the button changed, False otherwise.
         """
 
+        previous_text = self.text
+
         if self.check_for_input(position):
-            self.text = self.font.render(self.text_input, True, self.hovering_color)
+            self.text = self.hovering_text
         else:
-            self.text = self.font.render(self.text_input, True, self.base_color)
+            self.text = self.base_text
 
+        return self.text is not previous_text
 
-class Menu:
+
+class MenuScreen(ABC):
     """
-    Represents the menu system in the game.
+    Base class of the menu screens.
+
+    The backdrop (background and static text) and the buttons of a screen are built
+    once when the screen is entered, and the screen fades in. While the screen is
+    shown, the loop sleeps until an event arrives (unless the fade is playing), is
+    capped at MENU_FPS and only pushes to the display the buttons whose hover state
+    changed.
 
     Attributes
     ----------
-    current_screen : str
-        The current active screen.
+    name : str
+        Value of Menu.current_screen while the screen is shown.
 
-    level : Level
-        The instance of the game level associated with the menu.
+    menu : Menu
+        The menu owning the screen.
+
+    backdrop : pygame.Surface
+        The static part of the screen.
+
+    buttons : dict
+        The buttons of the screen, keyed by the action they trigger.
+
+    transition : Transition or None
+        The transition played over the screen.
 
     Methods
     -------
-    main_menu(background_image_path)
-        Displays the main menu screen with buttons for play, credits, and quit.
+    build()
+        Builds the backdrop and the buttons of the screen.
 
-    credits()
-        Displays the credits screen with information about the game developers.
+    click(action)
+        Handles a click on one of the buttons.
 
-    pause()
-        Displays the pause screen with options to resume, go to the main menu, or quit the game.
+    is_active()
+        Checks if the screen should still be shown.
 
-    game_over()
-        Displays the game over screen with the option to return to the main menu.
+    draw()
+        Redraws the whole screen.
+
+    redraw_button(button)
+        Redraws a single button over the backdrop.
+
+    run()
+        Shows the screen until it is left.
+
+    handle_event(event)
+        Handles a single event of the screen.
     """
 
-    def __init__(self, level_instance):
+    name = None
+
+    def __init__(self, menu):
         """
-        Initializes the Menu instance.
+        Initializes the screen.
 
         Parameters
         ----------
-        level_instance : Level
-            The instance of the game level associated with the menu.
+        menu : Menu
+            The menu owning the screen.
 
         Returns
         -------
         None.
         """
-        self.current_screen = "main_menu"
-        self.level = level_instance
 
-    def main_menu(self, background_image_path):
+        self.menu = menu
+        self.backdrop = None
+        self.buttons = {}
+        self.transition = None
+
+    @abstractmethod
+    def build(self):
         """
-        Displays the main menu screen with buttons for play, credits, and quit.
+        Builds the backdrop and the buttons of the screen.
 
         Parameters
         ----------
-        background_image_path : str
-            The file path for the background image of the main menu.
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+    @abstractmethod
+    def click(self, action):
+        """
+        Handles a click on one of the buttons.
+
+        Parameters
+        ----------
+        action : str
+            The key of the clicked button.
+
+        Returns
+        -------
+        None.
+        """
+
+    def is_active(self):
+        """
+        Checks if the screen should still be shown.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        bool
+            True while the menu is on this screen.
+        """
+
+        return self.menu.current_screen == self.name
+
+    def draw(self):
+        """
+        Redraws the whole screen.
+
+        Parameters
+        ----------
+        None.
 
         Returns
         -------
         None.
         """
+
+        with profiler.timer('menu.draw'):
+            screen.blit(self.backdrop, (0, 0))
+
+            mouse_pos = pygame.mouse.get_pos()
+            for button in self.buttons.values():
+                button.change_color(mouse_pos)
+                button.update(screen)
+
+            if self.transition is not None:
+                self.transition.draw(screen)
+
+            pygame.display.update()
+
+        profiler.count('blits', 1 + 2 * len(self.buttons))
+
+    def redraw_button(self, button):
+        """
+        Redraws a single button over the backdrop.
+
+        Parameters
+        ----------
+        button : Button
+            The button to be redrawn.
+
+        Returns
+        -------
+        pygame.Rect
+            The area of the screen that changed.
+        """
+
+        area = button.rect.union(button.text_rect)
+        screen.blit(self.backdrop, area, area)
+        button.update(screen)
+        profiler.count('blits', 3)
+
+        return area
+
+    def run(self):
+        """
+        Shows the screen until it is left.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.build()
+        self.transition = Fade(TRANSITION_TIME)
+        self.draw()
+
+        while self.is_active():
+            dirty_rects = []
+
+            # Sleep until something happens instead of redrawing an idle screen
+            if self.transition is not None:
+                event = pygame.event.poll()
+            else:
+                event = pygame.event.wait(500)
+
+            while event.type != pygame.NOEVENT:
+                dirty_rects += self.handle_event(event)
+                if not self.is_active():
+                    break  # leave the remaining events to the next screen
+                event = pygame.event.poll()
+
+            if self.transition is not None:
+                if self.transition.is_finished():
+                    self.transition = None
+                self.draw()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+
+            clock.tick(MENU_FPS)
+            profiler.end_frame()
+
+    def handle_event(self, event):
+        """
+        Handles a single event of the screen.
+
+        Parameters
+        ----------
+        event : pygame.event.Event
+            The event to be handled.
+
+        Returns
+        -------
+        list
+            The areas of the screen that changed and still have to be displayed.
+        """
+
+        dirty_rects = []
+
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+
+        if event.type == pygame.WINDOWEXPOSED:
+            self.draw()
+
+        if event.type == pygame.MOUSEMOTION:
+            for button in self.buttons.values():
+                if button.change_color(event.pos):
+                    dirty_rects.append(self.redraw_button(button))
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            clicked = [action for action, button in self.buttons.items() if button.check_for_input(event.pos)]
+            for action in clicked:
+                self.click(action)
+
+            # The click may have shown another screen or left this one
+            if clicked and self.is_active():
+                self.transition = Fade(TRANSITION_TIME)
+                self.draw()
+
+        return dirty_rects
+
+
+class MainMenuScreen(MenuScreen):
+    """
+    Main menu screen with buttons for play, credits, and quit.
+
+    Attributes
+    ----------
+    background_image_path : str
+        The file path for the background image of the main menu.
+    """
+
+    name = "main_menu"
+
+    def __init__(self, menu):
+        """
+        Initializes the main menu screen.
+
+        Parameters
+        ----------
+        menu : Menu
+            The menu owning the screen.
+
+        Returns
+        -------
+        None.
+        """
+
+        super().__init__(menu)
+        self.background_image_path = None
+
+    def build(self):
+        """
+        Builds the background, title and buttons of the main menu.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
         try:
-            background = pygame.image.load(background_image_path)
+            background = assets.image(self.background_image_path, convert='opaque')
         except pygame.error as e:
             print(f"Error loading menu background image: {e}")
             background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
 
-        while self.current_screen == "main_menu":
-            
-            screen.blit(background, (0, 0)) 
+        self.backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.backdrop.blit(background, (0, 0))
 
-            menu_mouse_pos = pygame.mouse.get_pos()
+        menu_text = assets.text(get_font(30), "Academic Adventure: From ABC to PhD", True, "#b68f40")
+        menu_rect = menu_text.get_rect(center=(640, 100))
+        self.backdrop.blit(menu_text, menu_rect)
 
-            menu_text = get_font(30).render("Academic Adventure: From ABC to PhD", True, "#b68f40")
-            menu_rect = menu_text.get_rect(center=(640, 100))
+        self.buttons = {
+            "play": Button(image=assets.image("src/graphics/button/Play Rect.png"), pos=(640, 250),
+                           text_input="PLAY", font=get_font(75), base_color="#d7fcd4", hovering_color="White"),
+            "credits": Button(image=assets.image("src/graphics/button/Credits Rect.png"), pos=(640, 400),
+                              text_input="CREDITS", font=get_font(75), base_color="#d7fcd4", hovering_color="White"),
+            "quit": Button(image=assets.image("src/graphics/button/Quit Rect.png"), pos=(640, 550),
+                           text_input="QUIT", font=get_font(75), base_color="#d7fcd4", hovering_color="White"),
+        }
 
-            play_button = Button(image=pygame.image.load("src/graphics/button/Play Rect.png"), pos=(640, 250),
-                                 text_input="PLAY", font=get_font(75), base_color="#d7fcd4", hovering_color="White")
-            credits_button = Button(image=pygame.image.load("src/graphics/button/Credits Rect.png"), pos=(640, 400),
-                                    text_input="CREDITS", font=get_font(75), base_color="#d7fcd4", hovering_color="White")
-            quit_button = Button(image=pygame.image.load("src/graphics/button/Quit Rect.png"), pos=(640, 550),
-                                 text_input="QUIT", font=get_font(75), base_color="#d7fcd4", hovering_color="White")
+    def click(self, action):
+        """
+        Handles a click on one of the main menu buttons.
 
-            screen.blit(menu_text, menu_rect)
+        Parameters
+        ----------
+        action : str
+            The key of the clicked button.
 
-            for button in [play_button, credits_button, quit_button]:
-                button.change_color(menu_mouse_pos)
-                button.update(screen)
+        Returns
+        -------
+        None.
+        """
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if play_button.check_for_input(menu_mouse_pos):
-                        self.current_screen = "play"
-                    if credits_button.check_for_input(menu_mouse_pos):
-                        self.current_screen = "credits"
-                        self.credits()
-                    if quit_button.check_for_input(menu_mouse_pos):
-                        pygame.quit()
-                        sys.exit()
+        if action == "play":
+            self.menu.current_screen = "play"
+        if action == "credits":
+            self.menu.current_screen = "credits"
+            self.menu.credits()
+        if action == "quit":
+            pygame.quit()
+            sys.exit()
 
-            pygame.display.update()
 
-    def credits(self):
+class CreditsScreen(MenuScreen):
+    """
+    Credits screen with information about the game developers.
+    """
+
+    name = "credits"
+
+    def build(self):
         """
-        Displays the credits screen with information about the game developers.
+        Builds the photos, names and back button of the credits screen.
+
+        Parameters
+        ----------
+        None.
 
         Returns
         -------
         None.
+        """
+
+        self.backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.backdrop.fill("white")
+
+        self.backdrop.blit(assets.image("src/graphics/photos_credits/pavanato_photo.png", size=(150, 150)), (200, 120))
+        self.backdrop.blit(assets.image("src/graphics/photos_credits/roberta_photo.jfif", size=(150, 150)), (880, 120))
+        self.backdrop.blit(assets.image("src/graphics/photos_credits/beatriz_photo.jfif", size=(150, 150)), (200, 360))
+        self.backdrop.blit(assets.image("src/graphics/photos_credits/eduardo_photo.jfif", size=(150, 150)), (880, 360))
+
+        texts = [(45, "Game made by:", (640, 50)),
+                 (20, "Gabriel Pavanato", (280, 300)),
+                 (20, "Roberta Müller Nuñes", (980, 300)),
+                 (20, "Beatriz Lúcia", (280, 530)),
+                 (20, "Teixeira de Souza", (280, 560)),
+                 (20, "Eduardo Nunes Alves", (970, 530))]
+
+        for size, text, center in texts:
+            text_surface = assets.text(get_font(size), text, True, "Black")
+            self.backdrop.blit(text_surface, text_surface.get_rect(center=center))
+
+        self.buttons = {
+            "back": Button(image=None, pos=(640, 650),
+                           text_input="BACK", font=get_font(75), base_color="Black", hovering_color="Green"),
+        }
+
+    def click(self, action):
+        """
+        Handles a click on the back button.
+
+        Parameters
+        ----------
+        action : str
+            The key of the clicked button.
 
         Returns
         -------
         None.
         """
 
-        credits_image_pavanato = pygame.image.load("src/graphics/photos_credits/pavanato_photo.png").convert_alpha()
-        credits_image_pavanato = pygame.transform.scale(credits_image_pavanato, (150, 150))
+        if action == "back":
+            self.menu.current_screen = "main_menu"
 
-        credits_image_roberta = pygame.image.load("src/graphics/photos_credits/roberta_photo.jfif").convert_alpha()
-        credits_image_roberta = pygame.transform.scale(credits_image_roberta, (150, 150))
 
-        credits_image_beatriz = pygame.image.load("src/graphics/photos_credits/beatriz_photo.jfif").convert_alpha()
-        credits_image_beatriz = pygame.transform.scale(credits_image_beatriz, (150, 150))
+class PauseScreen(MenuScreen):
+    """
+    Pause screen with options to resume, go to the main menu, or quit the game.
+    """
 
-        credits_image_eduardo = pygame.image.load("src/graphics/photos_credits/eduardo_photo.jfif").convert_alpha()
-        credits_image_eduardo = pygame.transform.scale(credits_image_eduardo, (150, 150))
+    name = "pause"
 
-        while self.current_screen == "credits":
-            credits_mouse_pos = pygame.mouse.get_pos()
+    def build(self):
+        """
+        Builds the title and buttons of the pause screen.
 
-            screen.fill("white")
+        Parameters
+        ----------
+        None.
 
-            screen.blit(credits_image_pavanato, (200, 120))
-            screen.blit(credits_image_roberta, (880, 120))
-            screen.blit(credits_image_beatriz, (200, 360))
-            screen.blit(credits_image_eduardo, (880, 360))
+        Returns
+        -------
+        None.
+        """
 
-            credits_text = get_font(45).render("Game made by:", True, "Black")
-            credits_rect = credits_text.get_rect(center=(640, 50))
+        self.backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.backdrop.fill("white")
 
-            pavanato_text = get_font(20).render("Gabriel Pavanato", True, "Black")
-            pavanato_rect = pavanato_text.get_rect(center=(280, 300))
+        pause_text = assets.text(get_font(45), "PAUSE", True, "Black")
+        pause_rect = pause_text.get_rect(center=(640, 260))
+        self.backdrop.blit(pause_text, pause_rect)
 
-            roberta_text = get_font(20).render("Roberta Müller Nuñes", True, "Black")
-            roberta_rect = roberta_text.get_rect(center=(980, 300))
+        self.buttons = {
+            "resume": Button(image=None, pos=(640, 360),
+                             text_input="RESUME", font=get_font(75), base_color="Black", hovering_color="Green"),
+            "menu": Button(image=None, pos=(640, 460),
+                           text_input="MENU", font=get_font(75), base_color="Black", hovering_color="Green"),
+            "quit": Button(image=None, pos=(640, 560),
+                           text_input="QUIT", font=get_font(75), base_color="Black", hovering_color="Green"),
+        }
 
-            beatriz_text_1 = get_font(20).render("Beatriz Lúcia", True, "Black")
-            beatriz_rect_1 = beatriz_text_1.get_rect(center=(280, 530))
-            beatriz_text_2 = get_font(20).render("Teixeira de Souza", True, "Black")
-            beatriz_rect_2 = beatriz_text_2.get_rect(center=(280, 560))
+    def click(self, action):
+        """
+        Handles a click on one of the pause buttons.
 
-            eduardo_text = get_font(20).render("Eduardo Nunes Alves", True, "Black")
-            eduardo_rect = eduardo_text.get_rect(center=(970, 530))
+        Parameters
+        ----------
+        action : str
+            The key of the clicked button.
 
-            screen.blit(credits_text, credits_rect)
-            screen.blit(pavanato_text, pavanato_rect)
-            screen.blit(roberta_text, roberta_rect)
-            screen.blit(beatriz_text_1, beatriz_rect_1)
-            screen.blit(beatriz_text_2, beatriz_rect_2)
-            screen.blit(eduardo_text, eduardo_rect)
+        Returns
+        -------
+        None.
+        """
 
-            credits_back = Button(image=None, pos=(640, 650),
-                                  text_input="BACK", font=get_font(75), base_color="Black", hovering_color="Green")
+        if action == "resume":
+            self.menu.current_screen = "play"
+        if action == "menu":
+            self.menu.current_screen = "main_menu"
+        if action == "quit":
+            pygame.quit()
+            sys.exit()
 
-            credits_back.change_color(credits_mouse_pos)
-            credits_back.update(screen)
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if credits_back.check_for_input(credits_mouse_pos):
-                        self.current_screen = "main_menu"
+class GameOverScreen(MenuScreen):
+    """
+    Game over screen with the final grade and the options to restart or return to
+    the main menu. It is drawn over the last frame of the level.
+    """
 
-            pygame.display.update()
+    def build(self):
+        """
+        Builds the grade messages and buttons of the game over screen.
 
-    def pause(self):
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        level = self.menu.level
+        self.backdrop = level.display_surface.copy()
+
+        if level.score < 6:
+            message, color = "You need to study more!", "Red"
+        elif level.score >= 6 and level.score < 10:
+            message, color = "You did well!", "Green"
+        else:
+            message, color = "You did great! Congratulations!", "Blue"
+
+        text = assets.text(get_font(40), message, True, color)
+        self.backdrop.blit(text, text.get_rect(center=(640, 300)))
+
+        text = assets.text(get_font(40), f"Your final grade is {level.score} / 10", True, color)
+        self.backdrop.blit(text, text.get_rect(center=(640, 400)))
+
+        self.buttons = {
+            "restart": Button(image=None, pos=(640, 490),
+                              text_input="RESTART", font=get_font(35), base_color="white", hovering_color="blue"),
+            "menu": Button(image=None, pos=(640, 570),
+                           text_input="MENU", font=get_font(35), base_color="white", hovering_color="blue"),
+        }
+
+    def is_active(self):
+        """
+        Checks if the game over screen should still be shown.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        bool
+            True until the level is restarted.
         """
+
+        return self.menu.level.game_over
+
+    def click(self, action):
+        """
+        Handles a click on one of the game over buttons.
+
+        Parameters
+        ----------
+        action : str
+            The key of the clicked button.
+
+        Returns
+        -------
+        None.
+        """
+
+        if action == "restart":
+            self.menu.current_screen = "play"
+            self.menu.level.restart() # restart the level
+        if action == "menu":
+            self.menu.current_screen = "main_menu"
+            self.menu.level.restart()
+
+
+class Menu:
+    """
+    Represents the menu system in the game.
+
+    Attributes
+    ----------
+    current_screen : str
+        The current active screen.
+
+    level : Level
+        The instance of the game level associated with the menu.
+
+    screens : dict
+        The menu screens, keyed by name.
+
+    Methods
+    -------
+    main_menu(background_image_path)
+        Displays the main menu screen with buttons for play, credits, and quit.
+
+    credits()
+        Displays the credits screen with information about the game developers.
+
+    pause()
         Displays the pause screen with options to resume, go to the main menu, or quit the game.
 
+    game_over()
+        Displays the game over screen with the option to return to the main menu.
+    """
+
+    def __init__(self, level_instance):
+        """
+        Initializes the Menu instance.
+
+        Parameters
+        ----------
+        level_instance : Level
+            The instance of the game level associated with the menu.
+
         Returns
         -------
         None.
         """
+        self.current_screen = "main_menu"
+        self.level = level_instance
+        self.screens = {
+            "main_menu": MainMenuScreen(self),
+            "credits": CreditsScreen(self),
+            "pause": PauseScreen(self),
+            "game_over": GameOverScreen(self),
+        }
+
+    def main_menu(self, background_image_path):
+        """
+        Displays the main menu screen with buttons for play, credits, and quit.
 
-        while self.current_screen == "pause":
-            pause_mouse_pos = pygame.mouse.get_pos()
+        Parameters
+        ----------
+        background_image_path : str
+            The file path for the background image of the main menu.
 
-            screen.fill("white")
+        Returns
+        -------
+        None.
+        """
 
-            pause_text = get_font(45).render("PAUSE", True, "Black")
-            pause_rect = pause_text.get_rect(center=(640, 260))
-            screen.blit(pause_text, pause_rect)
+        self.screens["main_menu"].background_image_path = background_image_path
+        self.screens["main_menu"].run()
 
-            resume_button = Button(image=None, pos=(640, 360),
-                                text_input="RESUME", font=get_font(75), base_color="Black", hovering_color="Green")
-            menu_button = Button(image=None, pos=(640, 460),
-                                text_input="MENU", font=get_font(75), base_color="Black", hovering_color="Green")
-            quit_button = Button(image=None, pos=(640, 560),
-                                text_input="QUIT", font=get_font(75), base_color="Black", hovering_color="Green")
+    def credits(self):
+        """
+        Displays the credits screen with information about the game developers.
 
-            for button in [resume_button, menu_button, quit_button]:
-                button.change_color(pause_mouse_pos)
-                button.update(screen)
+        Parameters
+        ----------
+        None.
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if resume_button.check_for_input(pause_mouse_pos):
-                        self.current_screen = "play"
-                    if menu_button.check_for_input(pause_mouse_pos):
-                        self.current_screen = "main_menu"
-                    if quit_button.check_for_input(pause_mouse_pos):
-                        pygame.quit()
-                        sys.exit()
+        Returns
+        -------
+        None.
+        """
 
-            pygame.display.update()
+        self.screens["credits"].run()
 
-    def game_over(self):
+    def pause(self):
         """
-        Displays the game over screen with the option to return to the main menu.
+        Displays the pause screen with options to resume, go to the main menu, or quit the game.
 
         Returns
         -------
         None.
         """
 
-        fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))  # create a new surface
-        fade_surface.fill((0, 0, 0))  # fill the surface with black
-
-        for alpha in range(0, 300):
-            fade_surface.set_alpha(alpha)  # set the alpha value
-            self.level.display_surface.blit(fade_surface, (0, 0))  # blit the surface to the screen
-            pygame.display.update()  # update the display
-            pygame.time.delay(5)  # delay to create the fade effect
-
-        if self.level.score < 6:
-            text = get_font(40).render("You need to study more!", True, "Red")
-            rect = text.get_rect(center=(640, 300))  # get the rectangle of the text surface
-            self.level.display_surface.blit(text, rect)  # blit the text surface to the screen
-
-            text = get_font(40).render(f"Your final grade is {self.level.score} / 10", True, "Red")
-            rect = text.get_rect(center=(640, 400))
-            self.level.display_surface.blit(text, rect)
-
-        elif self.level.score >= 6 and self.level.score < 10:
-            text = get_font(40).render("You did well!", True, "Green")
-            rect = text.get_rect(center=(640, 300))
-            self.level.display_surface.blit(text, rect)
-
-            text = get_font(40).render(f"Your final grade is {self.level.score} / 10", True, "Green")
-            rect = text.get_rect(center=(640, 400))
-            self.level.display_surface.blit(text, rect)
-        
-        elif self.level.score >= 10:
-            text = get_font(40).render("You did great! Congratulations!", True, "Blue")
-            rect = text.get_rect(center=(640, 300))
-            self.level.display_surface.blit(text, rect)
-
-            text = get_font(40).render(f"Your final grade is {self.level.score} / 10", True, "Blue")
-            rect = text.get_rect(center=(640, 400))
-            self.level.display_surface.blit(text, rect)
-
-        pygame.display.flip()  # update the display
-
-        while True:
-            pause_mouse_pos = pygame.mouse.get_pos()
-
-            restart_button = Button(image=None, pos=(640, 490),
-                                text_input="RESTART", font=get_font(35), base_color="white", hovering_color="blue")
-            menu_button = Button(image=None, pos=(640, 570),
-                                text_input="MENU", font=get_font(35), base_color="white", hovering_color="blue")
-            
-            for button in [restart_button, menu_button]:
-                button.change_color(pause_mouse_pos)
-                button.update(screen)
+        self.screens["pause"].run()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if restart_button.check_for_input(pause_mouse_pos):
-                        self.current_screen = "play"
-                        self.level.restart() # restart the level
-                        return
-                    if menu_button.check_for_input(pause_mouse_pos):
-                        self.current_screen = "main_menu"
-                        self.level.restart()
-                        return
+    def game_over(self):
+        """
+        Displays the game over screen with the option to return to the main menu.
 
-            pygame.display.update()
+        Returns
+        -------
+        None.
+        """
+
+        # The level has already faded out in the main loop (see Game.run)
+        self.screens["game_over"].run()
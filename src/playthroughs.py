@@ -0,0 +1,803 @@
+"""
+playthroughs.py
+
+This module runs automated playthroughs of the game headless, across a pool of
+processes, to evaluate the level layouts and the question banks: completion rate,
+time to finish, collectibles reached and grade distribution.
+
+Each run plays a fresh Level with an agent: a route agent following a route
+through the NPCs and collectibles to the finish of every level (planned once before
+the runs, and pausing at random where the player stands still), a random agent holding random buttons, or a recorded
+session (see recording.py). The route and random agents answer the questions right
+with a given accuracy. The runs are split in batches handed to the worker
+processes, and the result of each run is streamed to a columnar file as the
+batches finish.
+
+Results file layout (little endian):
+
+    header  magic, version, tick rate
+    chunks  run count, then the values of each column of COLUMNS for those runs,
+            one packed array per column
+
+Run thousands of random playthroughs on every core and print the statistics:
+
+    python src/playthroughs.py --runs 2000 --output runs.aap
+
+Measure the random agent instead of the planned routes:
+
+    python src/playthroughs.py --agent random --runs 2000 --output random.aap
+
+Print the statistics of a results file:
+
+    python src/playthroughs.py --read runs.aap
+"""
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from inputs import JUMP, LEFT, RIGHT, ScriptedInput
+
+
+MAGIC = b'AAPR'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+CHUNK = struct.Struct('<I')
+
+# Columns of the results file and the struct code of their values
+COLUMNS = (('seed', 'I'), ('completed', 'B'), ('ticks', 'I'), ('level', 'B'),
+           ('collectibles', 'H'), ('score', 'B'), ('x', 'i'))
+
+CHUNK_RUNS = 256  # Runs buffered before a chunk is written
+HOLD_TICKS = 20  # Ticks the random agent holds the same buttons
+PLAN_HOLD_TICKS = 4  # Ticks the route planner holds the same buttons
+PLAN_ACTIONS = (RIGHT, RIGHT | JUMP, JUMP, 0, LEFT | JUMP, LEFT)  # Buttons tried by the route planner
+PLAN_WEIGHT = 3.0  # Weight of the distance to the target in the route search (1 = shortest route)
+PLAN_EXPANSIONS = 200000  # States searched before the planner gives up on the finish or an NPC of a level
+PLAN_COLLECTIBLE_EXPANSIONS = 250  # States searched before the planner skips a collectible
+HESITATION = 0.02  # Probability of the route agent pausing where the player stands still
+MAX_PAUSE_TICKS = 60  # Longest pause of the route agent
+
+
+class RandomAgent(ScriptedInput):
+    """
+    Input source holding random buttons, mostly running right, and answering the
+    quiz questions right with a given probability.
+
+    Attributes
+    ----------
+    accuracy : float
+        Probability of answering a question right.
+
+    rng : random.Random
+        The random generator of the agent.
+
+    Methods
+    -------
+    answer(question)
+        Returns the right answer with probability `accuracy`, a wrong one otherwise.
+    """
+
+    def __init__(self, seed, max_ticks, accuracy):
+        """
+        Initializes the agent and draws its buttons.
+
+        Parameters
+        ----------
+        seed : int
+            Seed of the random generator.
+
+        max_ticks : int
+            Number of ticks to draw buttons for.
+
+        accuracy : float
+            Probability of answering a question right.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.rng = random.Random(seed)
+        self.accuracy = accuracy
+
+        buttons = bytearray()
+        while len(buttons) < max_ticks:
+            held = RIGHT if self.rng.random() < 0.75 else 0
+            held |= LEFT if self.rng.random() < 0.15 else 0
+            held |= JUMP if self.rng.random() < 0.3 else 0
+            buttons += bytes((held,)) * HOLD_TICKS
+
+        super().__init__(bytes(buttons[:max_ticks]))
+
+    def answer(self, question):
+        """
+        Returns the right answer with probability `accuracy`, a wrong one otherwise.
+
+        Parameters
+        ----------
+        question : dict
+            The question, with its text and answers (the last item being the index
+            of the right one).
+
+        Returns
+        -------
+        int
+            Index of the chosen answer.
+        """
+
+        correct = question['answers'][-1]
+        if self.rng.random() < self.accuracy:
+            return correct
+
+        return self.rng.choice([index for index in range(len(question['answers']) - 1) if index != correct])
+
+
+class RouteAgent(RandomAgent):
+    """
+    Agent following planned routes through the levels, pausing at random where
+    the player stands still, and answering the quiz questions right with a
+    given probability.
+
+    Attributes
+    ----------
+    accuracy : float
+        Probability of answering a question right.
+
+    rng : random.Random
+        The random generator of the agent.
+
+    Methods
+    -------
+    answer(question)
+        Returns the right answer with probability `accuracy`, a wrong one otherwise.
+    """
+
+    def __init__(self, seed, routes, accuracy, hesitation=HESITATION):
+        """
+        Initializes the agent and lays out its buttons.
+
+        Parameters
+        ----------
+        seed : int
+            Seed of the random generator.
+
+        routes : list
+            The route of each level, in play order, as returned by plan_route().
+
+        accuracy : float
+            Probability of answering a question right.
+
+        hesitation : float
+            Probability of pausing at each point of the routes where the player stands still.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.rng = random.Random(seed)
+        self.accuracy = accuracy
+
+        buttons = bytearray()
+        for route_buttons, rests, *_ in routes:
+            start = 0
+            for rest in rests:
+                buttons += route_buttons[start:rest]
+                start = rest
+                # Standing still does not change the rest of the route
+                if self.rng.random() < hesitation:
+                    buttons += bytes(self.rng.randint(1, MAX_PAUSE_TICKS))
+            buttons += route_buttons[start:]
+
+        ScriptedInput.__init__(self, bytes(buttons))
+
+
+class _HeldInput:
+    """
+    Input source holding the buttons set by the route planner.
+    """
+
+    buttons = 0
+
+    def read(self):
+        return self.buttons
+
+    def answer(self, question):
+        return 0
+
+
+def _save_state(level):
+    """
+    Returns the state of the player of a level searched by the route planner.
+    """
+
+    player = level.player.sprite
+    return (player.rect.x, player.rect.y, player.direction.y, player.on_ground,
+            player.on_ceiling, player.on_left, player.on_right, level.current_x)
+
+
+def _restore_state(level, state):
+    """
+    Puts the player of a level back in a state returned by _save_state().
+    """
+
+    player = level.player.sprite
+    (player.rect.x, player.rect.y, player.direction.y, player.on_ground,
+     player.on_ceiling, player.on_left, player.on_right, level.current_x) = state
+
+
+def _step(level):
+    """
+    Moves the player of a level by one tick, as Level.update() does.
+    """
+
+    level.player.update()
+    level.horizontal_movement_collision()
+    level.vertical_movement_collision()
+
+
+def _search(level, held, start, target, avoid, max_expansions):
+    """
+    Searches the buttons taking the player from a state to a target (weighted A*).
+
+    The states are the ones reached by holding each of PLAN_ACTIONS for
+    PLAN_HOLD_TICKS ticks, simulated with the movement code of Level itself.
+
+    Parameters
+    ----------
+    level : Level
+        Headless level whose player is moved by the search.
+
+    held : _HeldInput
+        Controller of the player.
+
+    start : tuple
+        Player state the search starts from (see plan_route()).
+
+    target : pygame.Rect
+        Area the player has to touch.
+
+    avoid : pygame.Rect or None
+        Area the player must not touch on the way (the finish ends the level).
+
+    max_expansions : int
+        States searched before giving up.
+
+    Returns
+    -------
+    tuple or None
+        The (state, buttons, ticks) steps of the path, in order, and the state
+        reached, or None if the target was not reached.
+    """
+
+    from settings import SCREEN_HEIGHT
+
+    player = level.player.sprite
+    width, height = player.rect.size
+
+    def distance(state):
+        dx = max(target.left - state[0] - width, state[0] - target.right, 0)
+        dy = max(target.top - state[1] - height, state[1] - target.bottom, 0)
+        return dx / player.speed + dy / -player.jump_speed
+
+    # The contact flags do not change the movement, so states only differ by the rest
+    seen = {start[:4]}
+    parents = {start: None}
+    frontier = [(distance(start) * PLAN_WEIGHT, 0, 0, start)]
+    pushed = 0
+
+    for _ in range(max_expansions):
+        if not frontier:
+            break
+        _, ticks, _, state = heapq.heappop(frontier)
+
+        for buttons in PLAN_ACTIONS:
+            _restore_state(level, state)
+            held.buttons = buttons
+            for held_ticks in range(1, PLAN_HOLD_TICKS + 1):
+                _step(level)
+                if player.rect.colliderect(target) or player.rect.top > SCREEN_HEIGHT:
+                    break
+                if avoid is not None and player.rect.colliderect(avoid):
+                    break
+
+            if player.rect.top > SCREEN_HEIGHT:
+                continue
+            if player.rect.colliderect(target):
+                steps = [(state, buttons, held_ticks)]
+                reached = _save_state(level)
+                while parents[state] is not None:
+                    state, step_buttons = parents[state]
+                    steps.append((state, step_buttons, PLAN_HOLD_TICKS))
+                steps.reverse()
+                return steps, reached
+            if avoid is not None and player.rect.colliderect(avoid):
+                continue
+
+            reached = _save_state(level)
+            if reached[:4] in seen:
+                continue
+            seen.add(reached[:4])
+            parents[reached] = (state, buttons)
+            pushed += 1
+            heapq.heappush(frontier, (ticks + PLAN_HOLD_TICKS + distance(reached) * PLAN_WEIGHT,
+                                      ticks + PLAN_HOLD_TICKS, pushed, reached))
+
+    return None
+
+
+def plan_route(index, waypoints=True, max_expansions=PLAN_EXPANSIONS):
+    """
+    Plans a route from the spawn of a level to its finish, through its NPCs and
+    collectibles.
+
+    The waypoints are visited from left to right, each one searched from where the
+    previous one was reached (see _search()); a waypoint the search cannot reach
+    is skipped, and the ones crossed on the way are not searched again. The NPCs
+    get the search budget of the finish, the collectibles a much smaller one. The
+    route replays exactly in a fresh level.
+
+    Parameters
+    ----------
+    index : int
+        Index of the level.
+
+    waypoints : bool
+        Whether the route goes through the NPCs and collectibles.
+
+    max_expansions : int
+        States searched before giving up on the finish or an NPC.
+
+    Returns
+    -------
+    tuple or None
+        The buttons of each tick of the route, the ticks where the player stands
+        still on the ground, and the number of NPCs and collectibles the route
+        touches; or None if no route to the finish was found.
+    """
+
+    from classes import Level
+    from settings import bg_list, level_list
+
+    held = _HeldInput()
+    level = Level(level_list, bg_list, None, held)
+    if index != level.current_level:
+        level.start_level(index)
+    player = level.player.sprite
+    finish = level.finish.sprite.rect
+
+    stops = []
+    if waypoints:
+        stops = sorted(list(level.npcs) + list(level.collectible), key=lambda sprite: sprite.rect.topleft)
+
+    state = _save_state(level)
+    steps = []
+    touched = set()
+
+    for sprite in stops:
+        if sprite in touched:
+            continue
+        budget = max_expansions if sprite in level.npcs else PLAN_COLLECTIBLE_EXPANSIONS
+        found = _search(level, held, state, sprite.rect, finish, budget)
+        if found is None:
+            continue
+        leg, state = found
+        steps += leg
+
+        # Replay the leg to find the waypoints crossed on the way
+        for origin, buttons, ticks in leg:
+            _restore_state(level, origin)
+            held.buttons = buttons
+            for _ in range(ticks):
+                _step(level)
+                touched.update(other for other in stops if other.rect.colliderect(player.rect))
+        touched.add(sprite)
+
+    found = _search(level, held, state, finish, None, max_expansions)
+    if found is None:
+        return None
+    steps += found[0]
+
+    route, rests = bytearray(), []
+    for origin, buttons, ticks in steps:
+        # The player may stand still where it is on the ground and not falling
+        if origin[3] and origin[2] == 0:
+            rests.append(len(route))
+        route += bytes((buttons,)) * ticks
+
+    npcs = sum(1 for sprite in touched if sprite in level.npcs)
+
+    return bytes(route), rests, npcs, len(touched) - npcs
+
+
+def play(controller, max_ticks):
+    """
+    Plays a fresh level headless until the game is over or the ticks run out.
+
+    Parameters
+    ----------
+    controller : ScriptedInput
+        The agent playing.
+
+    max_ticks : int
+        Maximum number of ticks of the run.
+
+    Returns
+    -------
+    tuple
+        Whether the game was completed, the ticks played and the final state, as
+        returned by Level.state().
+    """
+
+    from classes import Level
+    from settings import bg_list, level_list
+
+    level = Level(level_list, bg_list, None, controller)
+    ticks = 0
+
+    while ticks < max_ticks and not level.game_over:
+        level.update()
+        ticks += 1
+
+    return level.game_over, ticks, level.state()
+
+
+def run_batch(seeds, max_ticks, accuracy, recording_path=None, routes=None):
+    """
+    Plays one run per seed. Runs in the worker processes.
+
+    Parameters
+    ----------
+    seeds : list
+        Seeds of the runs.
+
+    max_ticks : int
+        Maximum number of ticks of a run.
+
+    accuracy : float
+        Probability of the random agent answering a question right.
+
+    recording_path : str or None
+        Recording replayed by every run instead of the agents.
+
+    routes : list or None
+        Routes of the levels followed by the route agent (None for the random agent).
+
+    Returns
+    -------
+    list
+        One tuple of values per run, in the order of COLUMNS.
+    """
+
+    recording = None
+    if recording_path is not None:
+        from recording import read_recording
+        recording = read_recording(recording_path)
+        # A replay ends with the recorded session
+        max_ticks = min(max_ticks, len(recording.buttons))
+
+    results = []
+    for seed in seeds:
+        if recording is not None:
+            controller = recording.player()
+        elif routes is not None:
+            controller = RouteAgent(seed, routes, accuracy)
+        else:
+            controller = RandomAgent(seed, max_ticks, accuracy)
+        completed, ticks, state = play(controller, max_ticks)
+        results.append((seed, completed, ticks, state['level'], state['collectibles'], state['score'], state['x']))
+
+    return results
+
+
+class ResultsWriter:
+    """
+    Streams run results to a columnar file.
+
+    Attributes
+    ----------
+    file : file object
+        The results file, open for writing.
+
+    pending : list
+        Results not written yet.
+
+    count : int
+        Number of results written or pending.
+
+    Methods
+    -------
+    add(results)
+        Adds run results, writing a chunk when enough are pending.
+
+    flush()
+        Writes the pending results as a chunk.
+
+    close()
+        Writes the pending results and closes the file.
+    """
+
+    def __init__(self, path, tick_rate):
+        """
+        Creates the results file and writes its header.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        tick_rate : int
+            Simulation ticks per second of the runs.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, tick_rate))
+        self.pending = []
+        self.count = 0
+
+    def add(self, results):
+        """
+        Adds run results, writing a chunk when enough are pending.
+
+        Parameters
+        ----------
+        results : list
+            One tuple of values per run, in the order of COLUMNS.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.pending.extend(results)
+        self.count += len(results)
+        if len(self.pending) >= CHUNK_RUNS:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending results as a chunk, one packed array per column.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        if not self.pending:
+            return
+
+        count = len(self.pending)
+        columns = zip(*self.pending)
+        self.file.write(CHUNK.pack(count) + b''.join(
+            struct.pack(f'<{count}{code}', *values) for (_, code), values in zip(COLUMNS, columns)))
+        self.file.flush()
+        self.pending = []
+
+    def close(self):
+        """
+        Writes the pending results and closes the file.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.flush()
+        self.file.close()
+
+
+def read_results(path):
+    """
+    Reads a results file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    tuple
+        The tick rate of the runs and a dict with the list of values of each column.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a results file of the current version.
+    """
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"Truncated results file: {path}")
+
+    magic, version, tick_rate = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a results file of version {VERSION}: {path}")
+
+    columns = {name: [] for name, _ in COLUMNS}
+    offset = HEADER.size
+
+    while offset < len(data):
+        if offset + CHUNK.size > len(data):
+            raise ValueError(f"Truncated results file: {path}")
+        (count,) = CHUNK.unpack_from(data, offset)
+        offset += CHUNK.size
+
+        for name, code in COLUMNS:
+            column = struct.Struct(f'<{count}{code}')
+            if offset + column.size > len(data):
+                raise ValueError(f"Truncated results file: {path}")
+            columns[name].extend(column.unpack_from(data, offset))
+            offset += column.size
+
+    return tick_rate, columns
+
+
+def summarize(columns, tick_rate):
+    """
+    Aggregates the results of the runs.
+
+    Parameters
+    ----------
+    columns : dict
+        The list of values of each column.
+
+    tick_rate : int
+        Simulation ticks per second of the runs.
+
+    Returns
+    -------
+    dict
+        Run count, completion rate, time to finish of the completed runs, average
+        collectibles, and the distributions of grades, collectibles and levels reached.
+    """
+
+    runs = len(columns['seed'])
+    finish_times = [ticks / tick_rate for ticks, completed in zip(columns['ticks'], columns['completed']) if completed]
+
+    return {
+        'runs': runs,
+        'completion_rate': len(finish_times) / runs if runs else 0.0,
+        'finish_time_s': {
+            'mean': statistics.fmean(finish_times) if finish_times else None,
+            'median': statistics.median(finish_times) if finish_times else None,
+            'min': min(finish_times, default=None),
+            'max': max(finish_times, default=None),
+        },
+        'collectibles_mean': statistics.fmean(columns['collectibles']) if runs else 0.0,
+        'grades': dict(sorted(Counter(columns['score']).items())),
+        'collectibles': dict(sorted(Counter(columns['collectibles']).items())),
+        'levels_reached': dict(sorted(Counter(columns['level']).items())),
+    }
+
+
+def print_summary(summary):
+    """
+    Prints the aggregated results of the runs.
+
+    Parameters
+    ----------
+    summary : dict
+        The aggregated results, as returned by summarize().
+
+    Returns
+    -------
+    None.
+    """
+
+    runs = summary['runs']
+    print(f"runs: {runs}")
+    print(f"completion rate: {summary['completion_rate']:.1%}")
+
+    finish = summary['finish_time_s']
+    if finish['mean'] is not None:
+        print(f"time to finish: mean {finish['mean']:.1f} s, median {finish['median']:.1f} s, "
+              f"min {finish['min']:.1f} s, max {finish['max']:.1f} s")
+    print(f"collectibles per run: {summary['collectibles_mean']:.2f}")
+
+    for title, key in (("grades", 'grades'), ("collectibles", 'collectibles'), ("levels reached", 'levels_reached')):
+        print(f"{title}:")
+        for value, count in summary[key].items():
+            print(f"  {value:>4}: {count:>7} ({count / runs:.1%})")
+
+
+def main():
+    """
+    Runs the playthroughs given in the command line and prints their statistics.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    None.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=100, help="number of playthroughs")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--batch', type=int, default=8, help="runs handed to a worker at a time")
+    parser.add_argument('--max-ticks', type=int, default=5 * 60 * 60, help="ticks after which a run gives up")
+    parser.add_argument('--accuracy', type=float, default=0.6, help="probability of answering a question right")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first run")
+    parser.add_argument('--agent', choices=('route', 'random'), default='route',
+                        help="route: follow planned routes through the levels, random: hold random buttons")
+    parser.add_argument('--recording', help="replay this recording instead of the agent")
+    parser.add_argument('--output', default='playthroughs.aap', help="results file")
+    parser.add_argument('--read', metavar='PATH', help="only print the statistics of a results file")
+    args = parser.parse_args()
+
+    if args.read:
+        tick_rate, columns = read_results(args.read)
+        print_summary(summarize(columns, tick_rate))
+        return
+
+    from level_compiler import COLLECTIBLE, NPC
+    from settings import TICK_RATE, level_list
+
+    seeds = list(range(args.seed, args.seed + args.runs))
+    batches = [seeds[index:index + args.batch] for index in range(0, len(seeds), args.batch)]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        routes = None
+        if args.agent == 'route' and not args.recording:
+            # The levels are planned in parallel, on the workers of the runs
+            start = time.perf_counter()
+            routes = list(executor.map(plan_route, range(len(level_list))))
+            if None in routes:
+                print(f"No route found to the finish of level {routes.index(None)}")
+                return
+            print(f"Routes planned in {time.perf_counter() - start:.1f} s")
+            for index, (buttons, _, npcs, collectibles) in enumerate(routes):
+                level = level_list[index]
+                print(f"  level {index}: {len(buttons)} ticks, "
+                      f"{npcs}/{sum(code == NPC for code, _, _ in level.entities)} NPCs, "
+                      f"{collectibles}/{sum(code == COLLECTIBLE for code, _, _ in level.entities)} collectibles")
+
+        writer = ResultsWriter(args.output, TICK_RATE)
+        start = time.perf_counter()
+        try:
+            futures = [executor.submit(run_batch, batch, args.max_ticks, args.accuracy, args.recording, routes)
+                       for batch in batches]
+            for future in as_completed(futures):
+                writer.add(future.result())
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    tick_rate, columns = read_results(args.output)
+    ticks = sum(columns['ticks'])
+    print(f"{len(seeds)} runs, {ticks} ticks in {elapsed:.1f} s on {args.workers} workers "
+          f"({len(seeds) / elapsed:.1f} runs/s, {ticks / elapsed:.0f} ticks/s) -> {args.output}")
+    print_summary(summarize(columns, tick_rate))
+
+
+# Main
+if __name__ == "__main__":
+
+    # Simulate without a window, audio or image decoding, in this process and the workers
+    os.environ.setdefault("ACADEMIC_ADVENTURE_HEADLESS", "1")
+
+    main()
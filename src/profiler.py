@@ -0,0 +1,487 @@
+"""
+profiler.py
+
+This module contains the built-in profiler. The game code reports the time spent
+in its subsystems (scoped timers), counters (e.g. blits) and gauges (e.g. sprite
+counts) for every frame; the profiler keeps the last frames for the in-game
+overlay and can export them to a JSON file to diagnose frame spikes.
+"""
+
+import json
+import statistics
+import time
+from collections import deque
+
+import pygame
+
+from assets import assets
+from settings import PROFILE, PROFILE_HISTORY
+
+
+class _ScopedTimer:
+    """
+    Context manager adding the time spent inside it to a profiler timing.
+    """
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """
+    Context manager doing nothing, used while the profiler is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """
+    Collects timings, counters and gauges per frame.
+
+    While the profiler is disabled every call is a no-op, so the instrumentation
+    can stay in the hot path.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the profiler records data.
+
+    frames : collections.deque
+        The last recorded frames, as dicts with the frame time, timings, counters
+        and gauges.
+
+    timings : dict
+        Seconds spent in each timer during the current frame.
+
+    counters : dict
+        Counters of the current frame.
+
+    gauges : dict
+        Last value of each gauge.
+
+    Methods
+    -------
+    enable(enabled)
+        Starts or stops recording.
+
+    timer(name)
+        Returns a context manager timing a block of code.
+
+    add_time(name, seconds)
+        Adds time to a timing of the current frame.
+
+    count(name, amount)
+        Increments a counter of the current frame.
+
+    gauge(name, value)
+        Sets the value of a gauge.
+
+    end_frame()
+        Stores the current frame and starts a new one.
+
+    frame_times()
+        Returns the recorded frame times.
+
+    summary()
+        Returns the statistics of the recorded frames.
+
+    export(path)
+        Writes the recorded frames and their statistics to a JSON file.
+    """
+
+    def __init__(self, history, enabled=False):
+        """
+        Initializes the profiler.
+
+        Parameters
+        ----------
+        history : int
+            Number of frames kept.
+
+        enabled : bool
+            Whether the profiler records data from the start.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.frames = deque(maxlen=history)
+        self.timings = {}
+        self.counters = {}
+        self.gauges = {}
+        self.enabled = False
+        self.enable(enabled)
+
+    def enable(self, enabled=True):
+        """
+        Starts or stops recording.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether the profiler records data.
+
+        Returns
+        -------
+        None.
+        """
+
+        if enabled and not self.enabled:
+            self.timings.clear()
+            self.counters.clear()
+            self._frame_start = time.perf_counter()
+        self.enabled = enabled
+
+    def timer(self, name):
+        """
+        Returns a context manager timing a block of code.
+
+        Parameters
+        ----------
+        name : str
+            The name of the timing.
+
+        Returns
+        -------
+        context manager
+            Adds the time spent inside it to the timing.
+        """
+
+        return _ScopedTimer(self, name) if self.enabled else _NULL_TIMER
+
+    def add_time(self, name, seconds):
+        """
+        Adds time to a timing of the current frame.
+
+        Parameters
+        ----------
+        name : str
+            The name of the timing.
+
+        seconds : float
+            The time to add.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.enabled:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        """
+        Increments a counter of the current frame.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+
+        amount : int
+            The increment.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """
+        Sets the value of a gauge.
+
+        Parameters
+        ----------
+        name : str
+            The name of the gauge.
+
+        value : int or float
+            The current value.
+
+        Returns
+        -------
+        None.
+        """
+
+        if self.enabled:
+            self.gauges[name] = value
+
+    def end_frame(self):
+        """
+        Stores the current frame and starts a new one.
+
+        The frame time is the time since the previous call, so it includes the time
+        spent waiting for the frame cap.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.frames.append({
+            'end': now,
+            'frame_ms': (now - self._frame_start) * 1e3,
+            'timings_ms': {name: seconds * 1e3 for name, seconds in self.timings.items()},
+            'counters': self.counters,
+            'gauges': dict(self.gauges),
+        })
+        self._frame_start = now
+        self.timings = {}
+        self.counters = {}
+
+    def frame_times(self):
+        """
+        Returns the recorded frame times.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        list
+            Milliseconds of each recorded frame, oldest first.
+        """
+
+        return [frame['frame_ms'] for frame in self.frames]
+
+    def summary(self):
+        """
+        Returns the statistics of the recorded frames.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        dict
+            Number of frames, average FPS, frame time percentiles and the average
+            milliseconds of each timing.
+        """
+
+        times = self.frame_times()
+        if len(times) < 2:
+            return {'frames': len(times)}
+
+        percentiles = statistics.quantiles(times, n=100, method='inclusive')
+        timings = {}
+        for frame in self.frames:
+            for name, value in frame['timings_ms'].items():
+                timings[name] = timings.get(name, 0.0) + value
+
+        return {
+            'frames': len(times),
+            'fps': 1e3 / statistics.fmean(times),
+            'p50_ms': percentiles[49],
+            'p95_ms': percentiles[94],
+            'p99_ms': percentiles[98],
+            'max_ms': max(times),
+            'timings_ms': {name: total / len(times) for name, total in sorted(timings.items())},
+        }
+
+    def export(self, path):
+        """
+        Writes the recorded frames and their statistics to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        Returns
+        -------
+        None.
+        """
+
+        start = self.frames[0]['end'] - self.frames[0]['frame_ms'] / 1e3 if self.frames else 0.0
+        frames = [dict(frame, end=frame['end'] - start) for frame in self.frames]
+
+        with open(path, 'w') as file:
+            json.dump({'summary': self.summary(), 'assets': assets.stats(), 'frames': frames}, file)
+
+
+class ProfilerOverlay:
+    """
+    In-game panel showing the profiler data.
+
+    Attributes
+    ----------
+    profiler : Profiler
+        The profiler whose data is shown.
+
+    visible : bool
+        Whether the overlay is drawn.
+
+    font : pygame.font.Font
+        The font of the panel.
+
+    Methods
+    -------
+    toggle()
+        Shows or hides the overlay.
+
+    draw(surface)
+        Draws the overlay.
+    """
+
+    WIDTH = 360
+    GRAPH_HEIGHT = 60
+    GRAPH_SCALE = 2  # pixels per millisecond
+    LINE_HEIGHT = 18
+
+    def __init__(self, profiler):
+        """
+        Initializes the overlay, hidden.
+
+        Parameters
+        ----------
+        profiler : Profiler
+            The profiler whose data is shown.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.profiler = profiler
+        self.visible = False
+        self.font = None
+
+    def toggle(self):
+        """
+        Shows or hides the overlay. The profiler records while the overlay is shown.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.visible = not self.visible
+        if self.visible:
+            self.profiler.enable()
+        elif not PROFILE:
+            self.profiler.enable(False)
+
+    def _lines(self):
+        """
+        Returns the text lines of the panel.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        list
+            The lines, as strings.
+        """
+
+        frames = list(self.profiler.frames)[-60:]
+        if not frames:
+            return ["collecting..."]
+
+        last = frames[-1]
+        average = statistics.fmean(frame['frame_ms'] for frame in frames)
+        lines = [f"FPS {1e3 / average:5.1f}   frame {average:5.2f} ms   max {max(frame['frame_ms'] for frame in frames):5.2f} ms"]
+
+        timings = {}
+        for frame in frames:
+            for name, value in frame['timings_ms'].items():
+                timings[name] = timings.get(name, 0.0) + value
+        for name, total in sorted(timings.items()):
+            lines.append(f"{name:<22}{total / len(frames):7.3f} ms")
+
+        lines.append("  ".join(f"{name} {value}" for name, value in sorted(last['gauges'].items())))
+        lines.append("  ".join(f"{name} {value}" for name, value in sorted(last['counters'].items())))
+
+        stats = assets.stats()
+        lines.append(f"assets {stats['entries']}  {stats['memory_used'] / 2**20:.1f} MB  hit rate {stats['hit_rate']:.0%}")
+
+        return lines
+
+    def draw(self, surface):
+        """
+        Draws the overlay.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface where the overlay will be drawn.
+
+        Returns
+        -------
+        pygame.Rect or None
+            The area of the screen that was drawn, or None if the overlay is hidden.
+        """
+
+        if not self.visible:
+            return None
+
+        if self.font is None:
+            self.font = assets.font(None, 20)
+
+        # The values change every frame, so the text is not kept in the asset cache
+        lines = [self.font.render(line, True, "white") for line in self._lines()]
+        height = self.GRAPH_HEIGHT + 12 + len(lines) * self.LINE_HEIGHT
+        panel = pygame.Rect(surface.get_width() - self.WIDTH - 10, 10, self.WIDTH, height)
+
+        surface.fill((20, 20, 20), panel)
+
+        # Frame time graph, one column per frame, with the 60 FPS budget as a line
+        graph_bottom = panel.top + 6 + self.GRAPH_HEIGHT
+        times = self.profiler.frame_times()[-(self.WIDTH - 12):]
+        for x, frame_ms in enumerate(times):
+            bar = min(int(frame_ms * self.GRAPH_SCALE), self.GRAPH_HEIGHT)
+            color = (90, 200, 90) if frame_ms <= 1e3 / 60 else (220, 80, 80)
+            pygame.draw.line(surface, color, (panel.left + 6 + x, graph_bottom), (panel.left + 6 + x, graph_bottom - bar))
+        budget_y = graph_bottom - int(1e3 / 60 * self.GRAPH_SCALE)
+        pygame.draw.line(surface, (230, 230, 90), (panel.left + 6, budget_y), (panel.right - 6, budget_y))
+
+        y = graph_bottom + 6
+        for line in lines:
+            surface.blit(line, (panel.left + 6, y))
+            y += self.LINE_HEIGHT
+
+        return panel
+
+
+# Profiler shared by the whole game
+profiler = Profiler(PROFILE_HISTORY, PROFILE)
@@ -0,0 +1,609 @@
+"""
+reachability.py
+
+This module checks offline that every collectible, NPC and the finish of a level
+map can be reached with the player's jump arc, so a map change cannot ship a book
+on an unreachable ledge.
+
+The player moves on a lattice: its x-coordinate is always a multiple of its speed
+and it always stands with its top on a tile boundary. The search runs in passes
+over boolean NumPy arrays indexed by (launch row, x position). Each pass launches
+a jump and a fall from every standing position reached by the previous pass (and
+every position walkable from it), then follows all the arcs tick by tick at once:
+
+    - each tick the player may move left, right or not at all, if the cells are free
+    - the vertical offset of an arc only depends on the ticks since the launch, so
+      every launch position shares the same arc offsets
+    - an arc stops on the first standing position it crosses going down, and turns
+      into a fall on the first ceiling it crosses going up
+
+The standing positions where the arcs land are the input of the next pass, so the
+pass in which an entity is first touched is the minimal number of jumps and falls
+needed to reach it.
+
+Check the level maps (the exit status is 1 if an entity cannot be reached, so the
+check can gate map changes):
+
+    python src/reachability.py
+    python src/reachability.py src/graphics/backgrounds/inside_map.csv --json report.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from assets import assets
+from level_compiler import COLLECTIBLE, FINISH, LAYOUT_CHARS, NPC, PLAYER, SOLID, load_level
+from settings import PLAYER_GRAVITY, PLAYER_JUMP_SPEED, PLAYER_SPEED, TILE_SIZE, level_sources
+
+
+PLAYER_IMAGE = 'src/graphics/character/idle_right/0.png'
+COLLECTIBLE_IMAGE = 'src/graphics/collectibles/book.png'
+
+
+def arc_offsets(initial_speed, gravity, limit):
+    """
+    Returns the vertical offsets of an arc, tick by tick, as the player moves.
+
+    Like the player's rect, the position is rounded to the nearest pixel every tick
+    while the speed keeps its fraction.
+
+    Parameters
+    ----------
+    initial_speed : float
+        Vertical speed when the arc starts (negative for a jump).
+
+    gravity : float
+        Speed added every tick.
+
+    limit : int
+        Offset below which the arc is not followed any further.
+
+    Returns
+    -------
+    list
+        The offset of each tick, starting with 0 at the launch.
+    """
+
+    offsets = [0]
+    offset = 0
+    speed = initial_speed
+
+    while offset <= limit:
+        speed += gravity
+        offset = math.floor(offset + speed + 0.5)
+        offsets.append(offset)
+
+    return offsets
+
+
+def _or_at(target, source, row, col):
+    """
+    Sets the cells of target that are set in source, placed at a row and column.
+
+    Parameters
+    ----------
+    target : numpy.ndarray
+        2D bool array updated in place.
+
+    source : numpy.ndarray
+        2D bool array; the parts falling outside target are ignored.
+
+    row, col : int
+        Position of the top-left cell of source in target.
+
+    Returns
+    -------
+    None.
+    """
+
+    top, left = max(row, 0), max(col, 0)
+    bottom = min(row + source.shape[0], target.shape[0])
+    right = min(col + source.shape[1], target.shape[1])
+
+    if top < bottom and left < right:
+        target[top:bottom, left:right] |= source[top - row:bottom - row, left - col:right - col]
+
+
+class Reachability:
+    """
+    Jump and fall reachability of the positions of a level map.
+
+    Attributes
+    ----------
+    level_data : LevelData
+        Compiled map of the level.
+
+    body_size : tuple
+        Width and height of the player in pixels.
+
+    tile_size, speed : int
+        Size of the cells and horizontal speed of the player, in pixels.
+
+    pad : int
+        Empty rows added above the map, so jumps can leave it at the top.
+
+    positions : int
+        Number of x positions of the player inside the map.
+
+    stand : numpy.ndarray
+        (rows, positions) array of the positions where the player stands on a tile.
+
+    arcs : dict
+        Offsets of the jump and fall arcs, keyed by name.
+
+    Methods
+    -------
+    free(offset)
+        Returns where the player fits at a vertical offset from the launch rows.
+
+    search(spawn)
+        Finds the positions reachable from the spawn, pass by pass.
+
+    touched_cells(touched)
+        Returns the map cells covered by the player at the touched positions.
+    """
+
+    def __init__(self, level_data, body_size, tile_size=TILE_SIZE, speed=PLAYER_SPEED,
+                 gravity=PLAYER_GRAVITY, jump_speed=PLAYER_JUMP_SPEED):
+        """
+        Precomputes the free and standing positions of a level map.
+
+        Parameters
+        ----------
+        level_data : LevelData
+            Compiled map of the level.
+
+        body_size : tuple
+            Width and height of the player in pixels.
+
+        tile_size : int
+            The size of each cell in pixels.
+
+        speed : int
+            Horizontal pixels the player moves per tick.
+
+        gravity : float
+            Speed added to the player's fall every tick.
+
+        jump_speed : float
+            Vertical speed of the player when a jump starts.
+
+        Returns
+        -------
+        None.
+
+        Raises
+        ------
+        ValueError
+            If the player does not move on a lattice of the tiles (its height must
+            be a multiple of the tile size, and the tile size a multiple of its speed).
+        """
+
+        width, height = body_size
+        if height % tile_size or tile_size % speed:
+            raise ValueError(f"A {width}x{height} player moving {speed} px per tick does not fit {tile_size} px tiles")
+
+        self.level_data = level_data
+        self.body_size = body_size
+        self.tile_size = tile_size
+        self.speed = speed
+        rows, cols = level_data.rows, level_data.cols
+
+        limit = (rows + 1) * tile_size
+        self.arcs = {
+            'jump': arc_offsets(jump_speed, gravity, limit),
+            'fall': arc_offsets(0, gravity, limit),
+            # Walking off a ledge the player may already be falling for a tick
+            'walk_off': arc_offsets(gravity, gravity, limit),
+        }
+
+        self.pad = -min(self.arcs['jump']) // tile_size + 2
+        self.map_rows = rows
+        self.body_rows = height // tile_size
+        self.total_rows = self.pad + rows + self.body_rows + 1
+        self.positions = (cols * tile_size - width) // speed + 1
+
+        solid = np.zeros((self.total_rows, cols), dtype=bool)
+        solid[self.pad:self.pad + rows] = np.frombuffer(level_data.grid, dtype=np.uint8).reshape(rows, cols) == SOLID
+
+        # Solid cells of each row under the player at each x position
+        x = np.arange(self.positions) * speed
+        self._first_col = x // tile_size
+        self._last_col = (x + width - 1) // tile_size
+        row_counts = np.zeros((self.total_rows, cols + 1), dtype=np.int32)
+        np.cumsum(solid, axis=1, out=row_counts[:, 1:])
+        blocked = row_counts[:, self._last_col + 1] > row_counts[:, self._first_col]
+
+        self._blocked_counts = np.zeros((self.total_rows + 1, self.positions), dtype=np.int32)
+        np.cumsum(blocked, axis=0, out=self._blocked_counts[1:])
+        self._free = {}
+
+        # Standing positions have a solid cell right under the player, ceilings right above
+        free = self.free(0)
+        self.stand = free.copy()
+        self.stand[:-self.body_rows] &= blocked[self.body_rows:]
+        self.stand[-self.body_rows:] = False
+        ceiling = free.copy()
+        ceiling[1:] &= blocked[:-1]
+        ceiling[0] = False
+
+        # Padded copies, so the arrays shifted by any row offset are views
+        margin = self.total_rows
+        self._stand_padded = np.pad(self.stand, ((margin, margin), (0, 0)))
+        self._ceiling_padded = np.pad(ceiling, ((margin, margin), (0, 0)))
+
+        # Standing positions walkable from each other share a run id
+        starts = self.stand.copy()
+        starts[:, 1:] &= ~self.stand[:, :-1]
+        self._runs = np.where(self.stand, np.cumsum(starts.ravel()).reshape(self.stand.shape), 0)
+
+    def free(self, offset):
+        """
+        Returns where the player fits at a vertical offset from the launch rows.
+
+        Parameters
+        ----------
+        offset : int
+            Vertical offset in pixels from the top of the launch row.
+
+        Returns
+        -------
+        numpy.ndarray
+            (rows, positions) bool array, True where the player overlaps no solid cell.
+        """
+
+        if offset not in self._free:
+            size = self.tile_size
+            rows = np.arange(self.total_rows)
+            first = np.clip(rows + offset // size, 0, self.total_rows)
+            last = np.clip(rows + (offset + self.body_size[1] - 1) // size + 1, 0, self.total_rows)
+            self._free[offset] = self._blocked_counts[last] == self._blocked_counts[first]
+
+        return self._free[offset]
+
+    def _shifted(self, padded, rows):
+        """
+        Returns a padded array shifted by a number of rows, as a view.
+
+        Parameters
+        ----------
+        padded : numpy.ndarray
+            One of the padded arrays.
+
+        rows : int
+            Rows to shift (the row r of the result is the row r + rows of the array).
+
+        Returns
+        -------
+        numpy.ndarray
+            The (rows, positions) view.
+        """
+
+        start = self.total_rows + rows
+
+        return padded[start:start + self.total_rows]
+
+    def _touch(self, touched, states, offset, row=0, col=0):
+        """
+        Marks the rows covered by the player at some positions.
+
+        Parameters
+        ----------
+        touched : numpy.ndarray
+            (rows, positions) array of the rows covered by the player, updated in place.
+
+        states : numpy.ndarray
+            Bool array of the positions, relative to the launch rows.
+
+        offset : int
+            Vertical offset of the positions in pixels.
+
+        row, col : int
+            Launch row and x position of the top-left cell of states.
+
+        Returns
+        -------
+        None.
+        """
+
+        size = self.tile_size
+        for rows in range(offset // size, (offset + self.body_size[1] - 1) // size + 1):
+            _or_at(touched, states, row + rows, col)
+
+    def _follow(self, arc, seeds, landed, ceilings, touched):
+        """
+        Follows an arc from many launch positions at once until every arc ends.
+
+        Parameters
+        ----------
+        arc : list
+            Vertical offsets of the arc.
+
+        seeds : numpy.ndarray
+            (rows, positions) array of the launch positions.
+
+        landed : numpy.ndarray
+            Standing positions where the arcs land, updated in place.
+
+        ceilings : numpy.ndarray or None
+            Positions where the arcs hit a ceiling, updated in place (None for
+            arcs that only fall).
+
+        touched : numpy.ndarray
+            Rows covered by the player, updated in place.
+
+        Returns
+        -------
+        None.
+        """
+
+        seed_rows = np.flatnonzero(seeds.any(axis=1))
+        if seed_rows.size == 0:
+            return
+        seed_cols = np.flatnonzero(seeds.any(axis=0))
+
+        # Launch rows never change along an arc and the player moves one position per
+        # tick at most, so the arcs stay in a window around the launch positions
+        top, bottom = seed_rows[0], seed_rows[-1] + 1
+        left = max(seed_cols[0] - len(arc), 0)
+        right = min(seed_cols[-1] + len(arc) + 1, self.positions)
+        window = np.s_[top:bottom, left:right]
+
+        size = self.tile_size
+        lost = self.pad + self.map_rows - top
+        states = seeds[window]
+        # Positions covered along the arc, by offset in rows, marked once at the end
+        covered = {}
+
+        for offset, next_offset in zip(arc, arc[1:]):
+            if not states.any():
+                break
+
+            # Each tick the player may step left, right or stay, where it fits
+            free = self.free(offset)[window]
+            moved = states.copy()
+            moved[:, 1:] |= states[:, :-1] & free[:, 1:]
+            moved[:, :-1] |= states[:, 1:] & free[:, :-1]
+
+            # The first standing position crossed going down (or ceiling going up) ends the arc
+            if next_offset > offset:
+                for rows in range(-(-offset // size), next_offset // size + 1):
+                    stop = moved & self._shifted(self._stand_padded, rows)[window]
+                    if stop.any():
+                        _or_at(landed, stop, top + rows, left)
+                        moved &= ~stop
+            elif next_offset < offset and ceilings is not None:
+                for rows in range(offset // size, -(-next_offset // size) - 1, -1):
+                    stop = moved & self._shifted(self._ceiling_padded, rows)[window]
+                    if stop.any():
+                        _or_at(ceilings, stop, top + rows, left)
+                        moved &= ~stop
+
+            moved &= self.free(next_offset)[window]
+            # Arcs falling below the map are lost
+            moved[max(lost - next_offset // size, 0):] = False
+            # The rows covered only depend on the top row and whether it is aligned
+            key = (next_offset // size, next_offset % size == 0)
+            if key in covered:
+                covered[key] |= moved
+            else:
+                covered[key] = moved.copy()
+            states = moved
+
+        for (rows, aligned), states in covered.items():
+            self._touch(touched, states, rows * size + (not aligned), top, left)
+
+    def _walkable(self, standing):
+        """
+        Returns the standing positions walkable from some standing positions.
+
+        Parameters
+        ----------
+        standing : numpy.ndarray
+            (rows, positions) array of standing positions.
+
+        Returns
+        -------
+        numpy.ndarray
+            The positions of the runs of standing positions containing them.
+        """
+
+        runs = np.unique(self._runs[standing & self.stand])
+
+        return np.isin(self._runs, runs[runs > 0])
+
+    def search(self, spawn):
+        """
+        Finds the positions reachable from the spawn, pass by pass.
+
+        Parameters
+        ----------
+        spawn : tuple
+            Row and column of the player's spawn cell.
+
+        Returns
+        -------
+        generator
+            Yields, after each pass, the (rows, positions) array of the rows covered
+            by the player so far (see touched_cells()).
+        """
+
+        shape = (self.total_rows, self.positions)
+        reached = np.zeros(shape, dtype=bool)
+        touched = np.zeros(shape, dtype=bool)
+
+        # The player spawns in the air and falls
+        falls = np.zeros(shape, dtype=bool)
+        falls[self.pad + spawn[0], min(spawn[1] * self.tile_size // self.speed, self.positions - 1)] = True
+        self._touch(touched, falls, 0)
+        launches = np.zeros(shape, dtype=bool)
+
+        while True:
+            landed = np.zeros(shape, dtype=bool)
+            ceilings = np.zeros(shape, dtype=bool)
+
+            self._follow(self.arcs['jump'], launches, landed, ceilings, touched)
+            self._touch(touched, ceilings, 0)
+            self._follow(self.arcs['fall'], falls | ceilings, landed, None, touched)
+            self._follow(self.arcs['walk_off'], launches, landed, None, touched)
+
+            launches = self._walkable(landed) & ~reached
+            reached |= launches
+            self._touch(touched, launches, 0)
+            yield touched
+
+            if not launches.any():
+                return
+            falls = launches
+
+    def touched_cells(self, touched):
+        """
+        Returns the map cells covered by the player at the touched positions.
+
+        Parameters
+        ----------
+        touched : numpy.ndarray
+            (rows, positions) array of the rows covered by the player.
+
+        Returns
+        -------
+        numpy.ndarray
+            (rows, cols) bool array of the map.
+        """
+
+        rows, cols = self.map_rows, self.level_data.cols
+        counts = np.zeros((rows, self.positions + 1), dtype=np.int32)
+        np.cumsum(touched[self.pad:self.pad + rows], axis=1, out=counts[:, 1:])
+
+        # Player positions covering each column
+        column_x = np.arange(cols) * self.tile_size
+        first = np.clip(-((self.body_size[0] - 1 - column_x) // self.speed), 0, self.positions)
+        last = np.clip((column_x + self.tile_size - 1) // self.speed + 1, 0, self.positions)
+
+        return counts[:, last] > counts[:, np.minimum(first, last)]
+
+
+def analyze(level_data, body_size, entity_sizes):
+    """
+    Checks which entities of a level map can be reached and how soon.
+
+    Parameters
+    ----------
+    level_data : LevelData
+        Compiled map of the level.
+
+    body_size : tuple
+        Width and height of the player in pixels.
+
+    entity_sizes : dict
+        Width and height in pixels of each entity, keyed by cell code.
+
+    Returns
+    -------
+    dict
+        The size of the map, the search time, the passes run, and for each
+        finish, collectible and NPC its cell, the minimal number of jumps and falls
+        to reach it (None if unreachable).
+    """
+
+    start = time.perf_counter()
+    reachability = Reachability(level_data, body_size)
+
+    spawn = next(((row, col) for code, row, col in level_data.entities if code == PLAYER), None)
+    if spawn is None:
+        raise ValueError("The level has no player spawn")
+
+    targets = [(code, row, col) for code, row, col in level_data.entities if code in (FINISH, COLLECTIBLE, NPC)]
+    arcs = [None] * len(targets)
+    passes = 0
+
+    for passes, touched in enumerate(reachability.search(spawn), start=1):
+        cells = reachability.touched_cells(touched)
+        counts = np.zeros((cells.shape[0] + 1, cells.shape[1] + 1), dtype=np.int32)
+        counts[1:, 1:] = cells.cumsum(axis=0).cumsum(axis=1)
+
+        for index, (code, row, col) in enumerate(targets):
+            if arcs[index] is not None:
+                continue
+            width, height = entity_sizes[code]
+            last_row = min(row + -(-height // TILE_SIZE), cells.shape[0])
+            last_col = min(col + -(-width // TILE_SIZE), cells.shape[1])
+            if counts[last_row, last_col] - counts[row, last_col] - counts[last_row, col] + counts[row, col] > 0:
+                arcs[index] = passes - 1
+
+    return {
+        'rows': level_data.rows,
+        'cols': level_data.cols,
+        'passes': passes,
+        'seconds': time.perf_counter() - start,
+        'entities': [{'kind': LAYOUT_CHARS[code], 'row': row, 'col': col, 'arcs': arc}
+                     for (code, row, col), arc in zip(targets, arcs)],
+    }
+
+
+def main():
+    """
+    Checks the level maps given in the command line (all the levels by default).
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    int
+        The exit status: 1 if an entity cannot be reached, 0 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('maps', nargs='*', default=level_sources, help="CSV maps to check")
+    parser.add_argument('--json', metavar='PATH', help="write the reports as JSON to this file")
+    args = parser.parse_args()
+
+    body_size = assets.image_size(PLAYER_IMAGE)
+    entity_sizes = {
+        FINISH: (TILE_SIZE, TILE_SIZE),
+        NPC: (TILE_SIZE, TILE_SIZE),
+        COLLECTIBLE: assets.image_size(COLLECTIBLE_IMAGE),
+    }
+
+    reports = {}
+    status = 0
+
+    for csv_path in args.maps:
+        report = analyze(load_level(csv_path), body_size, entity_sizes)
+        reports[csv_path] = report
+
+        unreachable = [entity for entity in report['entities'] if entity['arcs'] is None]
+        finish = [entity['arcs'] for entity in report['entities'] if entity['kind'] == 'F']
+        finish_text = ', '.join('unreachable' if arcs is None else f"{arcs} jumps/falls" for arcs in finish)
+        print(f"{csv_path}: {report['rows']}x{report['cols']}, {len(report['entities'])} entities, "
+              f"{len(unreachable)} unreachable, finish: {finish_text or 'missing'} "
+              f"({report['passes']} passes, {report['seconds'] * 1e3:.0f} ms)")
+
+        for entity in unreachable:
+            print(f"  unreachable {entity['kind']} at row {entity['row']}, col {entity['col']}")
+
+        if unreachable or not finish:
+            status = 1
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(reports, file, indent=2)
+
+    return status
+
+
+# Main
+if __name__ == "__main__":
+
+    # No window is needed to read the sizes of the sprites
+    os.environ.setdefault("ACADEMIC_ADVENTURE_HEADLESS", "1")
+
+    sys.exit(main())
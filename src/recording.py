@@ -0,0 +1,367 @@
+"""
+recording.py
+
+This module records the input of a play session (the buttons held each tick and
+the quiz answers) to a compact file and replays it. Since the simulation runs on a
+fixed timestep, replaying a recording through Level.update reproduces the session
+tick by tick, so recordings can be used as benchmarks and to check that a change
+leaves the trajectories unchanged.
+
+Recording file layout (little endian):
+
+    header   magic, version, tick rate, tick count, run count, answer count,
+             whether the final state is stored, final state
+    runs     (buttons, length) records of the run-length encoded ticks
+    answers  index of each quiz answer, one byte each
+
+Run it to replay a recording headless and compare the final state:
+
+    python src/recording.py session.rec
+"""
+
+import os
+import struct
+import sys
+import time
+
+from inputs import ScriptedInput
+
+
+MAGIC = b'AAIR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIHBHiiHHB')
+RUN = struct.Struct('<BH')
+MAX_RUN = 0xFFFF
+
+# Keys of the final state of a session, as returned by Level.state()
+STATE_KEYS = ('level', 'x', 'y', 'score', 'collectibles', 'game_over')
+
+
+class Recording:
+    """
+    Input of a play session.
+
+    Attributes
+    ----------
+    tick_rate : int
+        Simulation ticks per second of the session.
+
+    buttons : bytearray
+        Buttons held each tick (see inputs.py).
+
+    answers : list
+        Indices of the quiz answers, in order.
+
+    result : dict or None
+        Final state of the session, as returned by Level.state().
+
+    Methods
+    -------
+    player()
+        Returns an input source replaying the recording.
+    """
+
+    def __init__(self, tick_rate, buttons=b'', answers=(), result=None):
+        """
+        Initializes the recording.
+
+        Parameters
+        ----------
+        tick_rate : int
+            Simulation ticks per second of the session.
+
+        buttons : bytes
+            Buttons held each tick.
+
+        answers : sequence
+            Indices of the quiz answers, in order.
+
+        result : dict or None
+            Final state of the session.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.tick_rate = tick_rate
+        self.buttons = bytearray(buttons)
+        self.answers = list(answers)
+        self.result = result
+
+    def player(self):
+        """
+        Returns an input source replaying the recording.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        ScriptedInput
+            Input source with the recorded buttons and answers.
+        """
+
+        return ScriptedInput(bytes(self.buttons), self.answers)
+
+
+class RecordingInput:
+    """
+    Input source recording the buttons and quiz answers of another source.
+
+    Attributes
+    ----------
+    source : KeyboardInput or ScriptedInput
+        The input source being recorded.
+
+    recording : Recording
+        The input recorded so far.
+
+    Methods
+    -------
+    read()
+        Returns and records the buttons held this tick.
+
+    answer(question)
+        Returns and records the answer of the source to a quiz question.
+
+    answered(choice)
+        Records an answer given by the player on the quiz screen.
+
+    reset()
+        Starts a new recording.
+    """
+
+    def __init__(self, source, tick_rate):
+        """
+        Initializes the recorder.
+
+        Parameters
+        ----------
+        source : KeyboardInput or ScriptedInput
+            The input source being recorded.
+
+        tick_rate : int
+            Simulation ticks per second.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.source = source
+        self.recording = Recording(tick_rate)
+
+    def read(self):
+        """
+        Returns and records the buttons held this tick.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            Bit mask of LEFT, RIGHT and JUMP.
+        """
+
+        buttons = self.source.read()
+        self.recording.buttons.append(buttons)
+
+        return buttons
+
+    def answer(self, question):
+        """
+        Returns and records the answer of the source to a quiz question.
+
+        Parameters
+        ----------
+        question : dict
+            The question, with its text and answers.
+
+        Returns
+        -------
+        int or None
+            Index of the chosen answer, or None if the player answers on the quiz
+            screen (see answered()).
+        """
+
+        choice = self.source.answer(question)
+        if choice is not None:
+            self.recording.answers.append(choice)
+
+        return choice
+
+    def answered(self, choice):
+        """
+        Records an answer given by the player on the quiz screen.
+
+        Parameters
+        ----------
+        choice : int
+            Index of the chosen answer.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.recording.answers.append(choice)
+
+    def reset(self):
+        """
+        Starts a new recording.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.recording = Recording(self.recording.tick_rate)
+
+
+def write_recording(recording, path):
+    """
+    Writes a recording to a file.
+
+    Parameters
+    ----------
+    recording : Recording
+        The recording.
+
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    None.
+    """
+
+    # Buttons are held for many ticks in a row, so the ticks are run-length encoded
+    runs = []
+    for buttons in recording.buttons:
+        if runs and runs[-1][0] == buttons and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([buttons, 1])
+
+    result = recording.result
+    state = tuple(int(result[key]) for key in STATE_KEYS) if result is not None else (0,) * len(STATE_KEYS)
+
+    header = HEADER.pack(MAGIC, VERSION, recording.tick_rate, len(recording.buttons), len(runs),
+                         len(recording.answers), result is not None, *state)
+    body = b''.join(RUN.pack(*run) for run in runs) + bytes(recording.answers)
+
+    # Write to a temporary file first so a crash never leaves a truncated recording behind
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(header + body)
+    os.replace(temporary_path, path)
+
+
+def read_recording(path):
+    """
+    Reads a recording from a file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    Recording
+        The recording.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a recording of the current version.
+    """
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"Truncated recording: {path}")
+
+    magic, version, tick_rate, ticks, run_count, answer_count, has_result, *state = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a recording of version {VERSION}: {path}")
+
+    runs_end = HEADER.size + run_count * RUN.size
+    if len(data) != runs_end + answer_count:
+        raise ValueError(f"Truncated recording: {path}")
+
+    buttons = bytearray()
+    for value, length in RUN.iter_unpack(data[HEADER.size:runs_end]):
+        buttons += bytes((value,)) * length
+    if len(buttons) != ticks:
+        raise ValueError(f"Corrupted recording: {path}")
+
+    result = None
+    if has_result:
+        result = dict(zip(STATE_KEYS, state))
+        result['game_over'] = bool(result['game_over'])
+
+    return Recording(tick_rate, buttons, data[runs_end:], result)
+
+
+def replay(recording, level):
+    """
+    Replays a recording through a level, one tick per recorded tick.
+
+    Parameters
+    ----------
+    recording : Recording
+        The recording.
+
+    level : Level
+        A fresh level created with recording.player() as its controller.
+
+    Returns
+    -------
+    dict
+        The final state of the level, as returned by Level.state().
+    """
+
+    for _ in range(len(recording.buttons)):
+        level.update()
+        if level.game_over:
+            break
+
+    return level.state()
+
+
+# Main
+if __name__ == "__main__":
+
+    # Replay without a window, audio or image decoding
+    os.environ.setdefault("ACADEMIC_ADVENTURE_HEADLESS", "1")
+
+    from classes import Level
+    from settings import TICK_RATE, bg_list, level_list
+
+    status = 0
+    for path in sys.argv[1:]:
+        recording = read_recording(path)
+        if recording.tick_rate != TICK_RATE:
+            print(f"{path}: recorded at {recording.tick_rate} ticks/s, the game runs at {TICK_RATE}")
+
+        level = Level(level_list, bg_list, None, recording.player())
+        start = time.perf_counter()
+        state = replay(recording, level)
+        elapsed = time.perf_counter() - start
+
+        print(f"{path}: {len(recording.buttons)} ticks in {elapsed:.3f} s -> {state}")
+        if recording.result is not None and state != recording.result:
+            print(f"{path}: MISMATCH, recorded {recording.result}")
+            status = 1
+
+    sys.exit(status)
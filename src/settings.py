@@ -2,36 +2,18 @@
 This module contains all the game settings.
 """
 
-from csv import reader
-
-def import_csv_layout(path):
-    """
-    Function to import a CSV file and convert it into a terrain map.
-
-    Parameters
-    ----------
-    path (str): The path to the CSV file.
-
-    Returns
-    -------
-    list: A list of strings representing the terrain map.
-    """
-    
-    terrain_map = []
-    with open(path) as map:
-        csv_reader = reader(map)
-        for row in csv_reader:
-            row = [' ' if cell == '-1' else 'X' if cell == '0' else 'F' if cell == '15' else 'C' if cell == '12' else 'N' if cell == '3' else cell for cell in row]
-            terrain_map.append(''.join(row))
-    return terrain_map
-
-
-# Importing level maps from CSV files
-level_map1 = import_csv_layout(r"src\graphics\backgrounds\outside_map.csv")
-level_map2 = import_csv_layout(r"src\graphics\backgrounds\inside_map.csv")
+import os
+
+from level_registry import LevelRegistry
+
+
+# Level maps (Tiled CSV files, compiled and cached when a level is loaded)
+level_sources = [os.path.join("src", "graphics", "backgrounds", "outside_map.csv"),
+                 os.path.join("src", "graphics", "backgrounds", "inside_map.csv")]
 
 # List of background images
-bg_list = [r"src\graphics\backgrounds\outside_map.png", r"src\graphics\backgrounds\inside_map.png"]
+bg_list = [os.path.join("src", "graphics", "backgrounds", "outside_map.png"),
+           os.path.join("src", "graphics", "backgrounds", "inside_map.png")]
 
 # List of questions for the game
 list_of_questions = [[
@@ -48,12 +30,42 @@ list_of_questions = [[
 ]]
 
 
-# List of level maps
-level_list = [level_map1, level_map2]
+# List of level maps, loaded only when a level asks for them (the next level is
+# prepared in the background by the level loader, see level_loader.py)
+level_list = LevelRegistry(level_sources)
+
+# Threads preparing the next level (map, background image, colliders, entities) while one is played
+LOADER_WORKERS = 2
 
 # Game constants
 FPS = 60  # Frames per second
 VERTICAL_TILE_NUMBER = 45  # Number of vertical tiles
 TILE_SIZE = 16  # Size of each tile in pixels
 SCREEN_WIDTH = 1280  # Width of the game screen in pixels
-SCREEN_HEIGHT = len(level_map1) * TILE_SIZE  # Height of the game screen in pixels
\ No newline at end of file
+SCREEN_HEIGHT = VERTICAL_TILE_NUMBER * TILE_SIZE  # Height of the game screen in pixels
+CULL_MARGIN = 4 * TILE_SIZE  # Extra pixels around the screen where entities are still drawn and updated
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # Bytes of images, fonts and text kept in the asset cache
+MENU_FPS = 30  # Frame cap of the menu screens
+DIRTY_RECTS = False  # Present only the changed areas of the play screen when the camera did not scroll
+TICK_RATE = 60  # Simulation ticks per second, independent of the rendered frame rate
+MAX_TICKS_PER_FRAME = 5  # Catch-up limit: ticks beyond it in a single frame are dropped
+RENDER_FPS = 0 if os.environ.get("ACADEMIC_ADVENTURE_UNCAPPED") == "1" else FPS  # Frame cap of the play screen (uncapped only for benchmarking)
+VSYNC = False  # Synchronise the play screen with the display refresh (needs a scaled window)
+HEADLESS = os.environ.get("ACADEMIC_ADVENTURE_HEADLESS") == "1"  # Simulate without display, audio or image decoding
+PROFILE = os.environ.get("ACADEMIC_ADVENTURE_PROFILE") == "1"  # Record frame timings from the start (F3 shows them, F4 exports them)
+PROFILE_HISTORY = 600  # Frames kept by the profiler for the overlay and the export
+RECORD_PATH = os.environ.get("ACADEMIC_ADVENTURE_RECORD")  # File the input of each playthrough is recorded to (None = off)
+QUIZ_FEEDBACK_TIME = 2500  # Milliseconds the quiz answer feedback stays on screen
+TRANSITION_TIME = 400  # Milliseconds of the fades and wipes between screens and levels
+AUDIO_ENABLED = not HEADLESS and os.environ.get("ACADEMIC_ADVENTURE_NO_AUDIO") != "1"  # Play music and sound effects
+
+# Audio (the music is streamed from the first file found, compressed formats first)
+MUSIC_PATHS = [os.path.join("src", "audio", "bg_music.ogg"),
+               os.path.join("src", "audio", "bg_music.wav")]
+MUSIC_VOLUME = 0.3
+SOUND_EFFECTS = {"jump": (os.path.join("src", "audio", "jump_sound.wav"), 0.8)}  # name: (path, volume)
+
+# Player movement
+PLAYER_SPEED = 8  # Horizontal pixels the player moves per tick
+PLAYER_GRAVITY = 0.8  # Pixels per tick added to the player's falling speed each tick
+PLAYER_JUMP_SPEED = -16  # Vertical speed of the player when a jump starts (pixels per tick)
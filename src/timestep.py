@@ -0,0 +1,135 @@
+"""
+timestep.py
+
+This module contains the fixed-timestep clock that decouples the game simulation
+from the rendering rate.
+"""
+
+import time
+
+
+class FixedTimestep:
+    """
+    Accumulator that turns elapsed real time into fixed simulation ticks.
+
+    Every rendered frame adds the real time elapsed since the previous frame to the
+    accumulator, and the simulation runs one tick for each full tick duration in
+    it. The remainder is exposed as an interpolation factor for rendering. To avoid
+    a spiral of death on slow machines, a frame never runs more than max_ticks ticks
+    and the backlog beyond that is dropped (the game slows down instead).
+
+    Attributes
+    ----------
+    tick_rate : int
+        Number of simulation ticks per second.
+
+    tick_duration : float
+        Duration of one tick in seconds.
+
+    max_ticks : int
+        Maximum number of ticks run in a single frame.
+
+    accumulator : float
+        Real time not yet consumed by the simulation, in seconds.
+
+    dropped_ticks : int
+        Number of ticks skipped because of the catch-up limit.
+
+    Methods
+    -------
+    reset()
+        Restarts the clock, discarding the accumulated time.
+
+    advance()
+        Returns the number of ticks to run for the current frame.
+
+    alpha()
+        Returns the interpolation factor between the last two ticks.
+    """
+
+    def __init__(self, tick_rate, max_ticks, clock=time.perf_counter):
+        """
+        Initializes the clock.
+
+        Parameters
+        ----------
+        tick_rate : int
+            Number of simulation ticks per second.
+
+        max_ticks : int
+            Maximum number of ticks run in a single frame.
+
+        clock : callable
+            Function returning the current time in seconds.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.tick_rate = tick_rate
+        self.tick_duration = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.clock = clock
+        self.dropped_ticks = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Restarts the clock, discarding the accumulated time (e.g. after a menu).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.accumulator = 0.0
+        self._last_time = self.clock()
+
+    def advance(self):
+        """
+        Returns the number of ticks to run for the current frame.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        int
+            The number of simulation ticks, at most max_ticks.
+        """
+
+        now = self.clock()
+        self.accumulator += now - self._last_time
+        self._last_time = now
+
+        ticks = int(self.accumulator // self.tick_duration)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = self.tick_duration * ticks
+
+        self.accumulator -= ticks * self.tick_duration
+
+        return ticks
+
+    def alpha(self):
+        """
+        Returns the interpolation factor between the last two ticks.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        float
+            How far the current frame is into the next tick, between 0 and 1.
+        """
+
+        return min(self.accumulator / self.tick_duration, 1.0)
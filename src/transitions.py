@@ -0,0 +1,228 @@
+"""
+transitions.py
+
+This module contains the screen transitions. A transition is drawn over a frame
+and its progress only depends on the time elapsed since it started, so it takes
+the same time on every machine and never stops the loop that draws it from
+handling events.
+"""
+
+from abc import ABC, abstractmethod
+
+import pygame
+
+
+class Transition(ABC):
+    """
+    Base class of the screen transitions.
+
+    Attributes
+    ----------
+    duration : int
+        Length of the transition in milliseconds.
+
+    reveal : bool
+        True if the transition uncovers the frame (e.g. fade in), False if it covers
+        it (e.g. fade out).
+
+    color : str or tuple
+        Colour covering the frame.
+
+    start_time : int
+        Time (pygame ticks) when the transition started.
+
+    Methods
+    -------
+    progress()
+        Returns how far the transition is, between 0 and 1.
+
+    is_finished()
+        Checks if the transition is over.
+
+    coverage()
+        Returns how much of the frame is covered, between 0 and 1.
+
+    draw(surface)
+        Draws the transition over a frame.
+    """
+
+    def __init__(self, duration, reveal=True, color="black"):
+        """
+        Starts the transition.
+
+        Parameters
+        ----------
+        duration : int
+            Length of the transition in milliseconds.
+
+        reveal : bool
+            True to uncover the frame, False to cover it.
+
+        color : str or tuple
+            Colour covering the frame.
+
+        Returns
+        -------
+        None.
+        """
+
+        self.duration = duration
+        self.reveal = reveal
+        self.color = color
+        self.start_time = pygame.time.get_ticks()
+
+    def progress(self):
+        """
+        Returns how far the transition is, between 0 and 1.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        float
+            The elapsed fraction of the duration.
+        """
+
+        if self.duration <= 0:
+            return 1.0
+
+        return min((pygame.time.get_ticks() - self.start_time) / self.duration, 1.0)
+
+    def is_finished(self):
+        """
+        Checks if the transition is over.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        bool
+            True once the whole duration has elapsed.
+        """
+
+        return self.progress() >= 1.0
+
+    def coverage(self):
+        """
+        Returns how much of the frame is covered, between 0 and 1.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        float
+            1 when the frame is fully covered, 0 when it is fully visible.
+        """
+
+        progress = self.progress()
+
+        return 1.0 - progress if self.reveal else progress
+
+    @abstractmethod
+    def draw(self, surface):
+        """
+        Draws the transition over a frame.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface holding the frame.
+
+        Returns
+        -------
+        pygame.Rect
+            The area of the screen that was drawn.
+        """
+
+
+class Fade(Transition):
+    """
+    Transition fading the frame from or to a solid colour.
+    """
+
+    def __init__(self, duration, reveal=True, color="black"):
+        """
+        Starts the fade.
+
+        Parameters
+        ----------
+        duration : int
+            Length of the fade in milliseconds.
+
+        reveal : bool
+            True to fade in, False to fade out.
+
+        color : str or tuple
+            Colour the frame fades from or to.
+
+        Returns
+        -------
+        None.
+        """
+
+        super().__init__(duration, reveal, color)
+        self._cover = None
+
+    def draw(self, surface):
+        """
+        Draws the fade over a frame.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface holding the frame.
+
+        Returns
+        -------
+        pygame.Rect
+            The area of the screen that was drawn.
+        """
+
+        if self._cover is None or self._cover.get_size() != surface.get_size():
+            self._cover = pygame.Surface(surface.get_size())
+            self._cover.fill(self.color)
+
+        # Alpha values stop at 255, anything above would be wasted work
+        self._cover.set_alpha(round(255 * self.coverage()))
+
+        return surface.blit(self._cover, (0, 0))
+
+
+class Wipe(Transition):
+    """
+    Transition sweeping a solid colour across the frame, from left to right.
+    """
+
+    def draw(self, surface):
+        """
+        Draws the wipe over a frame.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface holding the frame.
+
+        Returns
+        -------
+        pygame.Rect
+            The area of the screen that was drawn.
+        """
+
+        width, height = surface.get_size()
+        covered = round(width * self.coverage())
+
+        # Revealing uncovers the left side first, covering starts from the left side
+        if self.reveal:
+            area = pygame.Rect(width - covered, 0, covered, height)
+        else:
+            area = pygame.Rect(0, 0, covered, height)
+
+        surface.fill(self.color, area)
+
+        return area